@@ -0,0 +1,78 @@
+"""
+Benchmark of building a block one instruction at a time, with `IRBlock.add_instr`,
+which copies the whole block on every instruction, and with `IRBlockBuilder`, which
+appends to a list and is frozen into an `IRBlock` at the end.
+
+`IRBlock.add_instr` is quadratic on the number of instructions, so it only runs on
+the smaller blocks; `IRBlockBuilder` keeps the same time per instruction up to
+10^6 instructions.
+
+Run it from the `python` directory::
+
+    PYTHONPATH=src python benchmarks/bench_ir_block.py
+"""
+
+from __future__ import annotations
+
+import time
+
+import hhat_lang.core  # noqa: F401, import cycle if the IR module goes first
+from hhat_lang.core.code.ir import InstrIRFlag
+from hhat_lang.core.data.core import Symbol
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import (
+    IRArgs,
+    IRBlock,
+    IRBlockBuilder,
+    IRInstr,
+)
+
+SIZES: tuple[int, ...] = (10_000, 30_000, 100_000, 300_000, 1_000_000)
+MAX_ADD_INSTR: int = 30_000
+
+
+def build_add_instr(instr: IRInstr, num_instrs: int) -> IRBlock:
+    block = IRBlock()
+
+    for _ in range(num_instrs):
+        block.add_instr(instr)
+
+    return block
+
+
+def build_builder(instr: IRInstr, num_instrs: int) -> IRBlock:
+    builder = IRBlockBuilder()
+
+    for _ in range(num_instrs):
+        builder.add_instr(instr)
+
+    return builder.freeze()
+
+
+def run_time(fn, instr: IRInstr, num_instrs: int) -> float:
+    start = time.perf_counter()
+    fn(instr, num_instrs)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    instr = IRInstr(Symbol("@redim"), IRArgs(Symbol("@q")), InstrIRFlag.CALL)
+    print(
+        f"{'instrs':>9} {'add_instr (ms)':>15} {'builder (ms)':>13}"
+        f" {'builder ns/instr':>17}"
+    )
+
+    for num_instrs in SIZES:
+        add_instr = (
+            f"{run_time(build_add_instr, instr, num_instrs) * 1e3:15.1f}"
+            if num_instrs <= MAX_ADD_INSTR
+            else f"{'-':>15}"
+        )
+        builder = run_time(build_builder, instr, num_instrs)
+        print(
+            f"{num_instrs:>9} {add_instr} {builder * 1e3:13.1f}"
+            f" {builder / num_instrs * 1e9:17.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark of the AST to IR lowering (see `build_main`): throughput in AST nodes per
+second for programs from 1k to 100k lines. Each line of `main` is a declaration with
+assignment from a call, `x-<k>:u32 = add(<k> 1)`, and a function definition comes
+every 100 lines. The time per line staying flat as the program grows shows the build
+is linear on the AST size.
+
+The AST is built directly, since the parser visitor does not produce the whole AST
+yet. Run it from the `python` directory::
+
+    PYTHONPATH=src python benchmarks/bench_ir_builder.py
+"""
+
+from __future__ import annotations
+
+import time
+
+import hhat_lang.core  # noqa: F401, import cycle if the AST module goes first
+from hhat_lang.core.code.ast import AST
+from hhat_lang.dialects.heather.code.ast import (
+    ArgTypePair,
+    Body,
+    Call,
+    CallArgs,
+    DeclareAssign,
+    Expr,
+    FnArgs,
+    FnDef,
+    Id,
+    Literal,
+    Main,
+    OnlyValue,
+    Program,
+)
+from hhat_lang.dialects.heather.code.ir_builder import build_main
+
+SIZES: tuple[int, ...] = (1_000, 10_000, 100_000)
+REPEATS: int = 3
+
+
+def gen_program(num_lines: int) -> AST:
+    fns = tuple(
+        FnDef(
+            Id(f"fn-{k}"),
+            Id("u32"),
+            FnArgs(ArgTypePair(Id("a"), Id("u32"))),
+            Body(Call(Id("add"), CallArgs(OnlyValue(Id("a")), OnlyValue(Id("a"))))),
+        )
+        for k in range(num_lines // 100)
+    )
+    main = Main(
+        *(
+            DeclareAssign(
+                Id(f"x-{k}"),
+                Id("u32"),
+                Expr(
+                    Call(
+                        Id("add"),
+                        CallArgs(
+                            OnlyValue(Literal(str(k), "u32")),
+                            OnlyValue(Literal("1", "u32")),
+                        ),
+                    )
+                ),
+            )
+            for k in range(num_lines)
+        )
+    )
+    program = Program(main=main, imports=None)
+    program._value = fns + (main,)
+    return program
+
+
+def count_nodes(code: AST) -> int:
+    count = 0
+    stack: list = [code]
+
+    while stack:
+        node = stack.pop()
+        count += 1
+
+        if not isinstance(node, (Id, Literal)):
+            for item in node.value:
+                stack.extend(item if isinstance(item, tuple) else (item,))
+
+    return count
+
+
+def main() -> None:
+    print(
+        f"{'lines':>8} {'nodes':>9} {'build (ms)':>11} {'us/line':>8} {'nodes/s':>11}"
+    )
+
+    for num_lines in SIZES:
+        program = gen_program(num_lines)
+        num_nodes = count_nodes(program)
+        best = float("inf")
+
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            build_main(program)
+            best = min(best, time.perf_counter() - start)
+
+        print(
+            f"{num_lines:>8} {num_nodes:>9} {best * 1e3:11.1f}"
+            f" {best / num_lines * 1e6:8.2f} {num_nodes / best:11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of the `@sync` lowering strategies (see `QSync`): circuit depth, gate count
+and simulation time of a GHZ state preparation, `h` on the first qubit followed by
+`@sync` over all the qubits, for the chain and the tree forms.
+
+The tree form has logarithmic depth but about twice the gates, so the native
+simulators, whose cost follows the number of gates, run it slightly slower; depth
+only pays off on noisy or density-matrix backends and on hardware.
+
+Run it from the `python` directory::
+
+    PYTHONPATH=src python benchmarks/bench_sync.py
+"""
+
+from __future__ import annotations
+
+import time
+
+from hhat_lang.core.code.ir import TypeIR
+from hhat_lang.core.memory.core import MemoryManager
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import FnIR
+from hhat_lang.dialects.heather.interpreter.classical.executor import Evaluator
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import parse_qasm
+from hhat_lang.low_level.quantum_lang.openqasm.v2.instructions import (
+    SYNC_STRATEGIES,
+    QSync,
+)
+from hhat_lang.low_level.quantum_lang.openqasm.v2.passes import circuit_report
+from hhat_lang.low_level.target_backend.native.openqasm.code_executor import (
+    execute_program,
+)
+
+SIZES: tuple[int, ...] = (8, 16, 20, 64, 256)
+SHOTS: int = 1000
+REPEATS: int = 3
+
+
+def ghz_code(num_qubits: int, strategy: str) -> str:
+    executor = Evaluator(MemoryManager(num_qubits), TypeIR(), FnIR())
+    instrs, _ = QSync()(
+        idxs=tuple(range(num_qubits)), executor=executor, sync_strategy=strategy
+    )
+    return (
+        f'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[{num_qubits}];\n'
+        f"creg c[{num_qubits}];\nh q[0];\n" + "\n".join(instrs) + "\nmeasure q -> c;\n"
+    )
+
+
+def run_time(code: str, method: str) -> float:
+    metadata = {"shots": SHOTS, "seed": 0, "method": method}
+    best = float("inf")
+
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        execute_program(code, "@ghz", metadata=metadata)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main() -> None:
+    print(
+        f"{'qubits':>7} {'strategy':>9} {'depth':>6} {'gates':>6} {'sv (ms)':>9}"
+        f" {'stab (ms)':>10}"
+    )
+
+    for num_qubits in SIZES:
+        for strategy in SYNC_STRATEGIES:
+            code = ghz_code(num_qubits, strategy)
+            report = circuit_report(parse_qasm(code))
+            statevector = (
+                f"{run_time(code, 'statevector') * 1e3:9.2f}"
+                if num_qubits <= 20
+                else f"{'-':>9}"
+            )
+            stabilizer = run_time(code, "stabilizer") * 1e3
+            print(
+                f"{num_qubits:>7} {strategy:>9} {report.depth:>6}"
+                f" {report.num_gates:>6} {statevector} {stabilizer:10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
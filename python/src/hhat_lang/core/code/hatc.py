@@ -0,0 +1,91 @@
+"""
+Compiled IR artifacts (`.hatc` files): a versioned binary serialization of the whole
+IR (`BaseIR`: type table, function table and `main` code), so unchanged sources skip
+parsing and IR building.
+
+An artifact is a fixed header followed by the compressed IR:
+
+- magic `b"HATC"`, then the artifact format version (2 bytes, big-endian)
+- the SHA-256 digest of the source code it was compiled from (32 bytes)
+- the compiler version length (2 bytes, big-endian) and the version itself (utf-8)
+- the IR, pickled and compressed with zlib
+
+An artifact is only loaded back for the same source digest, format and compiler
+versions; anything else is a cache miss, and the source is compiled again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+import struct
+import zlib
+from importlib.metadata import PackageNotFoundError, version
+
+from hhat_lang.core.code.ir import BaseIR
+
+HATC_MAGIC: bytes = b"HATC"
+"""First bytes of every `.hatc` artifact."""
+
+HATC_FORMAT_VERSION: int = 1
+"""Artifact format version; bump it whenever the IR classes change their layout."""
+
+HATC_SUFFIX: str = ".hatc"
+"""File suffix of the artifacts."""
+
+_HEADER = struct.Struct(">4sH32sH")
+
+
+def compiler_version() -> str:
+    """Version of the installed `hhat-lang`, the compiler the artifacts come from."""
+
+    try:
+        return version("hhat-lang")
+
+    except PackageNotFoundError:
+        return "0+unknown"
+
+
+def source_digest(code: str | bytes) -> bytes:
+    """SHA-256 digest of the source code, keying its artifact."""
+
+    return hashlib.sha256(code.encode() if isinstance(code, str) else code).digest()
+
+
+def dump_ir(ir: BaseIR, digest: bytes, compiler: str | None = None) -> bytes:
+    """Serialize `ir`, compiled from the source with `digest`, into an artifact."""
+
+    compiler_bytes = (compiler or compiler_version()).encode()
+    header = _HEADER.pack(HATC_MAGIC, HATC_FORMAT_VERSION, digest, len(compiler_bytes))
+    payload = zlib.compress(pickle.dumps(ir, protocol=pickle.HIGHEST_PROTOCOL))
+    return header + compiler_bytes + payload
+
+
+def load_ir(data: bytes, digest: bytes, compiler: str | None = None) -> BaseIR | None:
+    """
+    Load the IR from an artifact, if it comes from the source with `digest` and the
+    same format and compiler versions; `None` otherwise, or if it is corrupted.
+    """
+
+    if len(data) < _HEADER.size:
+        return None
+
+    magic, format_version, artifact_digest, compiler_size = _HEADER.unpack_from(data)
+    compiler_end = _HEADER.size + compiler_size
+    artifact_compiler = data[_HEADER.size : compiler_end].decode(errors="replace")
+
+    if (
+        magic != HATC_MAGIC
+        or format_version != HATC_FORMAT_VERSION
+        or artifact_digest != digest
+        or artifact_compiler != (compiler or compiler_version())
+    ):
+        return None
+
+    try:
+        ir = pickle.loads(zlib.decompress(data[compiler_end:]))
+
+    except (zlib.error, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+    return ir if isinstance(ir, BaseIR) else None
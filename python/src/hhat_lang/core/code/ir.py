@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from enum import Enum, auto
-from typing import Any, Callable, Iterable
+from typing import Any, Callable, Iterator
 
 from hhat_lang.core.data.core import CompositeSymbol, Symbol
+from hhat_lang.core.error_handlers.errors import ErrorHandler
 from hhat_lang.core.types.abstract_base import BaseTypeDataStructure
+from hhat_lang.core.types.resolve_sizes import TypeLayout, resolve_layouts
 
 
 class BlockIRFlag(Enum):
@@ -59,7 +61,7 @@ class BlockIR(ABC):
     def __getitem__(self, item: int) -> InstrIR | BlockIR:
         return self._instrs[item]
 
-    def __iter__(self) -> Iterable:
+    def __iter__(self) -> Iterator:
         yield from self._instrs
 
 
@@ -73,7 +75,7 @@ class ArgsIR(ABC):
     def __contains__(self, arg: Any) -> bool:
         return arg in self._args
 
-    def __iter__(self) -> Iterable:
+    def __iter__(self) -> Iterator:
         yield from self._args
 
 
@@ -100,7 +102,7 @@ class BodyIR:
 
         self._data.append(new_item)
 
-    def __iter__(self) -> Iterable:
+    def __iter__(self) -> Iterator:
         yield from self._data
 
 
@@ -116,17 +118,17 @@ A dictionary where the keys are the type names (`Symbol`, `CompositeSymbol`) and
  values are their data structure (`BaseTypeDataStructure`).
 """
 
-FnTable = dict[
-    tuple[  # key: define the function header
-        Symbol | CompositeSymbol,  # first element: function name
-        Symbol | CompositeSymbol,  # second element: function type
-        tuple
-        | tuple[
-            Symbol | CompositeSymbol | tuple[Symbol, Symbol | CompositeSymbol], ...
-        ],  # third element: args; empty args, only types args, name and type pairs
-    ],
-    BodyIR,
-]  # value: the function body
+FnHeader = tuple[
+    Symbol | CompositeSymbol,  # first element: function name
+    Symbol | CompositeSymbol,  # second element: function type
+    tuple
+    | tuple[
+        Symbol | CompositeSymbol | tuple[Symbol, Symbol | CompositeSymbol], ...
+    ],  # third element: args; empty args, only types args, name and type pairs
+]
+"""Type annotation for `FnHeader`, the function header keying the `FnTable`."""
+
+FnTable = dict[FnHeader, BodyIR]  # value: the function body
 """
 Type annotation for `FnTable`, a function table that holds all the program functions.
 
@@ -148,17 +150,55 @@ and the dictionary value is body of the function.
 
 
 class TypeIR:
-    """To format, store and retrieve all types used in the program."""
+    """
+    To format, store and retrieve all types used in the program.
+
+    Once all the types are in, `finalize` resolves every type layout (size, qsize and
+    members offsets) once, so variable creation and index allocation only read them
+    through `layout`. Adding a type afterward drops the resolved layouts.
+    """
 
     _data: TypeTable
+    _layouts: dict[Symbol | CompositeSymbol, TypeLayout] | None
 
     def __init__(self):
         self._data = dict()
+        self._layouts = None
 
     @property
     def table(self) -> TypeTable:
         return self._data
 
+    @property
+    def is_finalized(self) -> bool:
+        return self._layouts is not None
+
+    def finalize(self) -> None | ErrorHandler:
+        """
+        Resolve the layouts of all the types in the table, in topological order (see
+        `resolve_layouts`). Returns the error if a type is cyclic or has a member type
+        that is not in the table.
+        """
+
+        match layouts := resolve_layouts(self._data):
+            case ErrorHandler():
+                return layouts
+
+        self._layouts = layouts
+        return None
+
+    def layout(self, name: Symbol | CompositeSymbol) -> TypeLayout | ErrorHandler:
+        """Resolved layout of the type, finalizing the type table first if needed."""
+
+        if self._layouts is None:
+            match layouts := resolve_layouts(self._data):
+                case ErrorHandler():
+                    return layouts
+
+            self._layouts = layouts
+
+        return self._layouts[name]
+
     def push(self, new_type: BaseTypeDataStructure):
         self[new_type.name] = new_type
 
@@ -173,6 +213,7 @@ class TypeIR:
         ):
             if key not in self._data:
                 self._data[key] = value
+                self._layouts = None
 
             else:
                 print("[[LOG:IR]] ignore adding the same type in the type table.")
@@ -233,10 +274,10 @@ class BaseIR(ABC):
     _type_table: TypeIR
     _fn_table: BaseFnIR
 
-    def __init__(self):
+    def __init__(self, fn_table: BaseFnIR):
         self._data = BodyIR()
         self._type_table = TypeIR()
-        self._fn_table = BaseFnIR()
+        self._fn_table = fn_table
 
     @property
     def types(self) -> TypeIR:
@@ -263,7 +304,7 @@ class BaseIR(ABC):
         fn_type: Symbol | CompositeSymbol,
         fn_args: Any,
         body: Any,
-    ) -> None: ...
+    ) -> None | ErrorHandler: ...
 
     def add_body(self, body: Any) -> None:
         for k in body:
@@ -3,7 +3,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from enum import Enum, auto
 
-from hhat_lang.core.data.core import Symbol, WorkingData
+from hhat_lang.core.data.core import CompositeSymbol, Symbol, WorkingData
 
 
 class ErrorCodes(Enum):
@@ -19,6 +19,8 @@ class ErrorCodes(Enum):
     TYPE_STRUCT_ASSIGN_ERROR = auto()
     TYPE_UNION_ASSIGN_ERROR = auto()
     TYPE_ENUM_ASSIGN_ERROR = auto()
+    TYPE_CYCLIC_DEFINITION_ERROR = auto()
+    TYPE_UNKNOWN_MEMBER_TYPE_ERROR = auto()
 
     CONTAINER_VAR_ASSIGN_ERROR = auto()
     CONTAINER_VAR_IS_IMMUTABLE_ERROR = auto()
@@ -31,6 +33,9 @@ class ErrorCodes(Enum):
     CAST_INT_OVERFLOW_ERROR = auto()
     CAST_ERROR = auto()
 
+    FN_NOT_FOUND_ERROR = auto()
+    FN_OVERLOAD_CONFLICT_ERROR = auto()
+
     STACK_EMPTY_ERROR = auto()
     STACK_OVERFLOW_ERROR = auto()
 
@@ -181,6 +186,35 @@ class TypeEnumError(ErrorHandler):
         )
 
 
+class TypeCyclicDefinitionError(ErrorHandler):
+    def __init__(self, cycle: tuple[Symbol | CompositeSymbol, ...]):
+        super().__init__(ErrorCodes.TYPE_CYCLIC_DEFINITION_ERROR)
+        self._cycle = cycle
+
+    def __call__(self) -> str:
+        return (
+            f"[[{self.__class__.__name__}]]: Types contain themselves:"
+            f" {' -> '.join(str(k) for k in self._cycle)}."
+        )
+
+
+class TypeUnknownMemberTypeError(ErrorHandler):
+    def __init__(
+        self,
+        member_type: Symbol | CompositeSymbol,
+        type_name: Symbol | CompositeSymbol,
+    ):
+        super().__init__(ErrorCodes.TYPE_UNKNOWN_MEMBER_TYPE_ERROR)
+        self._member_type = member_type
+        self._type_name = type_name
+
+    def __call__(self) -> str:
+        return (
+            f"[[{self.__class__.__name__}]]: Member type '{self._member_type}'"
+            f" of type '{self._type_name}' is not in the type table."
+        )
+
+
 class ContainerVarError(ErrorHandler):
     def __init__(self, var_name: WorkingData):
         super().__init__(ErrorCodes.CONTAINER_VAR_ASSIGN_ERROR)
@@ -274,6 +308,32 @@ class CastError(ErrorHandler):
         return f"[[{self.__class__.__name__}]]: Cannot cast {self._data} into {self._type_cast}."
 
 
+class FnNotFoundError(ErrorHandler):
+    def __init__(self, fn_name: Symbol | CompositeSymbol, args_types: tuple):
+        super().__init__(ErrorCodes.FN_NOT_FOUND_ERROR)
+        self._fn_name = fn_name
+        self._args_types = args_types
+
+    def __call__(self) -> str:
+        return (
+            f"[[{self.__class__.__name__}]]: No function '{self._fn_name}' for"
+            f" arguments {self._args_types}."
+        )
+
+
+class FnOverloadConflictError(ErrorHandler):
+    def __init__(self, fn_name: Symbol | CompositeSymbol, args_types: tuple):
+        super().__init__(ErrorCodes.FN_OVERLOAD_CONFLICT_ERROR)
+        self._fn_name = fn_name
+        self._args_types = args_types
+
+    def __call__(self) -> str:
+        return (
+            f"[[{self.__class__.__name__}]]: Function '{self._fn_name}' is already"
+            f" defined for arguments {self._args_types} with another type."
+        )
+
+
 class StackEmptyError(ErrorHandler):
     def __init__(self):
         super().__init__(ErrorCodes.STACK_EMPTY_ERROR)
@@ -308,7 +368,7 @@ class HeapInvalidKeyError(ErrorHandler):
 
 
 class InvalidQuantumComputedResult(ErrorHandler):
-    def __init__(self, qdata: str | Symbol):
+    def __init__(self, qdata: str | WorkingData):
         super().__init__(ErrorCodes.INVALID_QUANTUM_COMPUTED_RESULT)
         self._qdata = qdata
 
@@ -0,0 +1,204 @@
+"""
+Compact representation of quantum execution results. Outcomes are kept as packed
+integers in a `numpy` array, in parallel with their frequencies (sampled counts) or
+probabilities (exact results), so results with many distinct outcomes never need one
+Python string per outcome. `Counts` still behaves as a read-only mapping from
+bitstrings to frequencies, building the bitstrings only when they are asked for.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Iterator, Sequence
+
+import numpy as np
+
+WORD_SIZE: int = 64
+"""Number of clbits packed into each outcome word."""
+
+
+def pack_bits(rows: np.ndarray) -> np.ndarray:
+    """
+    Pack clbits rows, with shape `(rows, clbits)`, into `uint64` words with shape
+    `(rows, words)`. Clbit `k` goes to bit `k % 64` of word `k // 64`.
+    """
+
+    num_clbits = rows.shape[1]
+    num_words = max(1, -(-num_clbits // WORD_SIZE))
+    words = np.zeros((rows.shape[0], num_words), dtype=np.uint64)
+
+    for w in range(num_words):
+        chunk = rows[:, w * WORD_SIZE : (w + 1) * WORD_SIZE].astype(np.uint64)
+        shifts = np.arange(chunk.shape[1], dtype=np.uint64)
+        words[:, w] = np.bitwise_or.reduce(chunk << shifts, axis=1)
+
+    return words
+
+
+def unpack_bits(words: np.ndarray, num_clbits: int) -> np.ndarray:
+    """Unpack `uint64` words back into clbits rows with shape `(rows, clbits)`."""
+
+    rows = np.zeros((words.shape[0], num_clbits), dtype=np.uint8)
+
+    for w in range(words.shape[1]):
+        width = min(WORD_SIZE, num_clbits - w * WORD_SIZE)
+        shifts = np.arange(width, dtype=np.uint64)
+        bits = (words[:, w : w + 1] >> shifts) & np.uint64(1)
+        rows[:, w * WORD_SIZE : w * WORD_SIZE + width] = bits
+
+    return rows
+
+
+class Counts(Mapping):
+    """
+    Outcomes and their frequencies as parallel `numpy` arrays: `outcomes` holds the
+    packed clbits (see `pack_bits`), one row per distinct outcome, and `freqs` holds
+    the integer counts, or the float probabilities for exact results.
+
+    As a mapping, keys are bitstrings in qiskit's order (the last clbit is the
+    leftmost character), so it can be used wherever the counts dictionary was used.
+    """
+
+    _outcomes: np.ndarray
+    _freqs: np.ndarray
+    _num_clbits: int
+    _index: dict[int, int] | None
+
+    def __init__(self, outcomes: np.ndarray, freqs: np.ndarray, num_clbits: int):
+        if outcomes.ndim != 2 or outcomes.shape[0] != freqs.shape[0]:
+            raise ValueError("outcomes and frequencies must have the same length.")
+
+        self._outcomes = outcomes
+        self._freqs = freqs
+        self._num_clbits = num_clbits
+        self._index = None
+
+    @classmethod
+    def from_memory(cls, memory: np.ndarray) -> Counts:
+        """Counts from the per-shot clbits memory, with shape `(shots, clbits)`."""
+
+        outcomes, freqs = np.unique(pack_bits(memory), axis=0, return_counts=True)
+        return cls(outcomes, freqs.astype(np.int64), memory.shape[1])
+
+    @classmethod
+    def from_rows(cls, rows: np.ndarray, weights: np.ndarray) -> Counts:
+        """
+        Counts from clbits rows with their weights (e.g. probabilities); repeated rows
+        have their weights added up.
+        """
+
+        words = pack_bits(rows)
+        outcomes, inverse = np.unique(words, axis=0, return_inverse=True)
+        freqs = np.bincount(
+            inverse.reshape(-1), weights=weights, minlength=outcomes.shape[0]
+        )
+        return cls(outcomes, freqs.astype(weights.dtype), rows.shape[1])
+
+    @classmethod
+    def from_dict(cls, counts: dict[str, Any]) -> Counts:
+        """Counts from a bitstrings dictionary, such as qiskit's `get_counts()`."""
+
+        num_clbits = max((len(k) for k in counts), default=0)
+        rows = np.zeros((len(counts), num_clbits), dtype=np.uint8)
+
+        for n, key in enumerate(counts):
+            rows[n, : len(key)] = np.frombuffer(key[::-1].encode(), np.uint8) - ord("0")
+
+        return cls.from_rows(rows, np.array(list(counts.values())))
+
+    @property
+    def outcomes(self) -> np.ndarray:
+        return self._outcomes
+
+    @property
+    def freqs(self) -> np.ndarray:
+        return self._freqs
+
+    @property
+    def num_clbits(self) -> int:
+        return self._num_clbits
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether it holds probabilities instead of sampled counts."""
+
+        return np.issubdtype(self._freqs.dtype, np.floating)
+
+    @property
+    def shots(self) -> int:
+        """Total number of shots; it is 0 for exact results."""
+
+        return 0 if self.is_exact else int(self._freqs.sum())
+
+    def as_ints(self) -> np.ndarray:
+        """Outcomes as `uint64` integers; only for up to 64 clbits."""
+
+        if self._num_clbits > WORD_SIZE:
+            raise ValueError(f"outcomes with {self._num_clbits} clbits do not fit.")
+
+        return self._outcomes[:, 0]
+
+    def as_rows(self) -> np.ndarray:
+        """Outcomes as clbits rows, with shape `(outcomes, clbits)`."""
+
+        return unpack_bits(self._outcomes, self._num_clbits)
+
+    def probabilities(self) -> np.ndarray:
+        return self._freqs / self._freqs.sum()
+
+    def merge(self, other: Counts) -> Counts:
+        """Add up two counts from the same circuit, such as from different rounds."""
+
+        if self._num_clbits != other.num_clbits:
+            raise ValueError("cannot merge counts with different number of clbits.")
+
+        words = np.concatenate([self._outcomes, other.outcomes])
+        outcomes, inverse = np.unique(words, axis=0, return_inverse=True)
+        freqs = np.bincount(
+            inverse.reshape(-1),
+            weights=np.concatenate([self._freqs, other.freqs]),
+            minlength=outcomes.shape[0],
+        )
+        return Counts(outcomes, freqs.astype(self._freqs.dtype), self._num_clbits)
+
+    def marginal(self, clbits: Sequence[int]) -> Counts:
+        """Counts over the given clbits only, in the given order."""
+
+        return Counts.from_rows(self.as_rows()[:, list(clbits)], self._freqs)
+
+    def _key_to_int(self, key: str) -> int:
+        return int(key, 2) if key else 0
+
+    def _row_to_int(self, row: np.ndarray) -> int:
+        return sum(int(w) << (WORD_SIZE * n) for n, w in enumerate(row))
+
+    def __getitem__(self, key: str) -> Any:
+        if not isinstance(key, str) or len(key) != self._num_clbits:
+            raise KeyError(key)
+
+        if self._index is None:
+            self._index = {
+                self._row_to_int(row): n for n, row in enumerate(self._outcomes)
+            }
+
+        if (n := self._index.get(self._key_to_int(key), None)) is None:
+            raise KeyError(key)
+
+        return self._freqs[n].item()
+
+    def __len__(self) -> int:
+        return self._outcomes.shape[0]
+
+    def __iter__(self) -> Iterator:
+        if self._num_clbits == 0:
+            yield from ("" for _ in range(len(self)))
+            return
+
+        rows = unpack_bits(self._outcomes, self._num_clbits)
+        chars = (rows[:, ::-1] + ord("0")).astype(np.uint8)
+
+        for row in chars:
+            yield row.tobytes().decode()
+
+    def __repr__(self) -> str:
+        return f"Counts({dict(self.items())})"
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Sequence
 
 from hhat_lang.core.data.core import WorkingData
 from hhat_lang.core.execution.abstract_base import BaseEvaluator
@@ -13,10 +13,19 @@ class BaseLowLevelQLang(ABC):
     """
     Hold H-hat quantum data to transform into low-level
     quantum-specific language.
+
+    The quantum data indexes are placed on the low-level register positions
+    `offset` to `offset + num_idxs - 1`, so several quantum data can be packed
+    on disjoint ranges of the same register (see `offset`).
+
+    Only the indexes in `measure` are measured at the end, when set, into a classical
+    register as large as needed; otherwise all the indexes are measured.
     """
 
     _qdata: WorkingData
     _num_idxs: int
+    _offset: int
+    _measure: tuple[int, ...] | None
     _code: IRBlock
     _idx: IndexManager
     _executor: BaseEvaluator
@@ -35,12 +44,77 @@ class BaseLowLevelQLang(ABC):
         self._idx = idx
         self._executor = executor
         self._num_idxs = len(self._idx.in_use_by.get(self._qdata, []))
+        self._offset = 0
+        self._measure = None
+
+    @property
+    def qdata(self) -> WorkingData:
+        return self._qdata
+
+    @property
+    def num_idxs(self) -> int:
+        return self._num_idxs
+
+    @property
+    def offset(self) -> int:
+        """First register position of the quantum data indexes."""
+
+        return self._offset
+
+    @offset.setter
+    def offset(self, value: int) -> None:
+        if value < 0:
+            raise ValueError(f"register offset must be non-negative, got {value}.")
+
+        self._offset = value
+
+    @property
+    def positions(self) -> tuple[int, ...]:
+        """Register positions of the quantum data indexes, in index order."""
+
+        return tuple(range(self._offset, self._offset + self._num_idxs))
+
+    @property
+    def measure(self) -> tuple[int, ...] | None:
+        """
+        Quantum data indexes (from 0 to `num_idxs - 1`) to measure, in clbits order,
+        or `None` to measure all of them.
+        """
+
+        return self._measure
+
+    @measure.setter
+    def measure(self, value: Sequence[int] | None) -> None:
+        if value is not None:
+            value = tuple(value)
+
+            if any(not 0 <= k < self._num_idxs for k in value):
+                raise ValueError(
+                    f"measured indexes must be within 0 and {self._num_idxs - 1},"
+                    f" got {value}."
+                )
+
+            if len(set(value)) != len(value):
+                raise ValueError(f"measured indexes must be unique, got {value}.")
+
+        self._measure = value
+
+    @property
+    def measured(self) -> tuple[int, ...]:
+        """Quantum data indexes that are measured, in clbits order."""
+
+        return tuple(range(self._num_idxs)) if self._measure is None else self._measure
+
+    @abstractmethod
+    def init_qlang(
+        self, num_idxs: int | None = None, num_clbits: int | None = None
+    ) -> tuple[str, ...]: ...
 
     @abstractmethod
-    def init_qlang(self) -> tuple[str, ...]: ...
+    def end_qlang(self, clbit_offset: int = 0) -> tuple[str, ...]: ...
 
     @abstractmethod
-    def end_qlang(self) -> tuple[str, ...]: ...
+    def gen_body(self, *args: Any, **kwargs: Any) -> str: ...
 
     @abstractmethod
     def gen_instrs(self, *args: Any, **kwargs: Any) -> tuple[str, ...]: ...
@@ -48,5 +122,11 @@ class BaseLowLevelQLang(ABC):
     @abstractmethod
     def gen_program(self, *args: Any, **kwargs: Any) -> str: ...
 
+    @classmethod
+    @abstractmethod
+    def gen_packed_program(
+        cls, qlangs: Sequence[BaseLowLevelQLang], *args: Any, **kwargs: Any
+    ) -> tuple[str, tuple[tuple[int, ...], ...]]: ...
+
     @abstractmethod
     def __call__(self, *args: Any, **kwargs: Any) -> Any: ...
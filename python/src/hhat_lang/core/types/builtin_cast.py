@@ -0,0 +1,99 @@
+"""
+Vectorized cast kernels from quantum results into the built-in classical types. They
+work on whole `numpy` arrays of outcomes at once instead of one value at a time, with
+the same checks as the scalar cast functions (e.g. `int_to_uN`): negative values into
+unsigned types and values out of the target type range are cast errors.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from hhat_lang.core.data.core import CoreLiteral, Symbol
+from hhat_lang.core.error_handlers.errors import (
+    CastError,
+    CastIntOverflowError,
+    CastNegToUnsignedError,
+    ErrorHandler,
+)
+from hhat_lang.core.execution.counts import Counts
+from hhat_lang.core.types.builtin_base import (
+    S_BOOL,
+    S_INT,
+    S_U16,
+    S_U32,
+    S_U64,
+    BuiltinSingleDS,
+)
+
+CAST_DTYPES: dict[Symbol, type[np.generic]] = {
+    S_INT: np.int64,
+    S_BOOL: np.bool_,
+    S_U16: np.uint16,
+    S_U32: np.uint32,
+    S_U64: np.uint64,
+}
+"""Numpy dtype for each built-in classical type the kernels can cast into."""
+
+
+def _type_range(ds: BuiltinSingleDS) -> tuple[int, int]:
+    """Smallest and largest values for the type, both included."""
+
+    if ds.name == S_BOOL:
+        return 0, 1
+
+    if ds.name == S_INT:
+        bits = ds.bitsize.size if ds.bitsize is not None else 64
+        return -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+
+    if ds.bitsize is None:
+        raise NotImplementedError()
+
+    return 0, (1 << ds.bitsize.size) - 1
+
+
+def _literal(value: np.integer) -> CoreLiteral:
+    return CoreLiteral(str(value.item()), S_INT.value)
+
+
+def cast_values(ds: BuiltinSingleDS, values: np.ndarray) -> np.ndarray | ErrorHandler:
+    """
+    Cast an array of integer values into the type `ds`. The first offending value
+    gives the error: `CastNegToUnsignedError` for negative values into unsigned types
+    and `CastIntOverflowError` for values out of the type range.
+    """
+
+    if ds.name not in CAST_DTYPES or not np.issubdtype(values.dtype, np.integer):
+        return CastError(ds.name, Symbol(str(values.dtype)))
+
+    min_value, max_value = _type_range(ds)
+    signed = np.issubdtype(values.dtype, np.signedinteger)
+
+    if signed and min_value == 0 and (neg := np.flatnonzero(values < 0)).size:
+        return CastNegToUnsignedError(_literal(values[neg[0]]), ds.name)
+
+    if signed and (under := np.flatnonzero(values < min_value)).size:
+        return CastIntOverflowError(_literal(values[under[0]]), ds.name)
+
+    # the bound may not fit the values dtype, in which case no value can go over it
+    if max_value < np.iinfo(values.dtype).max:
+        if (over := np.flatnonzero(values > max_value)).size:
+            return CastIntOverflowError(_literal(values[over[0]]), ds.name)
+
+    return values.astype(CAST_DTYPES[ds.name])
+
+
+def cast_counts(
+    ds: BuiltinSingleDS, counts: Counts
+) -> tuple[np.ndarray, np.ndarray] | ErrorHandler:
+    """
+    Cast the counts outcomes into the type `ds`, keeping their frequencies. Returns
+    the cast values and the frequencies, as parallel arrays, or the cast error.
+    """
+
+    match res := cast_values(ds, counts.as_ints()):
+        case ErrorHandler():
+            return res
+
+        case _:
+            return res, counts.freqs
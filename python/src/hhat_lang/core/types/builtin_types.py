@@ -28,3 +28,9 @@ QBool = BuiltinSingleDS(Symbol("@bool"), Size(POINTER_SIZE), qsize=QSize(1))
 QU2 = BuiltinSingleDS(Symbol("@u2"), Size(POINTER_SIZE), qsize=QSize(2))
 QU3 = BuiltinSingleDS(Symbol("@u3"), Size(POINTER_SIZE), qsize=QSize(3))
 QU4 = BuiltinSingleDS(Symbol("@u4"), Size(POINTER_SIZE), qsize=QSize(4))
+
+
+BUILTIN_TYPES: dict[Symbol, BuiltinSingleDS] = {
+    k.name: k for k in (Int, Bool, U16, U32, U64, QBool, QU2, QU3, QU4)
+}
+"""Built-in data types by name."""
@@ -1,40 +1,262 @@
+"""
+Size (in bits) and qsize (in indexes) resolution for the types in the type table.
+`resolve_layouts` resolves the whole table at once, in topological order, into
+`TypeLayout`s; `ct_size` and `ct_qsize` resolve a single type on demand.
+"""
+
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from hhat_lang.core.code.ir import TypeTable
+from hhat_lang.core.data.core import CompositeSymbol, Symbol
+from hhat_lang.core.error_handlers.errors import (
+    ErrorHandler,
+    TypeCyclicDefinitionError,
+    TypeUnknownMemberTypeError,
+)
 from hhat_lang.core.types.abstract_base import BaseTypeDataStructure
+from hhat_lang.core.types.builtin_base import BuiltinSingleDS
 
+if TYPE_CHECKING:
+    from hhat_lang.core.code.ir import TypeTable
 
-def _size_resolver():
-    pass
+SizeCache = dict[Symbol | CompositeSymbol, int]
+"""
+Type annotation for `SizeCache`: resolved sizes by type name, so each type in the type
+table is resolved only once, however many other types have it as member.
+"""
 
 
-def _qsize_resolver(ds: BaseTypeDataStructure, table: TypeTable) -> int | None:
-    if ds.qsize.max is None:
-        qsize_max = 0
+def _members_types(ds: BaseTypeDataStructure) -> tuple[Symbol | CompositeSymbol, ...]:
+    if isinstance(ds, BuiltinSingleDS):
+        return ()
 
-        for _, member_type in ds:
-            res = _qsize_resolver(table[member_type], table)
+    return tuple(member_type for _, member_type in ds.members)
 
-            if res:
-                qsize_max += res
 
-        ds.qsize.max = qsize_max or None
+def _own_size(ds: BaseTypeDataStructure) -> int | None:
+    """Size given by the type itself, or `None` if it comes from its members."""
 
-    return ds.qsize.max
+    if isinstance(ds, BuiltinSingleDS):
+        return ds.bitsize.size if ds.bitsize is not None else 0
 
+    return ds.size.size if ds.size is not None else None
 
-def ct_size() -> Any:
-    """Compile-time size resolver."""
 
-    pass
+def _own_qsize(ds: BaseTypeDataStructure) -> int | None:
+    """Qsize given by the type itself, or `None` if it comes from its members."""
 
+    if ds.qsize is not None and (ds.is_builtin or ds.qsize.max is not None):
+        return ds.qsize.min if ds.qsize.max is None else ds.qsize.max
 
-def ct_qsize(ds: BaseTypeDataStructure, type_table: TypeTable) -> Any:
-    """Compile-time qsize resolver."""
+    return None
 
-    pass
+
+def _size_resolver(
+    ds: BaseTypeDataStructure, table: TypeTable, cache: SizeCache
+) -> int:
+    if (size := cache.get(ds.name, None)) is not None:
+        return size
+
+    if (size := _own_size(ds)) is None:
+        size = sum(
+            _size_resolver(table[k], table, cache)
+            for k in _members_types(ds)
+            if k != ds.name
+        )
+
+    cache[ds.name] = size
+    return size
+
+
+def _qsize_resolver(
+    ds: BaseTypeDataStructure, table: TypeTable, cache: SizeCache
+) -> int:
+    if (qsize := cache.get(ds.name, None)) is not None:
+        return qsize
+
+    if (qsize := _own_qsize(ds)) is None:
+        qsize = sum(
+            _qsize_resolver(table[k], table, cache)
+            for k in _members_types(ds)
+            if k != ds.name
+        )
+
+        if ds.qsize is not None:
+            ds.qsize.add_max(qsize)
+
+    cache[ds.name] = qsize
+    return qsize
+
+
+class TypeLayout:
+    """
+    Resolved layout of a type: its size in bits and qsize in indexes, and the bit and
+    index offsets of each member, in declaration order.
+    """
+
+    _name: Symbol | CompositeSymbol
+    _size: int
+    _qsize: int
+    _offsets: dict[Symbol | CompositeSymbol, int]
+    _qoffsets: dict[Symbol | CompositeSymbol, int]
+
+    def __init__(
+        self,
+        name: Symbol | CompositeSymbol,
+        size: int,
+        qsize: int,
+        offsets: dict[Symbol | CompositeSymbol, int] | None = None,
+        qoffsets: dict[Symbol | CompositeSymbol, int] | None = None,
+    ):
+        self._name = name
+        self._size = size
+        self._qsize = qsize
+        self._offsets = offsets or dict()
+        self._qoffsets = qoffsets or dict()
+
+    @property
+    def name(self) -> Symbol | CompositeSymbol:
+        return self._name
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def qsize(self) -> int:
+        return self._qsize
+
+    @property
+    def offsets(self) -> dict[Symbol | CompositeSymbol, int]:
+        """Bit offset of each member."""
+
+        return self._offsets
+
+    @property
+    def qoffsets(self) -> dict[Symbol | CompositeSymbol, int]:
+        """First index of each member with indexes (quantum members)."""
+
+        return self._qoffsets
+
+    def __repr__(self) -> str:
+        return f"TypeLayout({self._name}, size={self._size}, qsize={self._qsize})"
+
+
+def _topological_order(
+    table: TypeTable,
+) -> list[Symbol | CompositeSymbol] | ErrorHandler:
+    """
+    Types ordered so that every type comes after its members types. Uses an explicit
+    stack, so deeply nested types do not hit the recursion limit.
+    """
+
+    order: list[Symbol | CompositeSymbol] = []
+    # types being visited, in the current path, and types already done
+    path: dict[Symbol | CompositeSymbol, None] = dict()
+    done: set[Symbol | CompositeSymbol] = set()
+
+    for root in table:
+        if root in done:
+            continue
+
+        stack = [(root, iter(_members_types(table[root])))]
+        path[root] = None
+
+        while stack:
+            name, members = stack[-1]
+
+            if (member := next(members, None)) is None:
+                stack.pop()
+                path.pop(name)
+                done.add(name)
+                order.append(name)
+                continue
+
+            if member not in table:
+                return TypeUnknownMemberTypeError(member, name)
+
+            if member in path:
+                cycle = tuple(path)
+                return TypeCyclicDefinitionError(
+                    cycle[cycle.index(member) :] + (member,)
+                )
+
+            if member not in done:
+                path[member] = None
+                stack.append((member, iter(_members_types(table[member]))))
+
+    return order
+
+
+def resolve_layouts(
+    table: TypeTable,
+) -> dict[Symbol | CompositeSymbol, TypeLayout] | ErrorHandler:
+    """
+    Resolve the layout of every type in the table, once each, in topological order:
+    each type is resolved after its members types, from their already resolved
+    layouts. Returns `TypeCyclicDefinitionError` if a type contains itself, directly
+    or through other types, and `TypeUnknownMemberTypeError` if a member type is not
+    in the table.
+    """
+
+    match order := _topological_order(table):
+        case ErrorHandler():
+            return order
+
+    layouts: dict[Symbol | CompositeSymbol, TypeLayout] = dict()
+
+    for name in order:
+        ds = table[name]
+        offsets: dict[Symbol | CompositeSymbol, int] = dict()
+        qoffsets: dict[Symbol | CompositeSymbol, int] = dict()
+        size, qsize = 0, 0
+
+        members = () if isinstance(ds, BuiltinSingleDS) else ds.members
+
+        for member, member_type in members:
+            member_layout = layouts[member_type]
+            offsets[member] = size
+            size += member_layout.size
+
+            if member_layout.qsize:
+                qoffsets[member] = qsize
+                qsize += member_layout.qsize
+
+        if (own_size := _own_size(ds)) is not None:
+            size = own_size
+
+        if (own_qsize := _own_qsize(ds)) is not None:
+            qsize = own_qsize
+
+        elif ds.qsize is not None:
+            ds.qsize.add_max(qsize)
+        layouts[name] = TypeLayout(name, size, qsize, offsets, qoffsets)
+
+    return layouts
+
+
+def ct_size(
+    ds: BaseTypeDataStructure, type_table: TypeTable, cache: SizeCache | None = None
+) -> int:
+    """
+    Compile-time size resolver: size in bits of the type, adding up its members sizes.
+    Pass the same `cache` to resolve many types from the same type table.
+    """
+
+    return _size_resolver(ds, type_table, dict() if cache is None else cache)
+
+
+def ct_qsize(
+    ds: BaseTypeDataStructure, type_table: TypeTable, cache: SizeCache | None = None
+) -> int:
+    """
+    Compile-time qsize resolver: number of indexes (qubits) of the type, adding up its
+    members qsizes. Pass the same `cache` to resolve many types from the same type
+    table.
+    """
+
+    return _qsize_resolver(ds, type_table, dict() if cache is None else cache)
 
 
 def runtime_size() -> Any:
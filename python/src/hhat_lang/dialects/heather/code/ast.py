@@ -50,7 +50,7 @@ class OnlyValue(Node):
 
 class Modifier(Node):
     def __init__(self, *modifiers: ArgValuePair):
-        self._values = modifiers
+        self._value = modifiers
         self._name = self.__class__.__name__
 
 
@@ -123,7 +123,7 @@ class DeclareAssign(Node):
 
 class CallArgs(Node):
     def __init__(self, *args: ArgValuePair | OnlyValue):
-        self._values = args
+        self._value = args
         self._name = self.__class__.__name__
 
 
@@ -135,7 +135,7 @@ class Call(Node):
 
 class MethodCallArgs(Node):
     def __init__(self, *args: ArgValuePair | OnlyValue):
-        self._values = args
+        self._value = args
         self._name = self.__class__.__name__
 
 
@@ -182,7 +182,7 @@ class ArgTypePair(Node):
 
 class FnArgs(Node):
     def __init__(self, *args: ArgTypePair):
-        self._values = args
+        self._value = args
         self._name = self.__class__.__name__
 
 
@@ -257,7 +257,7 @@ class Body(Node):
     """
 
     def __init__(self, *body: BodyType):
-        self._values = body
+        self._value = body
         self._name = self.__class__.__name__
 
 
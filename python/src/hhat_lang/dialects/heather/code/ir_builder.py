@@ -4,27 +4,41 @@ In this file there are three distinct sections:
 1. The building functions to get from AST to something that IR and the IR tables can handle;
 2. The actual IR tables builders, namely types and functions; and
 3. The main code builder where the `main` closure lies.
+
+The AST is lowered in a single pass, without recursion: `_build` walks it with an
+explicit stack, in post-order, and each node is handed to the building function for
+its AST class (see `_BUILDERS`) together with its children, already built. Each node
+is visited at most twice and built once, so the IR build time is linear on the AST
+size and deep code does not hit the recursion limit.
 """
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable, cast
 
 from hhat_lang.core.code.ast import AST
+from hhat_lang.core.code.ir import InstrIRFlag
 from hhat_lang.core.data.core import (
     CompositeSymbol,
     CoreLiteral,
     Symbol,
 )
+from hhat_lang.core.error_handlers.errors import (
+    ErrorHandler,
+    TypeUnknownMemberTypeError,
+)
+from hhat_lang.core.types.abstract_base import BaseTypeDataStructure
+from hhat_lang.core.types.builtin_types import BUILTIN_TYPES
+from hhat_lang.core.types.core import EnumDS, SingleDS, StructDS, UnionDS
 from hhat_lang.dialects.heather.code.ast import (
     ArgTypePair,
     ArgValuePair,
     Array,
     Assign,
     Body,
-    BodyType,
     Call,
     CallArgs,
+    CallWithArgsBodyOptions,
     CallWithBody,
     CallWithBodyOptions,
     Cast,
@@ -36,7 +50,6 @@ from hhat_lang.dialects.heather.code.ast import (
     Expr,
     FnArgs,
     FnDef,
-    FnImport,
     Hash,
     Id,
     Imports,
@@ -51,26 +64,22 @@ from hhat_lang.dialects.heather.code.ast import (
     Program,
     SingleTypeMember,
     TypeDef,
-    TypeImport,
     TypeMember,
-    TypeType,
-    ValueType,
 )
 from hhat_lang.dialects.heather.code.simple_ir_builder.builder import (
-    define_argvaluepair,
     define_compositeid,
     define_id,
     define_literal,
 )
 
 # for now just a simple IR for the interpreter suffices
-from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IR
-from hhat_lang.dialects.heather.parsing.imports import (
-    parse_imports,
-    parse_types,
-    parse_types_compositeid,
-    parse_types_compositeidwithclosure,
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import (
+    IR,
+    IRArgs,
+    IRBlock,
+    IRInstr,
 )
+from hhat_lang.dialects.heather.parsing.imports import parse_imports
 
 # TODO: include other implementation modules for the IR, as below.
 #  - each one of them should contain all the named functions
@@ -80,347 +89,322 @@ from hhat_heather.code.mlir_ir import define_id
 ...
 """
 
+BuildFn = Callable[[Any, tuple, IR], Any]
+"""
+Type annotation for `BuildFn`, a building function. It receives the AST node, the
+tuple of its children already built, and the IR being built, and returns the node
+built (`None` for nodes that only add to the IR tables), or an `ErrorHandler`.
+"""
+
+NULL_TYPE: Symbol = Symbol("null")
+"""Type of functions defined without type."""
+
 
 ########################################################
 # FUNCTION BUILDERS FROM AST TO ACTUAL CODE FOR THE IR #
 ########################################################
 
 
-def _build_id(code: Id) -> Symbol:
+def _build_id(code: Id, _args: tuple, _ir: IR) -> Symbol:
     return define_id(code)
 
 
-def _build_compositeid(code: CompositeId) -> CompositeSymbol:
+def _build_compositeid(code: CompositeId, _args: tuple, _ir: IR) -> CompositeSymbol:
     return define_compositeid(code)
 
 
-def _build_argvaluepair(code: ArgValuePair) -> tuple[Symbol, Any]:
-    return define_argvaluepair(code)
-
-
-def _build_onlyvalue(code: OnlyValue) -> Symbol | CompositeSymbol | CoreLiteral | Any:
-    return _build_valuetype(code.value[0])
+def _build_argvaluepair(_code: ArgValuePair, args: tuple, _ir: IR) -> tuple[Any, Any]:
+    return args[0], args[1]
 
 
-def _build_modifier(code: Modifier) -> tuple[tuple[Symbol, Any], ...]:
-    mods = ()
+def _build_onlyvalue(_code: OnlyValue, args: tuple, _ir: IR) -> Any:
+    return args[0]
 
-    for mod in code.value:
 
-        arg, value = _build_argvaluepair(mod)
-        mods += ((arg, value),)
+def _build_modifier(_code: Modifier, args: tuple, _ir: IR) -> tuple:
+    return args
 
-    return mods
 
+def _build_modifiedid(_code: ModifiedId, _args: tuple, _ir: IR) -> Any:
+    raise NotImplementedError("modified id not implemented")
 
-def _build_modifiedid(code: ModifiedId) -> Any:
-    pass
 
-
-def _build_literal(code: Literal) -> CoreLiteral:
+def _build_literal(code: Literal, _args: tuple, _ir: IR) -> CoreLiteral:
     return define_literal(code)
 
 
-def _build_array(code: Array) -> Any:
-    pass
-
-
-def _build_hash(code: Hash) -> Any:
-    pass
-
-
-def _build_expr(code: Expr) -> Any:
-    pass
-
-
-def _build_declare(code: Declare) -> Any:
-    var_name = _build_id(code.value[0])
-    var_type = _build_typetype(code.value[1])
-
-
-def _build_assign(code: Assign) -> Any:
-    pass
-
-
-def _build_declareassign(code: DeclareAssign) -> Any:
-    pass
-
-
-def _build_callargs(code: CallArgs) -> Any:
-    pass
-
-
-def _build_call(code: Call) -> Any:
-    pass
-
-
-def _build_methodcallargs(code: MethodCallArgs) -> Any:
-    pass
-
-
-def _build_methodcall(code: MethodCall) -> Any:
-    pass
-
-
-def _build_insideoption(code: InsideOption) -> Any:
-    pass
-
-
-def _build_callwithbodyoptions(code: CallWithBodyOptions) -> Any:
-    pass
+def _build_array(_code: Array, _args: tuple, _ir: IR) -> Any:
+    raise NotImplementedError("array not implemented")
 
 
-def _build_callwithbody(code: CallWithBody) -> Any:
-    pass
+def _build_hash(_code: Hash, _args: tuple, _ir: IR) -> Any:
+    raise NotImplementedError("hash not implemented")
 
 
-def _build_argtypepair(code: ArgTypePair) -> tuple[Symbol, Any]:
-    pass
+def _build_cast(_code: Cast, args: tuple, _ir: IR) -> IRInstr:
+    return IRInstr(args[1], IRArgs(args[0]), InstrIRFlag.CALL)
 
 
-def _build_fnargs(code: FnArgs) -> Any:
-    pass
+def _build_expr(_code: Expr, args: tuple, _ir: IR) -> Any:
+    return args[0] if len(args) == 1 else IRBlock(*args)
 
 
-def _build_fndef(code: FnDef) -> Any:
-    pass
+def _build_declare(_code: Declare, args: tuple, _ir: IR) -> IRInstr:
+    return IRInstr(args[0], IRArgs(args[1]), InstrIRFlag.DECLARE)
 
 
-def _build_typemember(code: TypeMember) -> Any:
-    pass
+def _build_assign(_code: Assign, args: tuple, _ir: IR) -> IRInstr:
+    return IRInstr(args[0], IRArgs(args[1]), InstrIRFlag.ASSIGN)
 
 
-def _build_singletypemember(code: SingleTypeMember) -> Any:
-    pass
+def _build_declareassign(_code: DeclareAssign, args: tuple, _ir: IR) -> IRInstr:
+    return IRInstr(args[0], IRArgs(args[1], args[2]), InstrIRFlag.DECLARE_ASSIGN)
 
 
-def _build_enumtypemember(code: EnumTypeMember) -> Any:
-    pass
+def _build_callargs(_code: CallArgs | MethodCallArgs, args: tuple, _ir: IR) -> tuple:
+    return args
 
 
-def _build_typedef(code: TypeDef) -> Any:
-    pass
+def _build_call(_code: Call | MethodCall, args: tuple, _ir: IR) -> IRInstr:
+    return IRInstr(args[0], IRArgs(*args[1]), InstrIRFlag.CALL)
 
 
-def _build_typeimport(code: TypeImport) -> Any:
-    for k in code:
+def _build_insideoption(_code: InsideOption, args: tuple, _ir: IR) -> tuple[Any, Any]:
+    return args[0], args[1]
 
-        match k:
-            case Id():
-                pass
 
-            case CompositeId():
-                res = parse_types_compositeid(k)
+def _build_callwithbodyoptions(
+    _code: CallWithBodyOptions, args: tuple, _ir: IR
+) -> IRInstr:
+    return IRInstr(args[0], IRArgs(*args[1], *args[2:]), InstrIRFlag.CONTROLFLOW)
 
-            case CompositeIdWithClosure():
-                res = parse_types_compositeidwithclosure(k)
 
+def _build_callwithargsbodyoptions(
+    _code: CallWithArgsBodyOptions, args: tuple, _ir: IR
+) -> IRInstr:
+    return IRInstr(args[0], IRArgs(*args[1:]), InstrIRFlag.CONTROLFLOW)
 
-def _build_fnimport(code: FnImport) -> Any:
-    pass
 
+def _build_callwithbody(_code: CallWithBody, args: tuple, _ir: IR) -> IRInstr:
+    return IRInstr(args[0], IRArgs(*args[1], args[2]), InstrIRFlag.CALL)
 
-def _build_imports(code: Imports) -> Any:
-    for k in code:
 
-        match k:
-            case TypeImport():
-                return _build_typeimport(k)
+def _build_argtypepair(_code: ArgTypePair, args: tuple, _ir: IR) -> tuple[Any, Any]:
+    return args[0], args[1]
 
-            case FnImport():
-                return _build_fnimport(k)
 
-            case _:
-                raise ValueError(f"invalid import syntax\n  =>\n{k}\n")
-
-
-def _build_body(code: Body) -> Any:
-    for k in code:
-
-        _build_bodytype(k)
-
-
-##############################
-# TYPES DESCRIPTORS BUILDERS #
-##############################
-
-
-def _build_valuetype(code: ValueType) -> Any:
-    """Build based on the `ValueType` type descriptor."""
-
-    match tmp := code:
-
-        case Id():
-            return _build_id(tmp)
-
-        case CompositeId():
-            return _build_compositeid(tmp)
-
-        case ModifiedId():
-            return _build_modifiedid(tmp)
-
-        case Literal():
-            return _build_literal(tmp)
-
-        case Array():
-            raise NotImplementedError("array not implemented")
-
-        case Hash():
-            raise NotImplementedError("hash not implemented")
-
-        case _:
-            raise ValueError(f"unknown '{code}'.")
+def _build_fnargs(_code: FnArgs, args: tuple, _ir: IR) -> tuple:
+    return args
 
 
-def _build_typetype(code: TypeType) -> Any:
-    """Build based on the `TypeType` type descriptor."""
+def _build_typemember(_code: TypeMember, args: tuple, _ir: IR) -> tuple[Any, Any]:
+    return args[0], args[1]
 
-    match code:
-        case Id():
-            return _build_id(code)
 
-        case CompositeId():
-            return _build_compositeid(code)
+def _build_singletypemember(_code: SingleTypeMember, args: tuple, _ir: IR) -> Any:
+    return args[0]
 
-        case ModifiedId():
-            return _build_modifiedid(code)
 
-        case _:
-            raise NotImplementedError()
+def _build_enumtypemember(_code: EnumTypeMember, args: tuple, _ir: IR) -> Any:
+    return args[0]
 
 
-def _build_bodytype(code: BodyType) -> Any:
-    """Build based on the `BodyType` type descriptor."""
+def _build_imports(code: Imports, _args: tuple, _ir: IR) -> None:
+    parse_imports(code)
 
-    match k := code:
-        case Expr():
-            _build_expr(k)
 
-        case Declare():
-            _build_declare(k)
+def _build_body(_code: Body, args: tuple, _ir: IR) -> IRBlock:
+    return IRBlock(*args)
 
-        case Assign():
-            _build_assign(k)
 
-        case DeclareAssign():
-            _build_declareassign(k)
+def _build_main(_code: Main, args: tuple, ir: IR) -> None:
+    ir.add_body(args)
 
-        case Call():
-            _build_call(k)
 
-        case MethodCall():
-            _build_methodcall(k)
-
-        case CallWithBody():
-            _build_callwithbody(k)
-
-        case CallWithBodyOptions():
-            _build_callwithbodyoptions(k)
+def _build_program(_code: Program, _args: tuple, ir: IR) -> IR:
+    return ir
 
 
 ##################
 # TABLE BUILDERS #
 ##################
 
+_TYPE_DS: dict[str, type[BaseTypeDataStructure]] = {
+    "single": SingleDS,
+    "struct": StructDS,
+    "union": UnionDS,
+    "enum": EnumDS,
+}
 
-def build_typetable(code: AST) -> Any:
-    for k in code:
-
-        match k:
-
-            case Id():
-                pass
 
-            case CompositeId():
-                pass
+def _member_type(
+    member_type: Symbol | CompositeSymbol, ir: IR
+) -> BaseTypeDataStructure | None:
+    """Member type from the type table, adding it there first if it is built-in."""
 
-            case ArgValuePair():
-                pass
+    if member_type in ir.types:
+        return ir.types[member_type]
 
-            case OnlyValue():
-                pass
+    if isinstance(member_type, Symbol) and member_type in BUILTIN_TYPES:
+        ir.types.push(BUILTIN_TYPES[member_type])
+        return BUILTIN_TYPES[member_type]
 
-            case Modifier():
-                pass
+    return None
 
-            case ModifiedId():
-                pass
 
-            case Literal():
-                pass
+def _build_typedef(code: TypeDef, args: tuple, ir: IR) -> None | ErrorHandler:
+    type_name, _, *members = args
+    ds_kind = cast(str, cast(Id, code.value[1]).value[0])
 
-            case Array():
-                pass
+    if (ds_class := _TYPE_DS.get(ds_kind, None)) is None:
+        raise ValueError(f"unknown type data structure '{ds_kind}'.")
 
-            case Hash():
-                pass
+    ds: Any = ds_class(type_name)
 
-            case Expr():
-                pass
+    for member in members:
+        match member:
+            case (member_name, member_type):
+                if (member_ds := _member_type(member_type, ir)) is None:
+                    return TypeUnknownMemberTypeError(member_type, type_name)
 
-            case Declare():
-                pass
+                res = ds.add_member(member_ds, member_name)
 
-            case Assign():
-                pass
+            case _ if isinstance(ds, EnumDS):
+                res = ds.add_member(type_name, member)
 
-            case DeclareAssign():
-                pass
-
-            case CallArgs():
-                pass
+            case _:
+                if (member_ds := _member_type(member, ir)) is None:
+                    return TypeUnknownMemberTypeError(member, type_name)
+
+                res = ds.add_member(member_ds)
+
+        if isinstance(res, ErrorHandler):
+            return res
+
+    ir.add_type(type_name, ds)
+    return None
+
+
+def _build_fndef(_code: FnDef, args: tuple, ir: IR) -> None | ErrorHandler:
+    fn_name, fn_type, fn_args, body = args
+    return ir.add_fn(
+        fn_name=fn_name,
+        fn_type=fn_type or NULL_TYPE,
+        fn_args=fn_args,
+        body=body or IRBlock(),
+    )
+
+
+def build_typetable(code: TypeDef, ir: IR) -> None | ErrorHandler:
+    """Build a type definition into the type table of `ir`."""
+
+    return _build(code, ir)
+
+
+def build_fntable(code: FnDef, ir: IR) -> None | ErrorHandler:
+    """Build a function definition into the function table of `ir`."""
+
+    return _build(code, ir)
+
+
+_BUILDERS: dict[type[AST], BuildFn] = {
+    Id: _build_id,
+    CompositeId: _build_compositeid,
+    ArgValuePair: _build_argvaluepair,
+    OnlyValue: _build_onlyvalue,
+    Modifier: _build_modifier,
+    ModifiedId: _build_modifiedid,
+    Literal: _build_literal,
+    Array: _build_array,
+    Hash: _build_hash,
+    Cast: _build_cast,
+    Expr: _build_expr,
+    Declare: _build_declare,
+    Assign: _build_assign,
+    DeclareAssign: _build_declareassign,
+    CallArgs: _build_callargs,
+    Call: _build_call,
+    MethodCallArgs: _build_callargs,
+    MethodCall: _build_call,
+    InsideOption: _build_insideoption,
+    CallWithBodyOptions: _build_callwithbodyoptions,
+    CallWithArgsBodyOptions: _build_callwithargsbodyoptions,
+    CallWithBody: _build_callwithbody,
+    ArgTypePair: _build_argtypepair,
+    FnArgs: _build_fnargs,
+    FnDef: _build_fndef,
+    TypeMember: _build_typemember,
+    SingleTypeMember: _build_singletypemember,
+    EnumTypeMember: _build_enumtypemember,
+    TypeDef: _build_typedef,
+    Imports: _build_imports,
+    Body: _build_body,
+    Main: _build_main,
+    Program: _build_program,
+}
+"""Building function for each AST class."""
+
+_LEAVES: frozenset[type[AST]] = frozenset(
+    {Id, CompositeId, CompositeIdWithClosure, Literal, Array, Hash, Imports}
+)
+"""AST classes built as a whole, without building their children first."""
 
-            case Call():
-                pass
 
-            case MethodCallArgs():
-                pass
+def _children(code: AST) -> tuple:
+    """Children of the node, with the tuples of nodes in its value flattened."""
 
-            case MethodCall():
-                pass
+    if type(code) in _LEAVES:
+        return ()
 
-            case InsideOption():
-                pass
+    return tuple(
+        k for item in code.value for k in (item if isinstance(item, tuple) else (item,))
+    )
 
-            case CallWithBodyOptions():
-                pass
 
-            case CallWithBody():
-                pass
+def _build(code: AST, ir: IR) -> Any | ErrorHandler:
+    """
+    Build the AST into `ir`, in post-order: a node is built once all its children are,
+    from their results. Returns the root node built, or the first `ErrorHandler` that
+    a building function returns.
+    """
 
-            case ArgTypePair():
-                pass
+    # nodes to visit, and their number of children once expanded (-1 before)
+    stack: list[tuple[AST | None, int]] = [(code, -1)]
+    results: list[Any] = []
+    builders = _BUILDERS
 
-            case FnArgs():
-                pass
+    while stack:
+        node, num_children = stack.pop()
 
-            case TypeMember():
-                pass
+        if node is None:
+            results.append(None)
+            continue
 
-            case TypeDef():
-                pass
+        if (builder := builders.get(type(node), None)) is None:
+            raise ValueError(f"unknown '{node}'.")
 
-            case Imports():
-                pass
+        if num_children < 0:
+            # leaves are built right away, other nodes after their children
+            if children := _children(node):
+                stack.append((node, len(children)))
+                stack.extend([(k, -1) for k in reversed(children)])
+                continue
 
-            case Body():
-                pass
+            args: tuple = ()
 
-            case Main():
-                pass
+        else:
+            first = len(results) - num_children
+            args = tuple(results[first:])
+            del results[first:]
 
-            case Program():
-                pass
+        res = builder(node, args, ir)
 
-            case _:
-                raise NotImplementedError()
+        if isinstance(res, ErrorHandler):
+            return res
 
+        results.append(res)
 
-def build_fntable(code: AST) -> Any:
-    fn_name = code.value[0]
-    fn_type = code.value[1]
-    fn_args = _build_fnargs(code.value[2])
-    fn_body = _build_body(code.value[3])
+    return results[0]
 
 
 #############
@@ -428,24 +412,16 @@ def build_fntable(code: AST) -> Any:
 #############
 
 
-def build_main(code: AST) -> Any:
-    ir = IR()
-
-    for k in code:
-
-        match k:
-
-            case Imports():
-                res = parse_imports(k)
+def build_main(code: AST) -> IR | ErrorHandler:
+    """
+    Build the whole program AST into a new `IR`: imports, type and function
+    definitions into the IR tables, and the `main` closure into the IR main code.
+    """
 
-            case Body():
-                pass
-
-            case Main():
-                pass
+    ir = IR()
 
-            case Program():
-                pass
+    match res := _build(code, ir):
+        case ErrorHandler():
+            return res
 
-            case _:
-                raise NotImplementedError()
+    return ir
@@ -29,7 +29,7 @@ def define_id(code: Id) -> Symbol:
 
 
 def define_compositeid(code: CompositeId) -> CompositeSymbol:
-    names: tuple[str, ...] = cast(tuple, code.value)
+    names: tuple[str, ...] = tuple(cast(str, cast(Id, k).value[0]) for k in code.value)
     check_quantum_type_correctness(names)
     return CompositeSymbol(names)
 
@@ -5,7 +5,7 @@ readiness for the evaluator.
 
 from __future__ import annotations
 
-from typing import Any, Iterable
+from typing import Any, Hashable, Iterable
 
 from hhat_lang.core.code.ast import AST
 from hhat_lang.core.code.ir import (
@@ -13,6 +13,8 @@ from hhat_lang.core.code.ir import (
     BaseFnIR,
     BaseIR,
     BlockIR,
+    BodyIR,
+    FnHeader,
     InstrIR,
     InstrIRFlag,
 )
@@ -22,6 +24,11 @@ from hhat_lang.core.data.core import (
     CoreLiteral,
     Symbol,
 )
+from hhat_lang.core.error_handlers.errors import (
+    ErrorHandler,
+    FnNotFoundError,
+    FnOverloadConflictError,
+)
 
 
 class IRInstr(InstrIR):
@@ -36,29 +43,91 @@ class IRInstr(InstrIR):
             self._flag = flag
 
 
+def _is_arg(arg: Any) -> bool:
+    if isinstance(arg, tuple):
+        return len(arg) == 2 and _is_arg(arg[0]) and _is_arg(arg[1])
+
+    return isinstance(
+        arg, (Symbol, CompositeSymbol, CoreLiteral, CompositeLiteral, InstrIR, BlockIR)
+    )
+
+
 class IRArgs(ArgsIR):
-    def __init__(
-        self, *args: Symbol | CompositeSymbol | CoreLiteral | CompositeLiteral
-    ):
-        if (
-            all(
-                isinstance(k, (Symbol, CompositeSymbol, CoreLiteral, CompositeLiteral))
-                for k in args
-            )
-            or len(args) == 0
-        ):
+    """
+    Instruction arguments: symbols, literals, nested instructions and blocks, or pairs
+    of them, such as argument name and value, or option and body.
+    """
+
+    def __init__(self, *args: IRArg):
+        if all(_is_arg(k) for k in args):
             self._args = args
 
 
 class IRBlock(BlockIR):
-    def __init__(self):
-        self._instrs = tuple()
+    def __init__(self, *instrs: IRInstr | IRBlock):
+        self._instrs = tuple(k for k in instrs if isinstance(k, IRInstr | IRBlock))
 
     def add_instr(self, instr: IRInstr | IRBlock) -> None:
+        """
+        Add an instruction to the block. It copies the whole block, so to build a block
+        one instruction at a time, use `IRBlockBuilder` instead.
+        """
+
         if isinstance(instr, IRInstr | IRBlock):
             self._instrs += (instr,)
 
 
+class IRBlockBuilder:
+    """
+    Mutable block, backed by a list, so each instruction is added in constant time.
+    Once complete, `freeze` turns it into an `IRBlock`; the builder cannot be used
+    afterward.
+    """
+
+    _instrs: list[IRInstr | IRBlock]
+    _frozen: bool
+
+    def __init__(self) -> None:
+        self._instrs = []
+        self._frozen = False
+
+    @property
+    def is_frozen(self) -> bool:
+        return self._frozen
+
+    def add_instr(self, instr: IRInstr | IRBlock) -> None:
+        if self._frozen:
+            raise ValueError("cannot add instructions to a frozen block builder.")
+
+        if isinstance(instr, IRInstr | IRBlock):
+            self._instrs.append(instr)
+
+    def freeze(self) -> IRBlock:
+        if self._frozen:
+            raise ValueError("block builder is already frozen.")
+
+        block = IRBlock()
+        block._instrs = tuple(self._instrs)
+        self._instrs = []
+        self._frozen = True
+        return block
+
+    def __len__(self) -> int:
+        return len(self._instrs)
+
+
+IRArg = (
+    Symbol
+    | CompositeSymbol
+    | CoreLiteral
+    | CompositeLiteral
+    | InstrIR
+    | BlockIR
+    | tuple[Any, Any]
+)
+"""Type annotation for `IRArg`, an instruction argument (see `IRArgs`)."""
+
+
 ################
 # IR BASE CODE #
 ################
@@ -68,24 +137,145 @@ def compile_to_ir(code: AST) -> IR:
     pass
 
 
+FnArgsTypes = tuple[Symbol | CompositeSymbol, ...]
+"""
+Type annotation for `FnArgsTypes`: the types of a function arguments, in order. Together
+with the function name, they pick one function among its overloads.
+"""
+
+
+def _args_types(args: tuple) -> FnArgsTypes:
+    """Arguments types from only types args or name and type pairs args."""
+
+    return tuple(k[1] if isinstance(k, tuple) else k for k in args)
+
+
 class FnIR(BaseFnIR):
+    """
+    Function table. Besides the `FnTable`, functions are indexed by name and then by
+    their arguments types, so finding the function for a call is two dictionary
+    lookups, however many overloads there are.
+
+    Calls with arguments as name and type pairs may come in any order, so when they
+    do not match an overload as they are, the overloads of the function are searched
+    by arguments names. `resolve` keeps, for each call site, the last arguments and
+    the function they resolved to, so a call site calling with the same arguments
+    types again skips any lookup.
+    """
+
+    _data: dict[FnHeader, BodyIR]
+    _index: dict[Symbol | CompositeSymbol, dict[FnArgsTypes, FnHeader]]
+    _call_cache: dict[Hashable, tuple[tuple, FnHeader]]
+
     def __init__(self):
         self._data = dict()
+        self._index = dict()
+        self._call_cache = dict()
+
+    def push(
+        self,
+        fn_name: Symbol | CompositeSymbol,
+        fn_type: Symbol | CompositeSymbol,
+        fn_args: tuple,
+        body: BodyIR,
+    ) -> None | ErrorHandler:
+        """
+        Add a function to the table. Returns `FnOverloadConflictError` if a function
+        with the same name and arguments types but another type is already there.
+        """
+
+        header: FnHeader = (fn_name, fn_type, fn_args)
+        overloads = self._index.setdefault(fn_name, dict())
+        args_types = _args_types(fn_args)
+
+        if (found := overloads.get(args_types, None)) is not None:
+            if found[1] != fn_type:
+                return FnOverloadConflictError(fn_name, args_types)
+
+            print("[[LOG:IR]] ignore adding the same function in the function table.")
+            return None
+
+        overloads[args_types] = header
+        self._data[header] = body
+        return None
+
+    def _search_named(
+        self, overloads: dict[FnArgsTypes, FnHeader], args: tuple
+    ) -> FnHeader | None:
+        """Overload whose arguments names and types match the name and type pairs."""
+
+        if not all(isinstance(k, tuple) for k in args):
+            return None
+
+        named = dict(args)
+
+        for header in overloads.values():
+            fn_args = header[2]
 
-    def push(self, *ags: Any, **kwargs: Any) -> Any:
-        pass
+            if len(fn_args) == len(named) and all(
+                isinstance(k, tuple) and named.get(k[0], None) == k[1] for k in fn_args
+            ):
+                return header
 
-    def get(self, item: Any) -> Any:
-        pass
+        return None
 
-    def __setitem__(self, key: Any, value: Any) -> None:
-        pass
+    def resolve(
+        self,
+        fn_name: Symbol | CompositeSymbol,
+        args: tuple,
+        call_site: Hashable | None = None,
+    ) -> FnHeader | ErrorHandler:
+        """
+        Find the function header for a call of `fn_name` with `args`, either only
+        types or name and type pairs. `call_site` is anything hashable that tells the
+        call apart, such as its instruction; when given, the resolved function is
+        cached for it.
+        """
+
+        if (
+            call_site is not None
+            and (cached := self._call_cache.get(call_site, None)) is not None
+        ):
+            if cached[0] == args and cached[1][0] == fn_name:
+                return cached[1]
+
+        if (overloads := self._index.get(fn_name, None)) is None:
+            return FnNotFoundError(fn_name, _args_types(args))
 
-    def __getitem__(self, key: Symbol | CompositeSymbol) -> Any:
-        pass
+        header = overloads.get(_args_types(args), None) or self._search_named(
+            overloads, args
+        )
 
-    def __contains__(self, item: Any) -> bool:
-        pass
+        if header is None:
+            return FnNotFoundError(fn_name, _args_types(args))
+
+        if call_site is not None:
+            self._call_cache[call_site] = (args, header)
+
+        return header
+
+    def get(self, item: FnHeader) -> BodyIR | None:
+        return self._data.get(item, None)
+
+    def __setitem__(self, key: FnHeader, value: BodyIR) -> None:
+        if isinstance(key, tuple) and len(key) == 3 and isinstance(value, BodyIR):
+            self.push(*key, value)
+
+        else:
+            raise ValueError(
+                "function table needs function header as key and body as value."
+            )
+
+    def __getitem__(self, key: Symbol | CompositeSymbol) -> dict[FnArgsTypes, FnHeader]:
+        """Overloads of function `key`, by arguments types."""
+
+        return self._index[key]
+
+    def __contains__(self, item: Symbol | CompositeSymbol | FnHeader) -> bool:
+        if isinstance(item, tuple):
+            return item in self._data
+
+        return item in self._index
 
 
 class IR(BaseIR):
@@ -95,8 +285,14 @@ class IR(BaseIR):
     execute classical instructions.
     """
 
+    _fn_table: FnIR
+
     def __init__(self):
-        super().__init__()
+        super().__init__(FnIR())
+
+    @property
+    def fns(self) -> FnIR:
+        return self._fn_table
 
     def add_fn(
         self,
@@ -105,4 +301,7 @@ class IR(BaseIR):
         fn_type: Symbol | CompositeSymbol,
         fn_args: Any,
         body: IRBlock,
-    ) -> None: ...
+    ) -> None | ErrorHandler:
+        fn_body = BodyIR()
+        fn_body.push(body)
+        return self._fn_table.push(fn_name, fn_type, tuple(fn_args), fn_body)
@@ -0,0 +1,121 @@
+"""
+Convert IR code (`InstrIR`) into SSA form (`SSAInstr`). Each assignment defines a new
+SSA value of its variable (see `IRVar`), and nested calls get their own temporary
+values. Only straight-line code is converted for now.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from hhat_lang.core.code.ir import BlockIR, InstrIR, InstrIRFlag
+from hhat_lang.core.data.core import CompositeSymbol, Symbol
+from hhat_lang.dialects.heather.code.ssa_ir_builder.ir import (
+    SSA,
+    SSA_COPY,
+    IRVar,
+    SSAArg,
+    SSACode,
+    SSAInstr,
+)
+
+
+class _SSAState:
+    """SSA values of each variable, and the temporary values count, while converting."""
+
+    _vars: dict[Symbol, IRVar]
+    _num_temps: int
+
+    def __init__(self):
+        self._vars = dict()
+        self._num_temps = 0
+
+    def define(self, symbol: Symbol) -> SSA:
+        """New SSA value for `symbol`."""
+
+        var = self._vars.setdefault(symbol, IRVar(symbol))
+        var.push(symbol)
+        return var[-1]
+
+    def temp(self) -> SSA:
+        """New temporary SSA value."""
+
+        self._num_temps += 1
+        return self.define(Symbol(f"%t{self._num_temps}"))
+
+    def use(self, value: Any) -> SSAArg:
+        """Current SSA value of a variable, or the value itself otherwise."""
+
+        if isinstance(value, Symbol) and (var := self._vars.get(value, None)):
+            return var[-1]
+
+        return value
+
+
+def _build_args(instr: InstrIR, state: _SSAState, code: SSACode) -> tuple[SSAArg, ...]:
+    args: tuple[SSAArg, ...] = ()
+
+    for arg in instr.args:
+        match arg:
+            case InstrIR() if arg.flag == InstrIRFlag.CALL:
+                temp = state.temp()
+                code.append(SSAInstr(temp, arg.name, *_build_args(arg, state, code)))
+                args += (temp,)
+
+            case tuple() | InstrIR() | BlockIR():
+                raise NotImplementedError(
+                    f"SSA form for argument '{arg}' not implemented."
+                )
+
+            case _:
+                args += (state.use(arg),)
+
+    return args
+
+
+def _build_value(
+    value: Any, state: _SSAState, code: SSACode
+) -> tuple[Symbol | CompositeSymbol, tuple[SSAArg, ...]]:
+    """Operation and arguments giving the value."""
+
+    if isinstance(value, InstrIR) and value.flag == InstrIRFlag.CALL:
+        return value.name, _build_args(value, state, code)
+
+    return SSA_COPY, (state.use(value),)
+
+
+def build_ssa(instrs: Iterable[Any]) -> SSACode:
+    """
+    Convert straight-line IR code, such as a `main` body (`BodyIR`) or a block
+    (`BlockIR`), into SSA form.
+    """
+
+    state = _SSAState()
+    code: SSACode = []
+
+    for instr in instrs:
+        if not isinstance(instr, InstrIR):
+            raise NotImplementedError(f"SSA form for '{instr}' not implemented.")
+
+        match instr.flag:
+            case InstrIRFlag.DECLARE:
+                continue
+
+            case InstrIRFlag.DECLARE_ASSIGN | InstrIRFlag.ASSIGN if isinstance(
+                instr.name, Symbol
+            ):
+                # the value uses the variable as it was before the assignment
+                op, args = _build_value(tuple(instr.args)[-1], state, code)
+                code.append(SSAInstr(state.define(instr.name), op, *args))
+
+            case InstrIRFlag.CALL:
+                code.append(
+                    SSAInstr(None, instr.name, *_build_args(instr, state, code))
+                )
+
+            case _:
+                raise NotImplementedError(
+                    f"SSA form for '{instr.flag.name}' instructions not implemented."
+                )
+
+    return code
@@ -284,3 +284,70 @@ class IRVar:
 
     def __repr__(self) -> str:
         return f"var:{self.symbol}.{self._data}"
+
+
+SSA_COPY: Symbol = Symbol("%copy")
+"""Operation copying its single argument into the target, `x#1 = %copy(y#0)`."""
+
+SSA_PHI: Symbol = Symbol("%phi")
+"""Operation picking one of its arguments, depending on the control flow path."""
+
+SSAArg = SSA | CoreLiteral | Symbol | CompositeSymbol
+"""
+Type annotation for `SSAArg`, an SSA instruction argument: an SSA value, a literal, or
+a symbol outside the SSA form (e.g. a type or a function argument).
+"""
+
+
+class SSAInstr:
+    """
+    Instruction in SSA form, `target = op(args)`. The `target` is the SSA value it
+    defines, or `None` for instructions run only for their effects; the `op` is the
+    instruction or function called, or one of `SSA_COPY` and `SSA_PHI`.
+    """
+
+    _target: SSA | None
+    _op: Symbol | CompositeSymbol
+    _args: tuple[SSAArg, ...]
+
+    def __init__(self, target: SSA | None, op: Symbol | CompositeSymbol, *args: SSAArg):
+        self._target = target
+        self._op = op
+        self._args = args
+
+    @property
+    def target(self) -> SSA | None:
+        return self._target
+
+    @property
+    def op(self) -> Symbol | CompositeSymbol:
+        return self._op
+
+    @property
+    def args(self) -> tuple[SSAArg, ...]:
+        return self._args
+
+    @property
+    def is_quantum(self) -> bool:
+        """Whether it touches quantum data: quantum operation, target or arguments."""
+
+        return (
+            self._op.is_quantum
+            or (self._target is not None and self._target.symbol.is_quantum)
+            or any(
+                k.symbol.is_quantum if isinstance(k, SSA) else k.is_quantum
+                for k in self._args
+            )
+        )
+
+    def with_args(self, *args: SSAArg) -> SSAInstr:
+        return SSAInstr(self._target, self._op, *args)
+
+    def __repr__(self) -> str:
+        args = " ".join(str(k) for k in self._args)
+        target = f"{self._target} = " if self._target is not None else ""
+        return f"{target}{self._op}({args})"
+
+
+SSACode = list[SSAInstr]
+"""Type annotation for `SSACode`, straight-line code in SSA form."""
@@ -0,0 +1,316 @@
+"""
+Optimization passes over the SSA form (`SSACode`), and the `PassManager` running them
+in dependency order, timing each of them. The passes only touch the classical branch:
+instructions on quantum data, and calls whose effects are unknown, are kept as they
+are.
+
+- `ConstantPropagation`: folds classical arithmetic on literals and replaces the
+  values known to be constant by their literal
+- `CopyPropagation`: replaces the copies of a value by the value itself
+- `DeadCodeElimination`: removes the classical instructions whose values are unused
+"""
+
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable
+
+from hhat_lang.core.data.core import CoreLiteral
+from hhat_lang.dialects.heather.code.ssa_ir_builder.ir import (
+    SSA,
+    SSA_COPY,
+    SSA_PHI,
+    SSAArg,
+    SSACode,
+    SSAInstr,
+)
+
+FOLDABLE_OPS: dict[str, Callable[[int, int], int]] = {
+    "add": lambda a, b: a + b,
+    "sub": lambda a, b: a - b,
+    "mul": lambda a, b: a * b,
+}
+"""Classical operations on two integer literals folded at compile time."""
+
+LITERAL_BOUNDS: dict[str, tuple[int, int]] = {
+    "int": (-(1 << 63), (1 << 63) - 1),
+    "u16": (0, (1 << 16) - 1),
+    "u32": (0, (1 << 32) - 1),
+    "u64": (0, (1 << 64) - 1),
+}
+"""
+Range of each literal type that can be folded. Results outside of it are not folded,
+so the overflow is still reported when the code runs.
+"""
+
+PURE_OPS: frozenset[str] = frozenset({SSA_COPY.value, SSA_PHI.value, *FOLDABLE_OPS})
+"""Operations without effects other than defining their target."""
+
+
+def is_pure(instr: SSAInstr) -> bool:
+    """Whether the instruction is classical and only defines its target."""
+
+    return (
+        instr.target is not None and instr.op.value in PURE_OPS and not instr.is_quantum
+    )
+
+
+def _same_literal(a: SSAArg, b: SSAArg) -> bool:
+    return (
+        isinstance(a, CoreLiteral)
+        and isinstance(b, CoreLiteral)
+        and (a.value, a.type) == (b.value, b.type)
+    )
+
+
+def _fold(instr: SSAInstr) -> CoreLiteral | None:
+    """Literal the instruction gives, if it can be known at compile time."""
+
+    match instr.op.value, instr.args:
+        case SSA_COPY.value, (CoreLiteral() as lit,):
+            return lit
+
+        case SSA_PHI.value, (first, *rest) if all(
+            _same_literal(first, k) for k in rest
+        ):
+            return first if isinstance(first, CoreLiteral) else None
+
+        case op, (CoreLiteral() as a, CoreLiteral() as b) if op in FOLDABLE_OPS:
+            if a.type != b.type or (bounds := LITERAL_BOUNDS.get(a.type)) is None:
+                return None
+
+            res = FOLDABLE_OPS[op](int(a.value), int(b.value))
+            return (
+                CoreLiteral(str(res), a.type) if bounds[0] <= res <= bounds[1] else None
+            )
+
+    return None
+
+
+def _replace(args: tuple[SSAArg, ...], values: dict[SSA, SSAArg]) -> tuple[SSAArg, ...]:
+    return tuple(values.get(k, k) if isinstance(k, SSA) else k for k in args)
+
+
+#########################
+# PASSES AND STATISTICS #
+#########################
+
+
+class SSAPass(ABC):
+    """
+    Pass over the SSA form. `requires` holds the names of the passes that must run
+    before it.
+    """
+
+    name: str
+    requires: tuple[str, ...] = ()
+
+    @abstractmethod
+    def run(self, code: SSACode) -> tuple[SSACode, int]:
+        """Run the pass; returns the new code and the number of changes it made."""
+
+
+class ConstantPropagation(SSAPass):
+    name = "constprop"
+
+    def run(self, code: SSACode) -> tuple[SSACode, int]:
+        consts: dict[SSA, SSAArg] = dict()
+        new_code: SSACode = []
+        changes = 0
+
+        for instr in code:
+            if (args := _replace(instr.args, consts)) != instr.args:
+                instr = instr.with_args(*args)
+                changes += 1
+
+            if is_pure(instr) and (lit := _fold(instr)) is not None:
+                consts[instr.target] = lit  # type: ignore[index]
+
+                if instr.op != SSA_COPY:
+                    instr = SSAInstr(instr.target, SSA_COPY, lit)
+                    changes += 1
+
+            new_code.append(instr)
+
+        return new_code, changes
+
+
+class CopyPropagation(SSAPass):
+    name = "copyprop"
+
+    def run(self, code: SSACode) -> tuple[SSACode, int]:
+        copies: dict[SSA, SSAArg] = dict()
+
+        for instr in code:
+            if is_pure(instr) and instr.op == SSA_COPY:
+                source = instr.args[0]
+                # copies of copies resolve to the first value
+                copies[instr.target] = (  # type: ignore[index]
+                    copies.get(source, source) if isinstance(source, SSA) else source
+                )
+
+        new_code: SSACode = []
+        changes = 0
+
+        for instr in code:
+            if (args := _replace(instr.args, copies)) != instr.args:
+                instr = instr.with_args(*args)
+                changes += 1
+
+            new_code.append(instr)
+
+        return new_code, changes
+
+
+class DeadCodeElimination(SSAPass):
+    name = "dce"
+    requires = ("constprop", "copyprop")
+
+    def run(self, code: SSACode) -> tuple[SSACode, int]:
+        uses: dict[SSA, int] = dict()
+
+        for instr in code:
+            for arg in instr.args:
+                if isinstance(arg, SSA):
+                    uses[arg] = uses.get(arg, 0) + 1
+
+        kept: SSACode = []
+
+        # backwards, so removing an instruction can make the ones before it dead
+        for instr in reversed(code):
+            if is_pure(instr) and not uses.get(instr.target, 0):  # type: ignore[arg-type]
+                for arg in instr.args:
+                    if isinstance(arg, SSA):
+                        uses[arg] -= 1
+
+                continue
+
+            kept.append(instr)
+
+        kept.reverse()
+        return kept, len(code) - len(kept)
+
+
+class PassStats:
+    """Time a pass took, the number of instructions before and after it, and changes."""
+
+    _name: str
+    _seconds: float
+    _instrs_before: int
+    _instrs_after: int
+    _changes: int
+
+    def __init__(
+        self,
+        name: str,
+        seconds: float,
+        instrs_before: int,
+        instrs_after: int,
+        changes: int,
+    ):
+        self._name = name
+        self._seconds = seconds
+        self._instrs_before = instrs_before
+        self._instrs_after = instrs_after
+        self._changes = changes
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def seconds(self) -> float:
+        return self._seconds
+
+    @property
+    def instrs_before(self) -> int:
+        return self._instrs_before
+
+    @property
+    def instrs_after(self) -> int:
+        return self._instrs_after
+
+    @property
+    def changes(self) -> int:
+        return self._changes
+
+    def __repr__(self) -> str:
+        return (
+            f"PassStats({self._name}, {self._seconds * 1e3:.3f}ms,"
+            f" instrs={self._instrs_before}->{self._instrs_after},"
+            f" changes={self._changes})"
+        )
+
+
+################
+# PASS MANAGER #
+################
+
+
+class PassManager:
+    """
+    Run SSA passes in dependency order: each pass runs after the ones it `requires`,
+    and otherwise in the order given. Raises `ValueError` if a pass requires one that
+    is not given, or if the requirements are cyclic.
+    """
+
+    _passes: tuple[SSAPass, ...]
+
+    def __init__(self, passes: Iterable[SSAPass]):
+        self._passes = self._order(tuple(passes))
+
+    @staticmethod
+    def _order(passes: tuple[SSAPass, ...]) -> tuple[SSAPass, ...]:
+        names = {k.name for k in passes}
+
+        for k in passes:
+            if missing := set(k.requires) - names:
+                raise ValueError(f"pass '{k.name}' requires missing passes {missing}.")
+
+        ordered: list[SSAPass] = []
+        done: set[str] = set()
+
+        while len(ordered) < len(passes):
+            ready = next(
+                (
+                    k
+                    for k in passes
+                    if k.name not in done and all(r in done for r in k.requires)
+                ),
+                None,
+            )
+
+            if ready is None:
+                raise ValueError("passes have cyclic requirements.")
+
+            ordered.append(ready)
+            done.add(ready.name)
+
+        return tuple(ordered)
+
+    @property
+    def order(self) -> tuple[str, ...]:
+        return tuple(k.name for k in self._passes)
+
+    def run(self, code: SSACode) -> tuple[SSACode, tuple[PassStats, ...]]:
+        """Run all the passes on the code; returns the new code and each pass stats."""
+
+        stats: tuple[PassStats, ...] = ()
+
+        for ssa_pass in self._passes:
+            before = len(code)
+            start = time.perf_counter()
+            code, changes = ssa_pass.run(code)
+            seconds = time.perf_counter() - start
+            stats += (PassStats(ssa_pass.name, seconds, before, len(code), changes),)
+
+        return code, stats
+
+
+def default_pass_manager() -> PassManager:
+    """Constant propagation, copy propagation, then dead-code elimination."""
+
+    return PassManager(
+        (DeadCodeElimination(), ConstantPropagation(), CopyPropagation())
+    )
@@ -0,0 +1,248 @@
+"""
+Lazy evaluation of quantum data. Quantum programs are only executed when a classical
+value is demanded from them, that is, when the result of a cast is requested::
+
+    @v:@u3 = @redim(@0)
+    a:u32 = u32*@v
+    b:bool = bool*@v
+
+Both casts of `@v` are kept pending as `LazyCast` handles. Once one of them is
+demanded, the quantum program of `@v` is executed a single time, and every pending
+cast of `@v` is resolved from the same results. Quantum data that is never cast is
+never executed.
+
+Casts can also tell which indexes of the quantum data they read. Only the indexes read
+by the pending casts are then measured, and each cast gets the counts over its own
+indexes only.
+
+By default, all the quantum data with pending casts are executed together, packed
+into a single program on disjoint ranges of qubits (see `run_packed`), so programs
+with many small quantum variables need a single execution instead of one each.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence
+
+from hhat_lang.core.data.core import WorkingData
+from hhat_lang.core.error_handlers.errors import ErrorHandler
+from hhat_lang.core.execution.counts import Counts
+from hhat_lang.dialects.heather.interpreter.quantum.program import (
+    Program,
+    run_packed,
+)
+
+
+class LazyCast:
+    """
+    Handle for the pending classical value of a cast on a quantum data. The value is
+    computed by `cast_fn` from the quantum data results (counts) when `result()` is
+    called; without `cast_fn`, the value is the results themselves. The results are
+    over the `reads` indexes of the quantum data, in that order, or over all of them.
+    """
+
+    _lazy: LazyQuantum
+    _qdata: WorkingData
+    _cast_fn: Callable[[Any], Any] | None
+    _reads: tuple[int, ...] | None
+    _value: Any
+    _done: bool
+
+    def __init__(
+        self,
+        lazy: LazyQuantum,
+        qdata: WorkingData,
+        cast_fn: Callable[[Any], Any] | None = None,
+        reads: Sequence[int] | None = None,
+    ):
+        self._lazy = lazy
+        self._qdata = qdata
+        self._cast_fn = cast_fn
+        self._reads = None if reads is None else tuple(reads)
+        self._value = None
+        self._done = False
+
+    @property
+    def qdata(self) -> WorkingData:
+        return self._qdata
+
+    @property
+    def reads(self) -> tuple[int, ...] | None:
+        return self._reads
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def resolve(self, res: Any | ErrorHandler) -> None:
+        """Compute the cast value from the quantum data results."""
+
+        match res:
+            case ErrorHandler():
+                self._value = res
+
+            case _:
+                self._value = res if self._cast_fn is None else self._cast_fn(res)
+
+        self._done = True
+
+    def result(self) -> Any | ErrorHandler:
+        """Get the cast value, executing the quantum data program if needed."""
+
+        if not self._done:
+            self._lazy.evaluate(self._qdata)
+
+        return self._value
+
+    def __repr__(self) -> str:
+        return f"LazyCast({self._qdata}, done={self._done})"
+
+
+class LazyQuantum:
+    """
+    Keep quantum programs and casts on their quantum data pending until a classical
+    value is demanded. Each quantum data is executed at most once for all its pending
+    casts, and only if it has any. With `pack` set, the quantum data with pending casts
+    are executed together as a single packed program.
+    """
+
+    _programs: dict[WorkingData, Program]
+    _pending: dict[WorkingData, list[LazyCast]]
+    _results: dict[WorkingData, Any]
+    _measured: dict[WorkingData, tuple[int, ...]]
+    _metadata: dict[str, Any] | None
+    _pack: bool
+    _executions: int
+
+    def __init__(self, metadata: dict[str, Any] | None = None, pack: bool = True):
+        self._programs = dict()
+        self._pending = dict()
+        self._results = dict()
+        self._measured = dict()
+        self._metadata = metadata
+        self._pack = pack
+        self._executions = 0
+
+    @property
+    def executions(self) -> int:
+        """Number of quantum programs executed so far."""
+
+        return self._executions
+
+    @property
+    def pending(self) -> tuple[WorkingData, ...]:
+        """Quantum data with casts waiting for results."""
+
+        return tuple(k for k, v in self._pending.items() if v)
+
+    def add(self, program: Program) -> None:
+        """
+        Add the quantum program of a quantum data. A new program for the same quantum
+        data replaces the previous one and discards its results, if any.
+        """
+
+        self._programs[program.qdata] = program
+        self._results.pop(program.qdata, None)
+
+    def cast(
+        self,
+        qdata: WorkingData,
+        cast_fn: Callable[[Any], Any] | None = None,
+        reads: Sequence[int] | None = None,
+    ) -> LazyCast:
+        """
+        Request a cast on the quantum data, reading only the `reads` indexes if given;
+        nothing is executed yet.
+        """
+
+        if qdata not in self._programs:
+            raise ValueError(f"no quantum program for '{qdata}'.")
+
+        lazy_cast = LazyCast(self, qdata, cast_fn, reads)
+        self._pending.setdefault(qdata, []).append(lazy_cast)
+
+        if qdata in self._results:
+            # results are reused only if they have all the indexes the cast reads
+            num_idxs = self._programs[qdata].qlang.num_idxs
+            wanted = set(range(num_idxs) if reads is None else reads)
+
+            if wanted <= set(self._measured[qdata]):
+                self._resolve(qdata)
+
+            else:
+                self._results.pop(qdata)
+
+        return lazy_cast
+
+    def _demand(self, qdata: WorkingData) -> None:
+        """Set the quantum data measured indexes to the ones its pending casts read."""
+
+        casts = self._pending.get(qdata, [])
+        qlang = self._programs[qdata].qlang
+
+        if not casts or any(k.reads is None for k in casts):
+            qlang.measure = None
+
+        else:
+            qlang.measure = sorted({n for k in casts for n in k.reads or ()})
+
+        self._measured[qdata] = qlang.measured
+
+    def _run_packed(self, qdatas: tuple[WorkingData, ...]) -> None:
+        ready = [
+            self._programs[k] for k in dict.fromkeys(qdatas) if k not in self._results
+        ]
+
+        for program in ready:
+            self._demand(program.qdata)
+
+        if ready:
+            self._results.update(run_packed(ready, metadata=self._metadata))
+            self._executions += 1
+
+    def _resolve(self, qdata: WorkingData) -> None:
+        res = self._results[qdata]
+        measured = self._measured[qdata]
+
+        for lazy_cast in self._pending.pop(qdata, []):
+            reads = lazy_cast.reads
+
+            if isinstance(res, Counts) and reads is not None and reads != measured:
+                lazy_cast.resolve(res.marginal([measured.index(k) for k in reads]))
+
+            else:
+                lazy_cast.resolve(res)
+
+    def evaluate(self, qdata: WorkingData) -> None:
+        """
+        Execute the quantum data program once and resolve all its pending casts. With
+        `pack` set, the other quantum data with pending casts are executed along.
+        """
+
+        if qdata in self._results:
+            self._resolve(qdata)
+
+        elif self._pack:
+            self._run_packed((qdata,) + self.pending)
+            self._resolve(qdata)
+            self.evaluate_all()
+
+        else:
+            self._demand(qdata)
+            self._results[qdata] = self._programs[qdata].run(metadata=self._metadata)
+            self._executions += 1
+            self._resolve(qdata)
+
+    def evaluate_all(self) -> None:
+        """Resolve every pending cast; quantum data without casts are not executed."""
+
+        if not self._pack:
+            for qdata in self.pending:
+                self.evaluate(qdata)
+
+            return
+
+        self._run_packed(self.pending)
+
+        for qdata in self.pending:
+            self._resolve(qdata)
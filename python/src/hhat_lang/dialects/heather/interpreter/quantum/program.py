@@ -17,7 +17,7 @@ into `u32`. It also is valid for quantum variables::
 
 The quantum program workflow is as follows:
 
-- Instructions are analyzed according to the low level language and target backend 
+- Instructions are analyzed according to the low level language and target backend
   support (lower level counterparts, LLC)
 
     - If classical instructions are supported, they will be handled by those
@@ -29,28 +29,87 @@ The quantum program workflow is as follows:
 - Casting protocols apply the according source type to target type at the results
 - Results are sent back to the execution workflow as the target type data
 
+Independent programs that are ready at the same time can be packed into a single
+execution (`run_packed`): each quantum data is placed on its own range of qubits, and
+its counts are taken back from its own clbits.
+
+Programs can also be executed asynchronously (`Program.submit` or `Program.run_async`).
+The low-level code is generated right away, but the execution happens in the background
+and only the handle for the pending counts is returned. The classical evaluator can keep
+running independent instructions and wait only when a cast actually needs the result.
 
 """
 
 from __future__ import annotations
 
-from typing import Any, Callable, Type
+import asyncio
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence, Type
+
+import numpy as np
 
 from hhat_lang.core.code.ir import BlockIR
 from hhat_lang.core.data.core import Symbol, WorkingData
-from hhat_lang.core.error_handlers.errors import ErrorHandler
+from hhat_lang.core.error_handlers.errors import ErrorHandler, IndexAllocationError
 from hhat_lang.core.execution.abstract_base import BaseEvaluator
+from hhat_lang.core.execution.counts import Counts
 from hhat_lang.core.execution.abstract_program import BaseProgram
 from hhat_lang.core.lowlevel.abstract_qlang import BaseLowLevelQLang
 from hhat_lang.core.memory.core import IndexManager
 from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IRBlock
 
 # TODO: the imports below must come from the config file, not hardcoded
-from hhat_lang.low_level.target_backend.qiskit.openqasm.code_executor import (
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import parse_qasm
+from hhat_lang.low_level.quantum_lang.openqasm.v2.instructions import (
+    DEFAULT_SYNC_STRATEGY,
+    SYNC_STRATEGIES,
+)
+from hhat_lang.low_level.quantum_lang.openqasm.v2.passes import (
+    CircuitReport,
+    circuit_report,
+    optimize_qasm,
+)
+from hhat_lang.low_level.target_backend.native.openqasm.code_executor import (
     execute_program,
+    stream_program,
+    stream_program_to_file,
+    submit_program,
 )
 
 
+def _sync_strategy(metadata: dict[str, Any] | None) -> str:
+    strategy = (metadata or dict()).get("sync_strategy", None) or DEFAULT_SYNC_STRATEGY
+
+    if strategy not in SYNC_STRATEGIES:
+        raise ValueError(
+            f"'sync_strategy' must be one of {SYNC_STRATEGIES}, got {strategy!r}."
+        )
+
+    return strategy
+
+
+def _optimize_code(
+    code: str, debug: bool = False, metadata: dict[str, Any] | None = None
+) -> str:
+    """
+    Run the peephole pass and the scheduling on the low-level code, unless `optimize`
+    is set to `False` in the metadata.
+    """
+
+    if (metadata or dict()).get("optimize", True):
+        code, peephole_report, schedule_report = optimize_qasm(code)
+
+        if debug:
+            print(peephole_report)
+            print(schedule_report)
+
+    if debug:
+        print(code)
+
+    return code
+
+
 class Program(BaseProgram):
     def __init__(
         self,
@@ -81,10 +140,167 @@ class Program(BaseProgram):
                 f"Quantum program got invalid parameters: {qdata=} | {idx=} {block=}"
             )
 
-    def run(self, debug: bool = False) -> Any | ErrorHandler:
-        qlang_code = self._qlang.gen_program()
+    @property
+    def qdata(self) -> WorkingData:
+        return self._qdata
 
-        if debug:
-            print(qlang_code)
+    @property
+    def idx(self) -> IndexManager:
+        return self._idx
+
+    @property
+    def qlang(self) -> BaseLowLevelQLang:
+        return self._qlang
+
+    def _gen_code(
+        self, debug: bool = False, metadata: dict[str, Any] | None = None
+    ) -> str:
+        qlang_code = self._qlang.gen_program(sync_strategy=_sync_strategy(metadata))
+        return _optimize_code(qlang_code, debug, metadata)
+
+    def report(self, metadata: dict[str, Any] | None = None) -> CircuitReport | None:
+        """
+        Depth, width and gate counts of the low-level code that would be executed, or
+        `None` if it is outside the gate stream subset.
+        """
+
+        try:
+            return circuit_report(parse_qasm(self._gen_code(metadata=metadata)))
+
+        except ValueError:
+            return None
+
+    def run(
+        self, debug: bool = False, metadata: dict[str, Any] | None = None
+    ) -> Any | ErrorHandler:
+        """
+        Generate the low-level code and execute it. `metadata` holds the execution
+        options, such as `shots`, `seed`, `backend_options` or `workers`. With `exact`
+        set, it returns the exact bitstring probabilities instead of sampled counts.
+        With `optimize` set to `False`, the peephole pass is skipped. `sync_strategy`
+        selects how `@sync` is lowered (see `SYNC_STRATEGIES`).
+        """
+
+        if (err := check_capacity((self,))) is not None:
+            return err
+
+        return execute_program(
+            self._gen_code(debug, metadata), self._qdata, debug, metadata
+        )
+
+    def submit(
+        self, debug: bool = False, metadata: dict[str, Any] | None = None
+    ) -> Future:
+        """
+        Generate the low-level code and submit it for execution without blocking.
+        Returns a `Future` handle for the pending counts (or error).
+        """
+
+        if (err := check_capacity((self,))) is not None:
+            future: Future = Future()
+            future.set_result(err)
+            return future
+
+        return submit_program(
+            self._gen_code(debug, metadata), self._qdata, debug, metadata
+        )
+
+    async def run_async(
+        self, debug: bool = False, metadata: dict[str, Any] | None = None
+    ) -> Any | ErrorHandler:
+        """Awaitable version of `run`; other coroutines can progress meanwhile."""
+
+        return await asyncio.wrap_future(self.submit(debug, metadata))
+
+    def stream(
+        self, debug: bool = False, metadata: dict[str, Any] | None = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Generate the low-level code and stream its per-shot outcomes as chunks of
+        packed `uint64` words, for shot counts too large to keep in memory.
+        """
+
+        if (err := check_capacity((self,))) is not None:
+            raise ValueError(err())
+
+        return stream_program(self._gen_code(debug, metadata), self._qdata, metadata)
+
+    def stream_to_file(
+        self,
+        path: str | Path,
+        debug: bool = False,
+        metadata: dict[str, Any] | None = None,
+    ) -> np.memmap:
+        """
+        Generate the low-level code and write its per-shot outcomes, as packed `uint64`
+        words, into a memory-mapped file at `path`.
+        """
+
+        if (err := check_capacity((self,))) is not None:
+            raise ValueError(err())
+
+        return stream_program_to_file(
+            self._gen_code(debug, metadata), self._qdata, path, metadata
+        )
+
+
+def check_capacity(programs: Sequence[Program]) -> None | ErrorHandler:
+    """
+    Check whether the programs fit together in the smallest `max_num_index` of their
+    index managers, without generating any code; returns `IndexAllocationError` if
+    they do not.
+    """
+
+    qubits = sum(k.qlang.num_idxs for k in programs)
+    max_idxs = min((k.idx.max_number for k in programs), default=0)
+
+    if qubits > max_idxs:
+        return IndexAllocationError(requested_idxs=qubits, max_idxs=max_idxs)
+
+    return None
+
+
+def gen_packed_code(
+    programs: Sequence[Program],
+    debug: bool = False,
+    metadata: dict[str, Any] | None = None,
+) -> tuple[str, tuple[tuple[int, ...], ...]]:
+    """
+    Generate the low-level code of the programs packed together on disjoint ranges of
+    qubits, and the clbits of each program in it.
+    """
+
+    qlangs = tuple(k.qlang for k in programs)
+    code, positions = type(qlangs[0]).gen_packed_program(
+        qlangs, sync_strategy=_sync_strategy(metadata)
+    )
+    return _optimize_code(code, debug, metadata), positions
+
+
+def run_packed(
+    programs: Sequence[Program],
+    debug: bool = False,
+    metadata: dict[str, Any] | None = None,
+) -> dict[WorkingData, Any | ErrorHandler]:
+    """
+    Pack the programs of independent quantum data into one low-level program on
+    disjoint ranges of qubits, execute it once and split the counts back out for each
+    quantum data, marginalizing over its own clbits. If they do not fit together (see
+    `check_capacity`), all of them get the error and nothing is generated.
+    """
+
+    if not programs:
+        return dict()
+
+    if (err := check_capacity(programs)) is not None:
+        return {k.qdata: err for k in programs}
+
+    code, positions = gen_packed_code(programs, debug, metadata)
+    qdata = ", ".join(str(k.qdata) for k in programs)
+
+    match res := execute_program(code, qdata, debug, metadata):
+        case Counts():
+            return {k.qdata: res.marginal(p) for k, p in zip(programs, positions)}
 
-        return execute_program(qlang_code, self._qdata, debug)
+        case _:
+            return {k.qdata: res for k in programs}
@@ -0,0 +1,104 @@
+"""
+Static resource estimation for quantum programs, without executing them: number of
+qubits, gate counts per kind, circuit depth and shots budget. Programs that need more
+indexes than the index manager allows (`max_num_index`) are rejected before any code
+is generated, so capacity planning never reaches a backend.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from hhat_lang.core.error_handlers.errors import ErrorHandler
+from hhat_lang.dialects.heather.interpreter.quantum.program import (
+    Program,
+    check_capacity,
+    gen_packed_code,
+)
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import parse_qasm
+from hhat_lang.low_level.quantum_lang.openqasm.v2.passes import circuit_report
+from hhat_lang.low_level.target_backend.native.openqasm.code_executor import (
+    default_shots,
+)
+
+
+class ResourceEstimate:
+    """Resources a quantum program needs to run."""
+
+    _qubits: int
+    _gate_counts: dict[str, int] | None
+    _depth: int | None
+    _shots: int | None
+
+    def __init__(
+        self,
+        qubits: int,
+        gate_counts: dict[str, int] | None,
+        depth: int | None,
+        shots: int | None,
+    ):
+        self._qubits = qubits
+        self._gate_counts = gate_counts
+        self._depth = depth
+        self._shots = shots
+
+    @property
+    def qubits(self) -> int:
+        """Maximum number of live qubits."""
+
+        return self._qubits
+
+    @property
+    def gate_counts(self) -> dict[str, int] | None:
+        """Number of gates per kind, or `None` if the code is outside the gate stream."""
+
+        return self._gate_counts
+
+    @property
+    def depth(self) -> int | None:
+        """Circuit depth, or `None` if the code is outside the gate stream."""
+
+        return self._depth
+
+    @property
+    def shots(self) -> int | None:
+        """Shots budget, or `None` if it depends on a backend the code is sent to."""
+
+        return self._shots
+
+    def __repr__(self) -> str:
+        return (
+            f"ResourceEstimate(qubits={self._qubits}, depth={self._depth},"
+            f" gates={self._gate_counts}, shots={self._shots})"
+        )
+
+
+def estimate(
+    programs: Program | Sequence[Program], metadata: dict[str, Any] | None = None
+) -> ResourceEstimate | ErrorHandler:
+    """
+    Estimate the resources of a program, or of several programs packed together (see
+    `run_packed`). The capacity is checked first (see `check_capacity`); then only the
+    low-level code is generated, with the same options `metadata` gives to execution,
+    and nothing is executed. The shots budget is the `shots` metadata or the executors
+    default.
+    """
+
+    metadata = metadata or dict()
+    programs = (programs,) if isinstance(programs, Program) else tuple(programs)
+
+    if (err := check_capacity(programs)) is not None:
+        return err
+
+    qubits = sum(k.qlang.num_idxs for k in programs)
+    code, _ = gen_packed_code(programs, metadata=metadata)
+
+    try:
+        circuit = parse_qasm(code)
+
+    except ValueError:
+        return ResourceEstimate(qubits, None, None, metadata.get("shots", None))
+
+    report = circuit_report(circuit)
+    shots = metadata.get("shots", None) or default_shots(circuit)
+    return ResourceEstimate(qubits, report.gate_counts, report.depth, shots)
@@ -0,0 +1,302 @@
+"""
+Gate stream representation of the OpenQASM v2.0 code produced by the low-level
+generator (`LowLeveQLang`). It is a small subset of OpenQASM v2.0: registers
+declarations, gate applications (on single qubits or broadcast over a register)
+and measurements at the end of the circuit. Passes and native backends work on
+this representation, so they do not need any third-party library to read the code.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Any, Iterable
+
+from hhat_lang.low_level.quantum_lang.openqasm.v2 import DEFAULT_HEADER
+
+CLIFFORD_GATES: frozenset[str] = frozenset(
+    {"id", "x", "y", "z", "h", "s", "sdg", "cx", "cy", "cz"}
+)
+"""Gates from the Clifford group; circuits with only those can be simulated efficiently."""
+
+SELF_INVERSE_GATES: frozenset[str] = frozenset(
+    {"id", "x", "y", "z", "h", "cx", "cy", "cz"}
+)
+
+GATES_NUM_QUBITS: dict[str, int] = {
+    "id": 1,
+    "x": 1,
+    "y": 1,
+    "z": 1,
+    "h": 1,
+    "s": 1,
+    "sdg": 1,
+    "t": 1,
+    "tdg": 1,
+    "rx": 1,
+    "ry": 1,
+    "rz": 1,
+    "u1": 1,
+    "cx": 2,
+    "cy": 2,
+    "cz": 2,
+}
+"""Gates supported by the gate stream and their number of qubits."""
+
+GATES_NUM_PARAMS: dict[str, int] = {"rx": 1, "ry": 1, "rz": 1, "u1": 1}
+
+_REG_DECL = re.compile(r"^(qreg|creg)\s+([A-Za-z_]\w*)\s*\[\s*(\d+)\s*\]$")
+_MEASURE = re.compile(r"^measure\s+(.+?)\s*->\s*(.+)$")
+_GATE = re.compile(r"^([A-Za-z_]\w*)\s*(?:\((.*)\))?\s+(.+)$")
+_OPERAND = re.compile(r"^([A-Za-z_]\w*)\s*(?:\[\s*(\d+)\s*\])?$")
+_PARAM = re.compile(r"^[\d\s.+\-*/()e]*(pi[\d\s.+\-*/()e]*)*$")
+
+
+class Gate:
+    """A single gate application: gate name, qubits indexes and parameters."""
+
+    __slots__ = ("_name", "_qubits", "_params")
+
+    _name: str
+    _qubits: tuple[int, ...]
+    _params: tuple[float, ...]
+
+    def __init__(
+        self, name: str, qubits: tuple[int, ...], params: tuple[float, ...] = ()
+    ):
+        self._name = name
+        self._qubits = qubits
+        self._params = params
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def qubits(self) -> tuple[int, ...]:
+        return self._qubits
+
+    @property
+    def params(self) -> tuple[float, ...]:
+        return self._params
+
+    @property
+    def is_clifford(self) -> bool:
+        return self._name in CLIFFORD_GATES
+
+    def to_qasm(self) -> str:
+        params = f"({', '.join(repr(p) for p in self._params)})" if self._params else ""
+        qubits = ", ".join(f"q[{k}]" for k in self._qubits)
+        return f"{self._name}{params} {qubits};"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Gate):
+            return (
+                self._name == other._name
+                and self._qubits == other._qubits
+                and self._params == other._params
+            )
+        return False
+
+    def __hash__(self) -> int:
+        return hash((self._name, self._qubits, self._params))
+
+    def __repr__(self) -> str:
+        return self.to_qasm()
+
+
+class QasmCircuit:
+    """
+    Gate stream of an OpenQASM v2.0 program. Registers are flattened into a single
+    qubit index space and a single clbit index space, in declaration order, and
+    measurements are kept apart as `(qubit, clbit)` pairs.
+    """
+
+    _qregs: tuple[tuple[str, int], ...]
+    _cregs: tuple[tuple[str, int], ...]
+    _gates: list[Gate]
+    _measures: list[tuple[int, int]]
+
+    def __init__(
+        self,
+        qregs: Iterable[tuple[str, int]],
+        cregs: Iterable[tuple[str, int]],
+        gates: Iterable[Gate] = (),
+        measures: Iterable[tuple[int, int]] = (),
+    ):
+        self._qregs = tuple(qregs)
+        self._cregs = tuple(cregs)
+        self._gates = list(gates)
+        self._measures = list(measures)
+
+    @property
+    def qregs(self) -> tuple[tuple[str, int], ...]:
+        return self._qregs
+
+    @property
+    def cregs(self) -> tuple[tuple[str, int], ...]:
+        return self._cregs
+
+    @property
+    def num_qubits(self) -> int:
+        return sum(size for _, size in self._qregs)
+
+    @property
+    def num_clbits(self) -> int:
+        return sum(size for _, size in self._cregs)
+
+    @property
+    def gates(self) -> list[Gate]:
+        return self._gates
+
+    @property
+    def measures(self) -> list[tuple[int, int]]:
+        return self._measures
+
+    @property
+    def is_clifford(self) -> bool:
+        return all(gate.is_clifford for gate in self._gates)
+
+    def to_qasm(self) -> str:
+        """
+        Produce the OpenQASM v2.0 code. Registers are written back with their names, but
+        gates and measurements use the flattened indexes, so the code is only equivalent
+        to the original one when there is a single quantum and a single classical register.
+        """
+
+        code = DEFAULT_HEADER.lstrip("\n")
+        code += "".join(f"qreg {name}[{size}];\n" for name, size in self._qregs)
+        code += "".join(f"creg {name}[{size}];\n" for name, size in self._cregs)
+        code += "".join(gate.to_qasm() + "\n" for gate in self._gates)
+        code += "".join(f"measure q[{q}] -> c[{c}];\n" for q, c in self._measures)
+        return code
+
+    def __repr__(self) -> str:
+        return (
+            f"QasmCircuit(qubits={self.num_qubits}, clbits={self.num_clbits},"
+            f" gates={len(self._gates)}, measures={len(self._measures)})"
+        )
+
+
+def _parse_param(param: str) -> float:
+    param = param.strip()
+
+    if not param or not _PARAM.match(param):
+        raise ValueError(f"unsupported gate parameter '{param}'.")
+
+    try:
+        # only numbers, arithmetic operators and `pi` get here
+        return float(eval(param, {"__builtins__": {}}, {"pi": math.pi}))
+
+    except (SyntaxError, NameError, TypeError, ZeroDivisionError) as exc:
+        raise ValueError(f"invalid gate parameter '{param}'.") from exc
+
+
+def _regs_offsets(regs: list[tuple[str, int]]) -> dict[str, tuple[int, int]]:
+    offsets: dict[str, tuple[int, int]] = dict()
+    offset = 0
+
+    for name, size in regs:
+        offsets[name] = (offset, size)
+        offset += size
+
+    return offsets
+
+
+def _operand_indexes(operand: str, offsets: dict[str, tuple[int, int]]) -> list[int]:
+    """Flattened indexes of a register operand (`q[2]`) or a whole register (`q`)."""
+
+    if not (match := _OPERAND.match(operand.strip())):
+        raise ValueError(f"invalid operand '{operand}'.")
+
+    name, idx = match.groups()
+
+    if name not in offsets:
+        raise ValueError(f"unknown register '{name}'.")
+
+    offset, size = offsets[name]
+
+    if idx is None:
+        return list(range(offset, offset + size))
+
+    if int(idx) >= size:
+        raise ValueError(f"index {idx} is out of range for register '{name}'.")
+
+    return [offset + int(idx)]
+
+
+def parse_qasm(code: str) -> QasmCircuit:
+    """
+    Parse OpenQASM v2.0 code into a `QasmCircuit`. Raises `ValueError` for anything
+    outside the supported subset, e.g. unknown gates, classically controlled gates or
+    gates after measurements (mid-circuit measurements).
+    """
+
+    qregs: list[tuple[str, int]] = []
+    cregs: list[tuple[str, int]] = []
+    gates: list[Gate] = []
+    measures: list[tuple[int, int]] = []
+    qoffsets: dict[str, tuple[int, int]] = dict()
+    coffsets: dict[str, tuple[int, int]] = dict()
+
+    statements = (k.strip() for k in re.sub(r"//[^\n]*", "", code).split(";"))
+
+    for stmt in statements:
+
+        if not stmt or stmt.startswith(("OPENQASM", "include", "barrier")):
+            continue
+
+        if match := _REG_DECL.match(stmt):
+            kind, name, size = match.groups()
+            (qregs if kind == "qreg" else cregs).append((name, int(size)))
+            qoffsets, coffsets = _regs_offsets(qregs), _regs_offsets(cregs)
+            continue
+
+        if match := _MEASURE.match(stmt):
+            mqubits = _operand_indexes(match.group(1), qoffsets)
+            mclbits = _operand_indexes(match.group(2), coffsets)
+
+            if len(mqubits) != len(mclbits):
+                raise ValueError(f"measurement size mismatch on '{stmt}'.")
+
+            measures.extend(zip(mqubits, mclbits))
+            continue
+
+        if not (match := _GATE.match(stmt)):
+            raise ValueError(f"unsupported statement '{stmt}'.")
+
+        name, params_txt, operands_txt = match.groups()
+
+        if name not in GATES_NUM_QUBITS:
+            raise ValueError(f"unsupported gate '{name}'.")
+
+        if measures:
+            raise ValueError("gates after measurements are not supported.")
+
+        params = tuple(
+            _parse_param(p) for p in (params_txt.split(",") if params_txt else ())
+        )
+
+        if len(params) != GATES_NUM_PARAMS.get(name, 0):
+            raise ValueError(f"wrong number of parameters for gate '{name}'.")
+
+        operands = [_operand_indexes(k, qoffsets) for k in operands_txt.split(",")]
+
+        if len(operands) != GATES_NUM_QUBITS[name]:
+            raise ValueError(f"wrong number of operands for gate '{name}'.")
+
+        # broadcast whole registers operands, as OpenQASM v2.0 does
+        width = max(len(k) for k in operands)
+
+        if any(len(k) not in (1, width) for k in operands):
+            raise ValueError(f"registers size mismatch on '{stmt}'.")
+
+        for n in range(width):
+            qubits = tuple(k[n] if len(k) > 1 else k[0] for k in operands)
+
+            if len(set(qubits)) != len(qubits):
+                raise ValueError(f"repeated qubit on '{stmt}'.")
+
+            gates.append(Gate(name, qubits, params))
+
+    return QasmCircuit(qregs, cregs, gates, measures)
@@ -70,23 +70,80 @@ class QRedim(QInstr):
         return instrs, status
 
 
+SYNC_STRATEGIES: tuple[str, ...] = ("chain", "tree")
+"""Lowering strategies for `@sync`; see `QSync`."""
+
+DEFAULT_SYNC_STRATEGY: str = "chain"
+"""`@sync` lowering strategy when none is given; it has the fewest gates."""
+
+
 class QSync(QInstr):
+    """
+    `@sync` entangles the quantum data indexes in order: each index gets the parity of
+    itself and all the indexes before it, so a superposition on the first index spreads
+    over all of them. It is lowered with one of the `SYNC_STRATEGIES`:
+
+    - `"chain"`: one `cx` from each index to the next one, with depth `n - 1`
+    - `"tree"`: the same parities computed as a balanced prefix tree (up-sweep then
+      down-sweep), with depth at most `2*log2(n)` and fewer than `2*n` gates
+
+    Both give the same circuit, so the strategy only changes depth and gate count. The
+    tree has about twice the gates, so it pays off on backends where depth matters
+    (noisy or density-matrix simulations, hardware) rather than on the native
+    simulators, whose cost follows the number of gates.
+    """
+
     name = "@sync"
 
     @staticmethod
-    def _instr(idxs: tuple[int, ...]) -> str:
-        return f"cx q[{idxs[0]}], q[{idxs[1]}];"
+    def _instr(control: int, target: int) -> str:
+        return f"cx q[{control}], q[{target}];"
+
+    @staticmethod
+    def _chain(num_idxs: int) -> list[tuple[int, int]]:
+        return [(k, k + 1) for k in range(num_idxs - 1)]
+
+    @staticmethod
+    def _tree(num_idxs: int) -> list[tuple[int, int]]:
+        pairs: list[tuple[int, int]] = []
+        step = 1
+
+        # up-sweep: each index ending a block of `2*step` gets the block parity
+        while 2 * step <= num_idxs:
+            pairs.extend((k - step, k) for k in range(2 * step - 1, num_idxs, 2 * step))
+            step *= 2
+
+        # down-sweep: the remaining indexes get the parity from their block start
+        while step > 1:
+            step //= 2
+            pairs.extend((k - step, k) for k in range(3 * step - 1, num_idxs, 2 * step))
+
+        return pairs
 
     def _translate_instrs(
-        self, idxs: tuple[tuple[int, ...], ...]
+        self, idxs: tuple[int, ...], strategy: str
     ) -> tuple[tuple[str, ...], InstrStatus]:
-        return tuple(self._instr(k) for k in idxs), InstrStatus.DONE
+        match strategy:
+            case "chain":
+                pairs = self._chain(len(idxs))
+
+            case "tree":
+                pairs = self._tree(len(idxs))
+
+            case _:
+                return (), InstrStatus.ERROR
+
+        return (
+            tuple(self._instr(idxs[c], idxs[t]) for c, t in pairs),
+            InstrStatus.DONE,
+        )
 
     def __call__(
         self,
         *,
-        idxs: tuple[tuple[int, ...], ...],
+        idxs: tuple[int, ...],
         executor: BaseEvaluator,
+        sync_strategy: str | None = None,
         **_kwargs: Any,
     ) -> tuple[tuple[str, ...], InstrStatus]:
         """Transforms `@sync` instruction to openQASMv2.0 code."""
@@ -96,7 +153,9 @@ class QSync(QInstr):
         # TODO: implement this instruction with all the range of capabilities;
         #  check documentation
 
-        instrs, status = self._translate_instrs(idxs)
+        instrs, status = self._translate_instrs(
+            tuple(idxs), sync_strategy or DEFAULT_SYNC_STRATEGY
+        )
 
         self._instr_status = status
         return instrs, status
@@ -0,0 +1,290 @@
+"""
+Optimization passes over the OpenQASM v2.0 gate stream (see `QasmCircuit`). They run
+on the generated code before it is handed over to any backend, and keep the same
+circuit up to a global phase:
+
+- `peephole`: cancels and merges adjacent gates
+- `schedule`: reorders the gates into layers of gates on disjoint qubits
+"""
+
+from __future__ import annotations
+
+import math
+
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import (
+    SELF_INVERSE_GATES,
+    Gate,
+    QasmCircuit,
+    parse_qasm,
+)
+
+PHASE_GATES_EIGHTHS: dict[str, int] = {"t": 1, "s": 2, "z": 4, "sdg": 6, "tdg": 7}
+"""Phase gates as their rotation angle around the Z axis, in multiples of `pi/4`."""
+
+_EIGHTHS_PHASE_GATES: dict[int, str] = {v: k for k, v in PHASE_GATES_EIGHTHS.items()}
+
+ROTATION_GATES: frozenset[str] = frozenset({"rx", "ry", "rz", "u1"})
+"""Single-parameter rotation gates; adjacent ones of the same kind add up."""
+
+ANGLE_ATOL: float = 1e-12
+"""Rotations closer than that to a multiple of `2*pi` are taken as identities."""
+
+
+class PeepholeReport:
+    """Number of gates before and after the peephole pass, and how they went away."""
+
+    _gates_before: int
+    _gates_after: int
+    _cancelled: int
+    _merged: int
+
+    def __init__(
+        self, gates_before: int, gates_after: int, cancelled: int, merged: int
+    ):
+        self._gates_before = gates_before
+        self._gates_after = gates_after
+        self._cancelled = cancelled
+        self._merged = merged
+
+    @property
+    def gates_before(self) -> int:
+        return self._gates_before
+
+    @property
+    def gates_after(self) -> int:
+        return self._gates_after
+
+    @property
+    def cancelled(self) -> int:
+        """Gates removed by cancelling self-inverse pairs or merging into identities."""
+
+        return self._cancelled
+
+    @property
+    def merged(self) -> int:
+        """Gates removed by merging two adjacent gates into one."""
+
+        return self._merged
+
+    @property
+    def removed(self) -> int:
+        return self._gates_before - self._gates_after
+
+    def __repr__(self) -> str:
+        return (
+            f"PeepholeReport(gates={self._gates_before}->{self._gates_after},"
+            f" cancelled={self._cancelled}, merged={self._merged})"
+        )
+
+
+def _is_identity_angle(angle: float) -> bool:
+    return abs(math.remainder(angle, 2 * math.pi)) < ANGLE_ATOL
+
+
+def _merge(first: Gate, second: Gate) -> Gate | None | bool:
+    """
+    Merge two adjacent single-qubit gates on the same qubit. Returns the merged gate,
+    `None` if they merge into the identity, or `False` if they cannot be merged.
+    """
+
+    if first.name in PHASE_GATES_EIGHTHS and second.name in PHASE_GATES_EIGHTHS:
+        eighths = (
+            PHASE_GATES_EIGHTHS[first.name] + PHASE_GATES_EIGHTHS[second.name]
+        ) % 8
+
+        if eighths == 0:
+            return None
+
+        if name := _EIGHTHS_PHASE_GATES.get(eighths, None):
+            return Gate(name, first.qubits)
+
+        return False
+
+    if first.name == second.name and first.name in ROTATION_GATES:
+        angle = first.params[0] + second.params[0]
+
+        if _is_identity_angle(angle):
+            return None
+
+        return Gate(first.name, first.qubits, (angle,))
+
+    return False
+
+
+def peephole(circuit: QasmCircuit) -> tuple[QasmCircuit, PeepholeReport]:
+    """
+    Simplify adjacent gates on the gate stream: pairs of the same self-inverse gate on
+    the same qubits cancel out (e.g. `h q[0]; h q[0];` from repeated `@redim`, `cx`
+    pairs from repeated `@sync` or `x` pairs from overlapping literals), adjacent phase
+    gates and rotations of the same kind merge into one, and identities are dropped.
+
+    Gates are adjacent when no other gate acts on their qubits in between, so
+    cancellations can chain, such as `h x x h` on the same qubit cancelling out.
+    """
+
+    out: list[Gate | None] = []
+    # indexes in `out` of the gates on each qubit, the last one on top
+    stacks: dict[int, list[int]] = {k: [] for k in range(circuit.num_qubits)}
+    cancelled = 0
+    merged = 0
+
+    for gate in circuit.gates:
+
+        if gate.name == "id" or (
+            gate.name in ROTATION_GATES and _is_identity_angle(gate.params[0])
+        ):
+            cancelled += 1
+            continue
+
+        tops = {stacks[q][-1] if stacks[q] else -1 for q in gate.qubits}
+        prev = out[top] if len(tops) == 1 and (top := tops.pop()) >= 0 else None
+
+        if prev is not None and prev.qubits == gate.qubits:
+
+            if prev.name == gate.name and gate.name in SELF_INVERSE_GATES:
+                out[stacks[gate.qubits[0]][-1]] = None
+
+                for q in gate.qubits:
+                    stacks[q].pop()
+
+                cancelled += 2
+                continue
+
+            if len(gate.qubits) == 1:
+                match res := _merge(prev, gate):
+                    case Gate():
+                        out[stacks[gate.qubits[0]][-1]] = res
+                        merged += 1
+                        continue
+
+                    case None:
+                        out[stacks[gate.qubits[0]].pop()] = None
+                        cancelled += 2
+                        continue
+
+        for q in gate.qubits:
+            stacks[q].append(len(out))
+
+        out.append(gate)
+
+    gates = [k for k in out if k is not None]
+    optimized = QasmCircuit(circuit.qregs, circuit.cregs, gates, circuit.measures)
+    report = PeepholeReport(len(circuit.gates), len(gates), cancelled, merged)
+    return optimized, report
+
+
+class CircuitReport:
+    """Depth, width and gate counts of a circuit."""
+
+    _depth: int
+    _width: int
+    _gate_counts: dict[str, int]
+
+    def __init__(self, depth: int, width: int, gate_counts: dict[str, int]):
+        self._depth = depth
+        self._width = width
+        self._gate_counts = gate_counts
+
+    @property
+    def depth(self) -> int:
+        """Number of layers of gates, without the final measurements."""
+
+        return self._depth
+
+    @property
+    def width(self) -> int:
+        """Number of qubits."""
+
+        return self._width
+
+    @property
+    def gate_counts(self) -> dict[str, int]:
+        """Number of gates for each gate name."""
+
+        return self._gate_counts
+
+    @property
+    def num_gates(self) -> int:
+        return sum(self._gate_counts.values())
+
+    def __repr__(self) -> str:
+        return (
+            f"CircuitReport(depth={self._depth}, width={self._width},"
+            f" gates={self._gate_counts})"
+        )
+
+
+def layers(circuit: QasmCircuit) -> list[list[Gate]]:
+    """
+    Group the gates into layers as soon as possible: each gate goes to the layer right
+    after the last one that acts on any of its qubits. Gates in the same layer act on
+    disjoint qubits, and the gates on each qubit keep their order.
+    """
+
+    levels = [0] * circuit.num_qubits
+    grouped: list[list[Gate]] = []
+
+    for gate in circuit.gates:
+        level = max(levels[q] for q in gate.qubits)
+
+        if level == len(grouped):
+            grouped.append([])
+
+        grouped[level].append(gate)
+
+        for q in gate.qubits:
+            levels[q] = level + 1
+
+    return grouped
+
+
+def circuit_report(circuit: QasmCircuit) -> CircuitReport:
+    """Depth, width and gate counts of the circuit, as it is."""
+
+    gate_counts: dict[str, int] = dict()
+
+    for gate in circuit.gates:
+        gate_counts[gate.name] = gate_counts.get(gate.name, 0) + 1
+
+    return CircuitReport(len(layers(circuit)), circuit.num_qubits, gate_counts)
+
+
+def schedule(circuit: QasmCircuit) -> tuple[QasmCircuit, CircuitReport]:
+    """
+    Reorder the gates layer by layer (see `layers`), so gates that can run in parallel
+    come together, and report the circuit depth, width and gate counts. Only gates on
+    disjoint qubits swap places, so the circuit does not change.
+    """
+
+    grouped = layers(circuit)
+    gates = [gate for layer in grouped for gate in layer]
+    scheduled = QasmCircuit(circuit.qregs, circuit.cregs, gates, circuit.measures)
+    return scheduled, circuit_report(scheduled)
+
+
+def optimize_qasm(
+    code: str,
+) -> tuple[str, PeepholeReport | None, CircuitReport | None]:
+    """
+    Run the peephole pass and the scheduling on OpenQASM v2.0 code. The code is given
+    back unchanged if it is outside the gate stream subset (see `parse_qasm`), uses
+    more than one register of each kind, or if the passes change nothing; the reports
+    are `None` when the passes could not run.
+    """
+
+    try:
+        circuit = parse_qasm(code)
+
+    except ValueError:
+        return code, None, None
+
+    if len(circuit.qregs) != 1 or len(circuit.cregs) != 1:
+        return code, None, None
+
+    optimized, peephole_report = peephole(circuit)
+    scheduled, schedule_report = schedule(optimized)
+
+    if scheduled.gates == circuit.gates:
+        return code, peephole_report, schedule_report
+
+    return scheduled.to_qasm(), peephole_report, schedule_report
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import importlib
 import inspect
-from typing import Any, Callable
+from typing import Any, Callable, Sequence
 
 from hhat_lang.core.code.ir import BlockIR, InstrIR, InstrIRFlag, TypeIR
 from hhat_lang.core.code.utils import InstrStatus
@@ -32,30 +32,52 @@ from hhat_lang.dialects.heather.code.simple_ir_builder.ir import (
 
 
 class LowLeveQLang(BaseLowLevelQLang):
-    def init_qlang(self) -> tuple[str, ...]:
+    def init_qlang(
+        self, num_idxs: int | None = None, num_clbits: int | None = None
+    ) -> tuple[str, ...]:
+        """
+        Provides the start of the code, with `num_idxs` qubits (the quantum data
+        number of indexes by default) and `num_clbits` clbits (the number of
+        measured indexes by default).
+        """
+
+        num_idxs = self._num_idxs if num_idxs is None else num_idxs
+        num_clbits = len(self.measured) if num_clbits is None else num_clbits
+
         code_list = (
             "OPENQASM 2.0;",
             'include "qelib1.inc";',
-            f"qreg q[{self._num_idxs}];",
-            f"creg c[{self._num_idxs}];",  # for now, creg num == qreg num
+            f"qreg q[{num_idxs}];",
+            f"creg c[{num_clbits}];",
         )
 
         return code_list
 
-    def end_qlang(self) -> tuple[str, ...]:
-        """Provides the end of the code"""
+    def end_qlang(self, clbit_offset: int = 0) -> tuple[str, ...]:
+        """
+        Provides the end of the code: the measurement of the whole register, or of
+        the `measure` indexes only, into the clbits from `clbit_offset` on.
+        """
 
         # TODO: check whether some qubits were previously measured and
         #  handle the rest appropriately
 
-        return ("measure q -> c;",)
+        if self._measure is None and self._offset == 0 and clbit_offset == 0:
+            return ("measure q -> c;",)
+
+        return tuple(
+            f"measure q[{self._offset + k}] -> c[{clbit_offset + n}];"
+            for n, k in enumerate(self.measured)
+        )
 
     def gen_literal(
         self, literal: CoreLiteral, **_kwargs: Any
     ) -> tuple[str, ...] | ErrorHandler:
         """Generate QASM code from literal data"""
 
-        return tuple(f"x q[{n}];" for n, k in enumerate(literal.bin) if k == "1")
+        return tuple(
+            f"x q[{self._offset + n}];" for n, k in enumerate(literal.bin) if k == "1"
+        )
 
     def gen_var(
         self, var: BaseDataContainer, executor: BaseEvaluator
@@ -166,8 +188,9 @@ class LowLeveQLang(BaseLowLevelQLang):
 
             if (x := getattr(obj, "name", False)) and x == instr.name:
                 res_instr, res_status = obj()(
-                    idxs=self._idx.in_use_by[self._qdata],
+                    idxs=self.positions,
                     executor=self._executor,
+                    sync_strategy=kwargs.get("sync_strategy", None),
                 )
 
                 if res_status == InstrStatus.DONE:
@@ -183,19 +206,14 @@ class LowLeveQLang(BaseLowLevelQLang):
 
         return InstrNotFoundError(instr.name)
 
-    def gen_program(self, **kwargs: Any) -> str:
+    def gen_body(self, **kwargs: Any) -> str:
         """
-        Produces the program as a string code written in OpenQASM v2.
-
-        Args:
-            **kwargs: any metadata that can be useful
-
-        Returns:
-            A string with the OpenQASM v2 code.
+        Produces the quantum data instructions as OpenQASM v2 code, without the
+        start and the end of the program, on the register positions given by
+        `positions`.
         """
 
         code = ""
-        code += "\n".join(self.init_qlang()) + "\n"
 
         for instr in self._code:
 
@@ -214,7 +232,10 @@ class LowLeveQLang(BaseLowLevelQLang):
                         raise gen_args
 
             match gen_instr := self.gen_instrs(
-                instr=instr, idx=self._idx, executor=self._executor
+                instr=instr,
+                idx=self._idx,
+                executor=self._executor,
+                sync_strategy=kwargs.get("sync_strategy", None),
             ):
 
                 case Ok():
@@ -227,9 +248,77 @@ class LowLeveQLang(BaseLowLevelQLang):
                 case ErrorHandler():
                     raise gen_instr
 
+        return code
+
+    def gen_program(self, **kwargs: Any) -> str:
+        """
+        Produces the program as a string code written in OpenQASM v2.
+
+        Args:
+            **kwargs: any metadata that can be useful, such as `sync_strategy`
+                (see `SYNC_STRATEGIES`)
+
+        Returns:
+            A string with the OpenQASM v2 code.
+        """
+
+        code = "\n".join(self.init_qlang()) + "\n"
+        code += self.gen_body(**kwargs)
         code += "\n"
         code += "\n".join(self.end_qlang()) + "\n"
         return code
 
+    @classmethod
+    def gen_packed_program(
+        cls, qlangs: Sequence[BaseLowLevelQLang], **kwargs: Any
+    ) -> tuple[str, tuple[tuple[int, ...], ...]]:
+        """
+        Produces a single OpenQASM v2 program for several independent quantum data,
+        each one placed on its own range of the register, one after the other, with
+        its measured indexes (see `measure`) on its own range of clbits.
+
+        Args:
+            qlangs: the low-level quantum languages of the quantum data to pack
+            **kwargs: any metadata that can be useful
+
+        Returns:
+            A string with the OpenQASM v2 code and, for each quantum data, the
+            clbits holding its measured indexes.
+        """
+
+        if not qlangs:
+            raise ValueError("no quantum data to pack.")
+
+        offset = 0
+        clbit_offset = 0
+        bodies = []
+        measures: list[str] = []
+        clbits: tuple[tuple[int, ...], ...] = ()
+
+        for qlang in qlangs:
+            qlang.offset = offset
+            num_clbits = len(qlang.measured)
+
+            try:
+                bodies.append(qlang.gen_body(**kwargs))
+                measures.extend(qlang.end_qlang(clbit_offset))
+
+            finally:
+                qlang.offset = 0
+
+            clbits += (tuple(range(clbit_offset, clbit_offset + num_clbits)),)
+            offset += qlang.num_idxs
+            clbit_offset += num_clbits
+
+        code = "\n".join(qlangs[0].init_qlang(offset, clbit_offset)) + "\n"
+        code += "\n".join(bodies)
+        code += "\n"
+
+        if all(k.measure is None for k in qlangs):
+            measures = ["measure q -> c;"]
+
+        code += "\n".join(measures) + "\n"
+        return code, clbits
+
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         pass
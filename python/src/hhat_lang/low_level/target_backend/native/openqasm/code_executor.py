@@ -0,0 +1,376 @@
+"""
+Native executor for OpenQASM v2.0 code. Circuits that can be simulated efficiently
+without third-party quantum libraries run here; everything else is handed over to the
+qiskit executor, which is only imported when needed.
+
+Simulation methods (chosen with the `method` metadata key):
+
+- `"auto"` (default): Clifford-only components use the stabilizer simulator, components
+  up to `MAX_STATEVECTOR_QUBITS` qubits use the statevector simulator and any other
+  circuit goes to qiskit
+- `"stabilizer"`: always use the stabilizer simulator; fails for non-Clifford circuits
+- `"statevector"`: always use the statevector simulator, whatever the number of qubits
+- `"qiskit"`: always use the qiskit executor
+
+Set `exact` in the metadata to get the exact bitstring probabilities instead of the
+sampled counts, with no shot noise and no sampling loop. For very large numbers of
+shots, the per-shot outcomes can be streamed in chunks instead (`stream_program`).
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+from hhat_lang.core.data.core import WorkingData
+from hhat_lang.core.execution.counts import Counts, pack_bits
+from hhat_lang.core.error_handlers.errors import (
+    ErrorHandler,
+    InvalidQuantumComputedResult,
+)
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import (
+    QasmCircuit,
+    parse_qasm,
+)
+from hhat_lang.low_level.target_backend.native.passes import (
+    Component,
+    fold_deterministic,
+    split_components,
+)
+from hhat_lang.low_level.target_backend.native.stabilizer import (
+    exact_stabilizer,
+    stabilizer_sampler,
+)
+from hhat_lang.low_level.target_backend.native.statevector import (
+    MAX_STATEVECTOR_QUBITS,
+    exact_statevector,
+    statevector_sampler,
+)
+
+METHODS: tuple[str, ...] = ("auto", "stabilizer", "statevector", "qiskit")
+"""Simulation methods available for the `method` metadata key."""
+
+DEFAULT_CHUNK_SHOTS: int = 1 << 16
+"""Default number of shots per chunk when streaming per-shot outcomes."""
+
+# worker threads for asynchronous execution; created on the first submission
+_async_executor: ThreadPoolExecutor | None = None
+_async_executor_lock = threading.Lock()
+
+
+def async_executor() -> ThreadPoolExecutor:
+    """Thread pool used by `submit_program` to run quantum programs in the background."""
+
+    global _async_executor
+
+    with _async_executor_lock:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(thread_name_prefix="hhat-native")
+
+    return _async_executor
+
+
+def default_shots(circuit: QasmCircuit) -> int:
+    """Shots budget when the metadata does not give the number of shots."""
+
+    return len(circuit.qregs) * 888
+
+
+def select_method(circuit: QasmCircuit | None, metadata: dict[str, Any]) -> str:
+    """
+    Select the simulation method for the circuit; `circuit` is `None` when the code
+    could not be parsed into the native gate stream.
+    """
+
+    method = metadata.get("method", "auto")
+
+    if method not in METHODS:
+        raise ValueError(f"'method' must be one of {METHODS}, got {method!r}.")
+
+    if method == "stabilizer" and (circuit is None or not circuit.is_clifford):
+        raise ValueError("stabilizer method requires a Clifford-only circuit.")
+
+    if method == "statevector" and circuit is None:
+        raise ValueError("statevector method cannot run this circuit.")
+
+    if method == "auto":
+        if circuit is not None and circuit.is_clifford:
+            return "stabilizer"
+
+        if circuit is not None and circuit.num_qubits <= MAX_STATEVECTOR_QUBITS:
+            return "statevector"
+
+        return "qiskit"
+
+    return method
+
+
+def native_sampler(
+    circuit: QasmCircuit,
+    components: list[Component],
+    methods: list[str],
+    fixed_bits: dict[int, int],
+) -> Callable[[int, np.random.Generator], np.ndarray]:
+    """
+    Simulate each independent component once, with its own method, and return a
+    function that samples any number of shots as the circuit's clbits memory. The
+    per-shot outcomes of the components are put back together, along with the
+    `fixed_bits` values (clbits of deterministic qubits, see `fold_deterministic`).
+    """
+
+    samplers = []
+
+    for component, method in zip(components, methods):
+        match method:
+            case "stabilizer":
+                samplers.append((component, stabilizer_sampler(component.circuit)))
+
+            case "statevector":
+                samplers.append((component, statevector_sampler(component.circuit)))
+
+            case _:
+                raise ValueError(f"'{method}' is not a native simulation method.")
+
+    def sample(shots: int, rng: np.random.Generator) -> np.ndarray:
+        memory = np.zeros((shots, circuit.num_clbits), dtype=np.uint8)
+
+        for clbit, value in fixed_bits.items():
+            memory[:, clbit] = value
+
+        for component, sampler in samplers:
+            memory[:, component.clbits] = sampler(shots, rng)
+
+        return memory
+
+    return sample
+
+
+def sample_native(
+    circuit: QasmCircuit,
+    components: list[Component],
+    methods: list[str],
+    fixed_bits: dict[int, int],
+    qdata: str | WorkingData,
+    metadata: dict[str, Any],
+) -> Any | ErrorHandler:
+    """
+    Generate the counts with the native simulators (see `native_sampler`). The
+    sampling is vectorized, so the whole shots budget is always used (no adaptive
+    sampling nor sharding). The `seed` metadata makes the results reproducible.
+    """
+
+    n_shots = metadata.get("shots", None) or default_shots(circuit)
+    rng = np.random.default_rng(metadata.get("seed", None))
+
+    try:
+        memory = native_sampler(circuit, components, methods, fixed_bits)(n_shots, rng)
+
+    except ValueError:
+        return InvalidQuantumComputedResult(qdata)
+
+    return Counts.from_memory(memory)
+
+
+def exact_native(
+    circuit: QasmCircuit,
+    components: list[Component],
+    methods: list[str],
+    fixed_bits: dict[int, int],
+    qdata: str | WorkingData,
+) -> Any | ErrorHandler:
+    """
+    Compute the exact outcome probabilities with the native simulators, without any
+    sampling. Each component gives its own distribution (see `exact_stabilizer` and
+    `exact_statevector`), and since components are independent, the circuit's
+    distribution is their product, with the `fixed_bits` values set on every outcome.
+    """
+
+    outcomes = np.zeros((1, circuit.num_clbits), dtype=np.uint8)
+    probs = np.ones(1)
+
+    for clbit, value in fixed_bits.items():
+        outcomes[:, clbit] = value
+
+    for component, method in zip(components, methods):
+        match method:
+            case "stabilizer":
+                sub_outcomes, sub_probs = exact_stabilizer(component.circuit)
+
+            case "statevector":
+                sub_outcomes, sub_probs = exact_statevector(component.circuit)
+
+            case _:
+                return InvalidQuantumComputedResult(qdata)
+
+        outcomes = np.repeat(outcomes, len(sub_probs), axis=0)
+        outcomes[:, component.clbits] = np.tile(sub_outcomes, (len(probs), 1))
+        probs = np.outer(probs, sub_probs).reshape(-1)
+
+    return Counts.from_rows(outcomes, probs)
+
+
+NativePlan = tuple[QasmCircuit, list[Component], list[str], dict[int, int]]
+"""
+Type annotation for `NativePlan`: the circuit with deterministic qubits folded out,
+its independent components, the simulation method for each component and the folded
+clbits values.
+"""
+
+
+def plan_native(code: str, metadata: dict[str, Any]) -> NativePlan | None:
+    """
+    Prepare the OpenQASM v2.0 code for the native simulators: qubits with deterministic
+    outcomes are folded out of the circuit (see `fold_deterministic`), then the circuit
+    is split into independent components (see `split_components`) and each one gets
+    its simulation method (see `select_method`). Returns `None` if the code must run
+    on the qiskit executor instead.
+    """
+
+    try:
+        circuit = parse_qasm(code)
+
+    except ValueError:
+        select_method(None, metadata)
+        return None
+
+    circuit, fixed_bits = fold_deterministic(circuit)
+    components = split_components(circuit)
+    methods = [select_method(k.circuit, metadata) for k in components]
+
+    if "qiskit" in methods or metadata.get("method", None) == "qiskit":
+        return None
+
+    return circuit, components, methods, fixed_bits
+
+
+def execute_program(
+    code: str,
+    qdata: str | WorkingData,
+    debug: bool = False,
+    metadata: dict[str, Any] | None = None,
+) -> Any | ErrorHandler:
+    """
+    Execute the quantum program from a quantum data `qdata`, given as OpenQASM v2.0
+    code. It runs on the native simulators (see `plan_native`) unless any part of the
+    circuit cannot, in which case the whole program runs on the qiskit executor. It
+    retrieves the bitstring distribution or an error.
+
+    With `exact` set in the metadata, the bitstring probabilities are computed
+    directly from the final states instead of sampled (see `exact_native`).
+    """
+
+    metadata = metadata or dict()
+
+    if (plan := plan_native(code, metadata)) is None:
+        if metadata.get("exact", False):
+            raise ValueError("exact mode is only available on native simulators.")
+
+        from hhat_lang.low_level.target_backend.qiskit.openqasm import (
+            code_executor as qiskit_executor,
+        )
+
+        return qiskit_executor.execute_program(code, qdata, debug, metadata)
+
+    circuit, components, methods, fixed_bits = plan
+
+    if metadata.get("exact", False):
+        res = exact_native(circuit, components, methods, fixed_bits, qdata)
+
+    else:
+        res = sample_native(circuit, components, methods, fixed_bits, qdata, metadata)
+
+    if debug:
+        print(res)
+
+    return res
+
+
+def submit_program(
+    code: str,
+    qdata: str | WorkingData,
+    debug: bool = False,
+    metadata: dict[str, Any] | None = None,
+) -> Future:
+    """
+    Submit the quantum program from a quantum data `qdata` to be executed in the
+    background, returning a `Future` as a handle for the pending bitstring distribution
+    (or error).
+    """
+
+    return async_executor().submit(execute_program, code, qdata, debug, metadata)
+
+
+def _sample_chunks(
+    sample: Callable[[int, np.random.Generator], np.ndarray],
+    n_shots: int,
+    chunk_shots: int,
+    rng: np.random.Generator,
+) -> Iterator[np.ndarray]:
+    for start in range(0, n_shots, chunk_shots):
+        yield pack_bits(sample(min(chunk_shots, n_shots - start), rng))
+
+
+def _stream(code: str, metadata: dict[str, Any]) -> tuple[int, Iterator[np.ndarray]]:
+    if (plan := plan_native(code, metadata)) is None:
+        raise ValueError("streaming is only available on native simulators.")
+
+    circuit, components, methods, fixed_bits = plan
+    n_shots = metadata.get("shots", None) or default_shots(circuit)
+    chunk_shots = metadata.get("chunk_shots", None) or DEFAULT_CHUNK_SHOTS
+    rng = np.random.default_rng(metadata.get("seed", None))
+    sample = native_sampler(circuit, components, methods, fixed_bits)
+    return n_shots, _sample_chunks(sample, n_shots, chunk_shots, rng)
+
+
+def stream_program(
+    code: str, qdata: str | WorkingData, metadata: dict[str, Any] | None = None
+) -> Iterator[np.ndarray]:
+    """
+    Execute the quantum program from a quantum data `qdata` and stream the per-shot
+    outcomes, in shot order, as chunks of packed `uint64` words with shape
+    `(chunk shots, words)` (see `pack_bits`). The circuit is simulated once, and each
+    chunk is sampled only when the consumer asks for it, so the memory use depends on
+    the chunk size only, not on the number of shots.
+
+    Metadata keys: `shots`, `chunk_shots` (shots per chunk, `DEFAULT_CHUNK_SHOTS` by
+    default), `seed` and `method`. Only native simulators can stream.
+    """
+
+    return _stream(code, metadata or dict())[1]
+
+
+def stream_program_to_file(
+    code: str,
+    qdata: str | WorkingData,
+    path: str | Path,
+    metadata: dict[str, Any] | None = None,
+) -> np.memmap:
+    """
+    Execute the quantum program from a quantum data `qdata` and write the per-shot
+    outcomes into a memory-mapped `.npy` file at `path`, as packed `uint64` words with
+    shape `(shots, words)`. Chunks are written as they are sampled (see
+    `stream_program`), and the returned memory map reads them back lazily from disk.
+    """
+
+    n_shots, chunks = _stream(code, metadata or dict())
+    memmap: np.memmap | None = None
+    start = 0
+
+    for chunk in chunks:
+        if memmap is None:
+            memmap = np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.uint64, shape=(n_shots, chunk.shape[1])
+            )
+
+        memmap[start : start + chunk.shape[0]] = chunk
+        start += chunk.shape[0]
+
+    if memmap is None:
+        raise ValueError("no shots to stream.")
+
+    memmap.flush()
+    return memmap
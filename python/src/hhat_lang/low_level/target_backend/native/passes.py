@@ -0,0 +1,151 @@
+"""
+Pre-simulation passes for the native simulators. They reshape the circuit so it is
+cheaper to simulate while keeping the same measurement distribution.
+"""
+
+from __future__ import annotations
+
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import Gate, QasmCircuit
+
+
+class Component:
+    """
+    Sub-circuit with qubits that never interact with the qubits of any other component.
+    Its qubits and clbits are renumbered from zero; `qubits` and `clbits` hold the
+    original indexes for each of them.
+    """
+
+    _circuit: QasmCircuit
+    _qubits: tuple[int, ...]
+    _clbits: tuple[int, ...]
+
+    def __init__(
+        self, circuit: QasmCircuit, qubits: tuple[int, ...], clbits: tuple[int, ...]
+    ):
+        self._circuit = circuit
+        self._qubits = qubits
+        self._clbits = clbits
+
+    @property
+    def circuit(self) -> QasmCircuit:
+        return self._circuit
+
+    @property
+    def qubits(self) -> tuple[int, ...]:
+        return self._qubits
+
+    @property
+    def clbits(self) -> tuple[int, ...]:
+        return self._clbits
+
+    def __repr__(self) -> str:
+        return f"Component(qubits={self._qubits}, clbits={self._clbits})"
+
+
+def _find(parents: list[int], k: int) -> int:
+    while parents[k] != k:
+        parents[k] = parents[parents[k]]
+        k = parents[k]
+
+    return k
+
+
+def split_components(circuit: QasmCircuit) -> list[Component]:
+    """
+    Split the circuit into independent components: groups of qubits linked by
+    multi-qubit gates, found with union-find. Components without measurements are
+    dropped, since they do not change the outcomes. Each component can be simulated
+    on its own, so the cost grows with the largest component instead of the whole
+    circuit width.
+    """
+
+    parents = list(range(circuit.num_qubits))
+
+    for gate in circuit.gates:
+        root = _find(parents, gate.qubits[0])
+
+        for qubit in gate.qubits[1:]:
+            parents[_find(parents, qubit)] = root
+
+    groups: dict[int, list[int]] = dict()
+    gates: dict[int, list[Gate]] = dict()
+    measures: dict[int, list[tuple[int, int]]] = dict()
+
+    for qubit in range(circuit.num_qubits):
+        groups.setdefault(_find(parents, qubit), []).append(qubit)
+
+    for gate in circuit.gates:
+        gates.setdefault(_find(parents, gate.qubits[0]), []).append(gate)
+
+    for qubit, clbit in circuit.measures:
+        measures.setdefault(_find(parents, qubit), []).append((qubit, clbit))
+
+    components: list[Component] = []
+
+    for root in sorted(measures):
+        qubits = tuple(groups[root])
+        local_qubits = {q: n for n, q in enumerate(qubits)}
+        clbits = tuple(dict.fromkeys(c for _, c in measures[root]))
+        local_clbits = {c: n for n, c in enumerate(clbits)}
+
+        components.append(
+            Component(
+                QasmCircuit(
+                    [("q", len(qubits))],
+                    [("c", len(clbits))],
+                    (
+                        Gate(g.name, tuple(local_qubits[q] for q in g.qubits), g.params)
+                        for g in gates.get(root, [])
+                    ),
+                    ((local_qubits[q], local_clbits[c]) for q, c in measures[root]),
+                ),
+                qubits,
+                clbits,
+            )
+        )
+
+    return components
+
+
+BIT_FLIP_GATES: frozenset[str] = frozenset({"x", "y"})
+"""Single-qubit gates that flip a computational basis state (up to a phase)."""
+
+BASIS_PRESERVING_GATES: frozenset[str] = frozenset(
+    {"id", "z", "s", "sdg", "t", "tdg", "rz", "u1"}
+)
+"""Single-qubit gates that keep a computational basis state (up to a phase)."""
+
+
+def fold_deterministic(circuit: QasmCircuit) -> tuple[QasmCircuit, dict[int, int]]:
+    """
+    Find the qubits whose measurement outcome is known without simulation, such as
+    the ones from literals, that only get `x` gates. They are qubits that are never
+    touched by multi-qubit gates and only get gates that map a computational basis
+    state into another one (`BIT_FLIP_GATES` and `BASIS_PRESERVING_GATES`).
+
+    Returns the circuit without those qubits gates and measurements, and the bit value
+    for each of their clbits.
+    """
+
+    flips: dict[int, int] = {q: 0 for q in range(circuit.num_qubits)}
+
+    for gate in circuit.gates:
+        if len(gate.qubits) > 1 or gate.name not in (
+            BIT_FLIP_GATES | BASIS_PRESERVING_GATES
+        ):
+            for qubit in gate.qubits:
+                flips.pop(qubit, None)
+
+        elif gate.name in BIT_FLIP_GATES and gate.qubits[0] in flips:
+            flips[gate.qubits[0]] ^= 1
+
+    if not flips:
+        return circuit, dict()
+
+    folded = QasmCircuit(
+        circuit.qregs,
+        circuit.cregs,
+        (g for g in circuit.gates if g.qubits[0] not in flips),
+        ((q, c) for q, c in circuit.measures if q not in flips),
+    )
+    return folded, {c: flips[q] for q, c in circuit.measures if q in flips}
@@ -0,0 +1,314 @@
+"""
+Stabilizer simulator for Clifford-only circuits, using the Aaronson-Gottesman tableau
+(CHP) representation on `numpy` boolean arrays. Gates and measurements cost O(n) and
+O(n^2) on the number of qubits `n`, instead of the O(2^n) from a statevector.
+
+Measurements are done *symbolically*: each random measurement outcome becomes a new
+random bit variable and the tableau phases keep track of the variables they depend on.
+At the end, the measured bits are an affine function over GF(2) of the random bits::
+
+    bits = b + A @ r  (mod 2)
+
+so the circuit is simulated only once, no matter how many shots are sampled, and each
+shot costs a single matrix product on uniformly random bits `r`.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import Gate, QasmCircuit
+
+
+def _phase_exponents(
+    x1: np.ndarray, z1: np.ndarray, x2: np.ndarray, z2: np.ndarray
+) -> np.ndarray:
+    """
+    Exponents of `i` when multiplying the Pauli (x1, z1) by (x2, z2), per qubit; the
+    `g` function from Aaronson-Gottesman.
+    """
+
+    x1, z1, x2, z2 = (k.astype(np.int64) for k in (x1, z1, x2, z2))
+    return (
+        x1 * z1 * (z2 - x2)
+        + x1 * (1 - z1) * z2 * (2 * x2 - 1)
+        + (1 - x1) * z1 * x2 * (1 - 2 * z2)
+    )
+
+
+class StabilizerTableau:
+    """
+    Tableau with `n` destabilizers rows, `n` stabilizers rows and a scratch row. The
+    phases are kept as rows of bits, where column 0 is the constant phase and column
+    `k + 1` tells whether the phase depends on the `k`-th random measurement bit.
+    """
+
+    _num_qubits: int
+    _x: np.ndarray
+    _z: np.ndarray
+    _r: np.ndarray
+    _num_vars: int
+
+    def __init__(self, num_qubits: int):
+        n = num_qubits
+        self._num_qubits = n
+        self._x = np.zeros((2 * n + 1, n), dtype=bool)
+        self._z = np.zeros((2 * n + 1, n), dtype=bool)
+        self._r = np.zeros((2 * n + 1, n + 1), dtype=bool)
+        self._num_vars = 0
+
+        self._x[np.arange(n), np.arange(n)] = True
+        self._z[np.arange(n, 2 * n), np.arange(n)] = True
+
+    @property
+    def num_qubits(self) -> int:
+        return self._num_qubits
+
+    @property
+    def num_vars(self) -> int:
+        """Number of random bits from the measurements so far."""
+
+        return self._num_vars
+
+    def h(self, a: int) -> None:
+        xa, za = self._x[:, a].copy(), self._z[:, a].copy()
+        self._r[:, 0] ^= xa & za
+        self._x[:, a], self._z[:, a] = za, xa
+
+    def s(self, a: int) -> None:
+        self._r[:, 0] ^= self._x[:, a] & self._z[:, a]
+        self._z[:, a] ^= self._x[:, a]
+
+    def sdg(self, a: int) -> None:
+        self._r[:, 0] ^= self._x[:, a] & ~self._z[:, a]
+        self._z[:, a] ^= self._x[:, a]
+
+    def x(self, a: int) -> None:
+        self._r[:, 0] ^= self._z[:, a]
+
+    def y(self, a: int) -> None:
+        self._r[:, 0] ^= self._x[:, a] ^ self._z[:, a]
+
+    def z(self, a: int) -> None:
+        self._r[:, 0] ^= self._x[:, a]
+
+    def cx(self, c: int, t: int) -> None:
+        xc, zc, xt, zt = self._x[:, c], self._z[:, c], self._x[:, t], self._z[:, t]
+        self._r[:, 0] ^= xc & zt & ~(xt ^ zc)
+        self._x[:, t] ^= xc
+        self._z[:, c] ^= zt
+
+    def cy(self, c: int, t: int) -> None:
+        self.sdg(t)
+        self.cx(c, t)
+        self.s(t)
+
+    def cz(self, c: int, t: int) -> None:
+        self.h(t)
+        self.cx(c, t)
+        self.h(t)
+
+    def apply(self, gate: Gate) -> None:
+        match gate.name:
+            case "id":
+                pass
+
+            case "x" | "y" | "z" | "h" | "s" | "sdg" | "cx" | "cy" | "cz":
+                getattr(self, gate.name)(*gate.qubits)
+
+            case _:
+                raise ValueError(f"gate '{gate.name}' is not a Clifford gate.")
+
+    def _rowsum(self, rows: np.ndarray, i: int) -> None:
+        """Multiply each row in `rows` by row `i`, all at once."""
+
+        g = _phase_exponents(self._x[i], self._z[i], self._x[rows], self._z[rows]).sum(
+            axis=1
+        )
+        self._r[rows] ^= self._r[i]
+        self._r[rows, 0] ^= (g % 4) == 2
+        self._x[rows] ^= self._x[i]
+        self._z[rows] ^= self._z[i]
+
+    def _product(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Phase of the product of the given rows, multiplied in order. The partial
+        products are the cumulative XOR of the rows, so no Python loop is needed.
+        """
+
+        xs, zs = self._x[rows], self._z[rows]
+        acc_x = np.logical_xor.accumulate(xs, axis=0)
+        acc_z = np.logical_xor.accumulate(zs, axis=0)
+
+        # partial product before multiplying each row
+        prev_x = np.vstack([np.zeros_like(xs[:1]), acc_x[:-1]])
+        prev_z = np.vstack([np.zeros_like(zs[:1]), acc_z[:-1]])
+
+        g = int(_phase_exponents(xs, zs, prev_x, prev_z).sum())
+        phase = np.logical_xor.reduce(self._r[rows], axis=0)
+        phase[0] ^= (g % 4) == 2
+        return phase
+
+    def _new_var(self) -> int:
+        if self._num_vars + 1 >= self._r.shape[1]:
+            self._r = np.hstack([self._r, np.zeros_like(self._r)])
+
+        self._num_vars += 1
+        return self._num_vars
+
+    def measure(self, a: int) -> np.ndarray:
+        """
+        Measure qubit `a` on the computational basis. Returns the outcome as a row of
+        bits: the constant bit followed by the random bits coefficients.
+        """
+
+        n = self._num_qubits
+        stabs = np.flatnonzero(self._x[n : 2 * n, a])
+
+        # random outcome: a new random bit variable
+        if stabs.size:
+            p = n + int(stabs[0])
+            rows = np.flatnonzero(self._x[: 2 * n, a])
+            rows = rows[rows != p]
+
+            if rows.size:
+                self._rowsum(rows, p)
+
+            self._x[p - n], self._z[p - n], self._r[p - n] = (
+                self._x[p],
+                self._z[p],
+                self._r[p],
+            )
+            var = self._new_var()
+            self._x[p] = False
+            self._z[p] = False
+            self._z[p, a] = True
+            self._r[p] = False
+            self._r[p, var] = True
+
+            outcome = np.zeros(self._r.shape[1], dtype=bool)
+            outcome[var] = True
+            return outcome
+
+        # deterministic outcome: product of the stabilizers paired with the destabilizers
+        # that anticommute with Z on qubit `a`
+        rows = n + np.flatnonzero(self._x[:n, a])
+        return self._product(rows)
+
+
+def measurement_form(circuit: QasmCircuit) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate the Clifford circuit and return the affine form of its measurements: the
+    constant bits `b` with shape `(measures,)` and the coefficients `A` with shape
+    `(measures, random bits)`, both as `uint8`.
+    """
+
+    tableau = StabilizerTableau(circuit.num_qubits)
+
+    for gate in circuit.gates:
+        tableau.apply(gate)
+
+    outcomes = [tableau.measure(q) for q, _ in circuit.measures]
+    width = tableau.num_vars + 1
+    form = np.zeros((len(outcomes), width), dtype=np.uint8)
+
+    for n, outcome in enumerate(outcomes):
+        form[n, : min(width, outcome.size)] = outcome[:width]
+
+    return form[:, 0], form[:, 1:]
+
+
+def _form_to_memory(
+    circuit: QasmCircuit, const: np.ndarray, coeffs: np.ndarray, rand: np.ndarray
+) -> np.ndarray:
+    """Evaluate the affine form on the random bits rows and place them on the clbits."""
+
+    # float32 matrix product is exact here and much faster than the integer one
+    bits = (rand.astype(np.float32) @ coeffs.T.astype(np.float32)).astype(np.int64)
+    bits = (bits + const) % 2
+
+    memory = np.zeros((rand.shape[0], circuit.num_clbits), dtype=np.uint8)
+
+    for n, (_, clbit) in enumerate(circuit.measures):
+        memory[:, clbit] = bits[:, n]
+
+    return memory
+
+
+def independent_columns(coeffs: np.ndarray) -> list[int]:
+    """Indexes of a maximal set of linearly independent columns over GF(2)."""
+
+    mat = coeffs.astype(bool)
+    pivots: list[int] = []
+    row = 0
+
+    for col in range(mat.shape[1]):
+        if row == mat.shape[0]:
+            break
+
+        if not (candidates := np.flatnonzero(mat[row:, col])).size:
+            continue
+
+        p = row + int(candidates[0])
+        mat[[row, p]] = mat[[p, row]]
+        others = np.flatnonzero(mat[:, col])
+        others = others[others != row]
+        mat[others] ^= mat[row]
+        pivots.append(col)
+        row += 1
+
+    return pivots
+
+
+def stabilizer_sampler(
+    circuit: QasmCircuit,
+) -> Callable[[int, np.random.Generator], np.ndarray]:
+    """
+    Simulate the Clifford circuit once and return a function that samples any number
+    of shots from it, so shots can be drawn in chunks.
+    """
+
+    const, coeffs = measurement_form(circuit)
+
+    def sample(shots: int, rng: np.random.Generator) -> np.ndarray:
+        rand = rng.integers(0, 2, size=(shots, coeffs.shape[1]), dtype=np.uint8)
+        return _form_to_memory(circuit, const, coeffs, rand)
+
+    return sample
+
+
+def sample_stabilizer(
+    circuit: QasmCircuit, shots: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Sample the Clifford circuit. Returns the memory, the per-shot classical bits, with
+    shape `(shots, clbits)` as `uint8`.
+    """
+
+    return stabilizer_sampler(circuit)(shots, rng)
+
+
+def exact_stabilizer(
+    circuit: QasmCircuit, max_rank: int = 20
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Exact outcome distribution of the Clifford circuit. The outcomes are uniformly
+    distributed over the affine space `b + span(A)`, so with `rank` independent columns
+    there are `2^rank` outcomes, each with probability `2^-rank`.
+
+    Returns the outcomes as clbits rows with shape `(2^rank, clbits)` as `uint8` and
+    their probabilities. Raises `ValueError` if the rank is larger than `max_rank`.
+    """
+
+    const, coeffs = measurement_form(circuit)
+    coeffs = coeffs[:, independent_columns(coeffs)]
+    rank = coeffs.shape[1]
+
+    if rank > max_rank:
+        raise ValueError(f"exact distribution has 2^{rank} outcomes, too many.")
+
+    rand = (np.arange(1 << rank)[:, None] >> np.arange(rank)) & 1
+    probs = np.full(1 << rank, 1.0 / (1 << rank))
+    return _form_to_memory(circuit, const, coeffs, rand), probs
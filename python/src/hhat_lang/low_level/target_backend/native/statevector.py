@@ -0,0 +1,178 @@
+"""
+Statevector simulator on `numpy` arrays, for circuits with few qubits. The state is
+kept as a tensor with one axis of size 2 per qubit (axis `k` for qubit `k`), so gates
+are applied as tensor contractions over their qubits axes, without building full
+`2^n x 2^n` operators. Consecutive single-qubit gates on the same qubit are fused into
+a single matrix before being applied.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable
+
+import numpy as np
+
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import Gate, QasmCircuit
+
+MAX_STATEVECTOR_QUBITS: int = 20
+"""Largest number of qubits the statevector simulator is used for by default."""
+
+_SQRT1_2 = 1 / math.sqrt(2)
+
+SINGLE_QUBIT_MATRICES: dict[str, np.ndarray] = {
+    "id": np.eye(2, dtype=complex),
+    "x": np.array([[0, 1], [1, 0]], dtype=complex),
+    "y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "z": np.array([[1, 0], [0, -1]], dtype=complex),
+    "h": np.array([[_SQRT1_2, _SQRT1_2], [_SQRT1_2, -_SQRT1_2]], dtype=complex),
+    "s": np.array([[1, 0], [0, 1j]], dtype=complex),
+    "sdg": np.array([[1, 0], [0, -1j]], dtype=complex),
+    "t": np.array([[1, 0], [0, np.exp(1j * math.pi / 4)]], dtype=complex),
+    "tdg": np.array([[1, 0], [0, np.exp(-1j * math.pi / 4)]], dtype=complex),
+}
+
+CONTROLLED_GATES: dict[str, str] = {"cx": "x", "cy": "y", "cz": "z"}
+"""Two-qubit gates as the single-qubit gate applied to the target when the control is 1."""
+
+
+def gate_matrix(gate: Gate) -> np.ndarray:
+    """Matrix of a single-qubit gate."""
+
+    match gate.name:
+        case "rx":
+            c, s = math.cos(gate.params[0] / 2), math.sin(gate.params[0] / 2)
+            return np.array([[c, -1j * s], [-1j * s, c]], dtype=complex)
+
+        case "ry":
+            c, s = math.cos(gate.params[0] / 2), math.sin(gate.params[0] / 2)
+            return np.array([[c, -s], [s, c]], dtype=complex)
+
+        case "rz":
+            phase = np.exp(1j * gate.params[0] / 2)
+            return np.array([[1 / phase, 0], [0, phase]], dtype=complex)
+
+        case "u1":
+            return np.array([[1, 0], [0, np.exp(1j * gate.params[0])]], dtype=complex)
+
+        case name if name in SINGLE_QUBIT_MATRICES:
+            return SINGLE_QUBIT_MATRICES[name]
+
+    raise ValueError(f"gate '{gate.name}' is not a single-qubit gate.")
+
+
+def _apply_matrix(state: np.ndarray, matrix: np.ndarray, axis: int) -> np.ndarray:
+    return np.moveaxis(np.tensordot(matrix, state, axes=([1], [axis])), 0, axis)
+
+
+def _apply_controlled(
+    state: np.ndarray, matrix: np.ndarray, control: int, target: int
+) -> np.ndarray:
+    """Apply the matrix on the target axis, only on the control's 1 subspace."""
+
+    index: list[slice | int] = [slice(None)] * state.ndim
+    index[control] = 1
+    sub_target = target if target < control else target - 1
+    state[tuple(index)] = _apply_matrix(state[tuple(index)], matrix, sub_target)
+    return state
+
+
+def statevector(circuit: QasmCircuit) -> np.ndarray:
+    """
+    Final state of the circuit gates, starting from all qubits at zero, as a tensor
+    with shape `(2,) * num_qubits`.
+    """
+
+    n = circuit.num_qubits
+    state = np.zeros((2,) * n, dtype=complex)
+    state[(0,) * n] = 1
+
+    # single-qubit gates waiting to be applied, fused per qubit
+    pending: dict[int, np.ndarray] = dict()
+
+    def flush(qubit: int) -> None:
+        nonlocal state
+
+        if (matrix := pending.pop(qubit, None)) is not None:
+            state = _apply_matrix(state, matrix, qubit)
+
+    for gate in circuit.gates:
+        if gate.name in CONTROLLED_GATES:
+            control, target = gate.qubits
+            flush(control)
+            flush(target)
+            matrix = SINGLE_QUBIT_MATRICES[CONTROLLED_GATES[gate.name]]
+            state = _apply_controlled(state, matrix, control, target)
+
+        else:
+            (qubit,) = gate.qubits
+            matrix = gate_matrix(gate)
+            pending[qubit] = matrix @ pending[qubit] if qubit in pending else matrix
+
+    for qubit in list(pending):
+        flush(qubit)
+
+    return state
+
+
+def probabilities(state: np.ndarray) -> np.ndarray:
+    """Probabilities of each basis state, flattened with qubit 0 as the leftmost bit."""
+
+    probs = np.abs(state.reshape(-1)) ** 2
+    return probs / probs.sum()
+
+
+def statevector_sampler(
+    circuit: QasmCircuit,
+) -> Callable[[int, np.random.Generator], np.ndarray]:
+    """
+    Simulate the circuit once and return a function that samples any number of shots
+    from its final state, so shots can be drawn in chunks.
+    """
+
+    n = circuit.num_qubits
+    probs = probabilities(statevector(circuit))
+
+    def sample(shots: int, rng: np.random.Generator) -> np.ndarray:
+        outcomes = rng.choice(2**n, size=shots, p=probs)
+        memory = np.zeros((shots, circuit.num_clbits), dtype=np.uint8)
+
+        for qubit, clbit in circuit.measures:
+            memory[:, clbit] = (outcomes >> (n - 1 - qubit)) & 1
+
+        return memory
+
+    return sample
+
+
+def sample_statevector(
+    circuit: QasmCircuit, shots: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Sample the circuit. Returns the memory, the per-shot classical bits, with shape
+    `(shots, clbits)` as `uint8`.
+    """
+
+    return statevector_sampler(circuit)(shots, rng)
+
+
+def exact_statevector(
+    circuit: QasmCircuit, atol: float = 1e-12
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Exact outcome distribution of the circuit, from its final state. Returns the
+    outcomes as clbits rows with shape `(outcomes, clbits)` as `uint8` and their
+    probabilities; outcomes with probability below `atol` are left out.
+    """
+
+    n = circuit.num_qubits
+    probs = probabilities(statevector(circuit))
+    states = np.flatnonzero(probs > atol)
+    memory = np.zeros((states.size, circuit.num_clbits), dtype=np.uint8)
+
+    for qubit, clbit in circuit.measures:
+        memory[:, clbit] = (states >> (n - 1 - qubit)) & 1
+
+    # states that only differ on unmeasured qubits give the same outcome
+    outcomes, inverse = np.unique(memory, axis=0, return_inverse=True)
+    return outcomes, np.bincount(inverse.reshape(-1), weights=probs[states])
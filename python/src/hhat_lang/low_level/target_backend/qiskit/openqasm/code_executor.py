@@ -1,6 +1,15 @@
 from __future__ import annotations
 
-from typing import Any
+import atexit
+import hashlib
+import math
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Sequence
+
+import numpy as np
 
 from qiskit import QuantumCircuit, qasm2, transpile
 from qiskit.primitives.containers.pub_result import DataBin, PubResult
@@ -10,61 +19,595 @@ from qiskit_aer import AerSimulator
 from qiskit_aer.primitives import SamplerV2 as Sampler
 
 from hhat_lang.core.data.core import Symbol, WorkingData
+from hhat_lang.core.execution.counts import Counts
 from hhat_lang.core.error_handlers.errors import (
     ErrorHandler,
     InvalidQuantumComputedResult,
 )
 
+BackendKey = tuple[tuple[str, str], ...]
+"""
+Type annotation for `BackendKey`, a hashable form of the backend options, used to
+identify a configured backend in the `BackendPool` and in the `TranspileCache`.
+"""
+
+
+def backend_key(backend_options: dict[str, Any] | None = None) -> BackendKey:
+    """Hashable key for a given set of backend options."""
+
+    backend_options = backend_options or dict()
+    return tuple(sorted((str(k), repr(v)) for k, v in backend_options.items()))
+
+
+def circuit_hash(circuit: QuantumCircuit) -> str:
+    """
+    Hash of the circuit structure: registers names and sizes and the sequence of
+    operations with their qubits, clbits and parameters. Circuits with the same
+    structure have the same hash, regardless of being different `QuantumCircuit`
+    instances.
+    """
+
+    digest = hashlib.sha256()
+    digest.update(f"{circuit.num_qubits}:{circuit.num_clbits};".encode())
+
+    for reg in circuit.qregs:
+        digest.update(f"qreg {reg.name}[{reg.size}];".encode())
+
+    for reg in circuit.cregs:
+        digest.update(f"creg {reg.name}[{reg.size}];".encode())
+
+    for instr in circuit.data:
+        qubits = ",".join(str(circuit.find_bit(q).index) for q in instr.qubits)
+        clbits = ",".join(str(circuit.find_bit(c).index) for c in instr.clbits)
+        params = ",".join(repr(p) for p in instr.operation.params)
+        digest.update(f"{instr.operation.name}({params})[{qubits}][{clbits}];".encode())
+
+    return digest.hexdigest()
+
+
+class BackendPool:
+    """
+    Keep configured simulator and sampler instances warm, so repeated executions
+    reuse them instead of building new ones on every call. Instances are identified
+    by their backend options.
+
+    Seeded samplers share the pooled simulator and are kept in a small LRU, since a
+    sampler's seed is fixed at creation.
+    """
+
+    _data: dict[BackendKey, tuple[AerSimulator, Sampler]]
+    _seeded: OrderedDict[tuple[BackendKey, int], Sampler]
+    _max_seeded: int
+    _lock: threading.Lock
+
+    def __init__(self, max_seeded: int = 64):
+        self._data = dict()
+        self._seeded = OrderedDict()
+        self._max_seeded = max_seeded
+        self._lock = threading.Lock()
+
+    def get(
+        self, backend_options: dict[str, Any] | None = None, seed: int | None = None
+    ) -> tuple[BackendKey, AerSimulator, Sampler]:
+        """
+        Get the backend key, the simulator and the sampler for the given backend
+        options and (optional) seed, creating them only on the first request.
+        """
+
+        key = backend_key(backend_options)
+
+        with self._lock:
+            if key not in self._data:
+                backend = AerSimulator(**(backend_options or dict()))
+                self._data[key] = (backend, Sampler.from_backend(backend))
+
+            backend, sampler = self._data[key]
+
+            if seed is not None:
+                if (key, seed) not in self._seeded:
+                    self._seeded[(key, seed)] = Sampler.from_backend(backend, seed=seed)
+
+                self._seeded.move_to_end((key, seed))
+                sampler = self._seeded[(key, seed)]
+
+                while len(self._seeded) > self._max_seeded:
+                    self._seeded.popitem(last=False)
+
+        return key, backend, sampler
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._seeded.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, backend_options: dict[str, Any] | None) -> bool:
+        key = backend_key(backend_options)
+
+        with self._lock:
+            return key in self._data
+
+
+class TranspileCache:
+    """
+    Least recently used (LRU) cache for transpiled circuits. Keys are the circuit
+    structure hash together with the backend key, so the same circuit transpiled
+    to differently configured backends are kept apart.
+    """
+
+    _data: OrderedDict[tuple[str, BackendKey], QuantumCircuit]
+    _maxsize: int
+    _hits: int
+    _misses: int
+    _lock: threading.Lock
+
+    def __init__(self, maxsize: int = 128):
+        self._data = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get(self, key: tuple[str, BackendKey]) -> QuantumCircuit | None:
+        with self._lock:
+            if key in self._data:
+                self._hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+
+            self._misses += 1
+            return None
+
+    def put(self, key: tuple[str, BackendKey], tcirc: QuantumCircuit) -> None:
+        with self._lock:
+            self._data[key] = tcirc
+            self._data.move_to_end(key)
+
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: tuple[str, BackendKey]) -> bool:
+        with self._lock:
+            return key in self._data
+
+
+backend_pool = BackendPool()
+transpile_cache = TranspileCache()
+
+# worker threads for asynchronous execution; created on the first submission
+_async_executor: ThreadPoolExecutor | None = None
+_async_executor_lock = threading.Lock()
+
+
+def async_executor() -> ThreadPoolExecutor:
+    """Thread pool used by `submit_program` to run quantum programs in the background."""
+
+    global _async_executor
+
+    with _async_executor_lock:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(thread_name_prefix="hhat-qexec")
+
+    return _async_executor
+
+
+# worker processes for shot sharding; a single pool, grown to the largest request
+_shard_executor: ProcessPoolExecutor | None = None
+_shard_executor_workers: int = 0
+_shard_executor_lock = threading.Lock()
+
+
+def _submit_shards(
+    workers: int, fn: Callable, shards_args: list[tuple[Any, ...]]
+) -> list[Future]:
+    """
+    Submit the shards to the process pool used by `sample_circuit_sharded`, kept alive
+    to stay warm. If more workers are requested than the pool has, the old pool is shut
+    down (its running shards still finish) and a larger one replaces it. Workers are
+    spawned instead of forked, since the simulator keeps threads that are not safe to fork.
+    """
+
+    global _shard_executor, _shard_executor_workers
+
+    with _shard_executor_lock:
+        if _shard_executor is None or workers > _shard_executor_workers:
+            if _shard_executor is not None:
+                _shard_executor.shutdown(wait=False)
+
+            _shard_executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _shard_executor_workers = workers
+
+        return [_shard_executor.submit(fn, *args) for args in shards_args]
+
+
+@atexit.register
+def shutdown_shard_executor() -> None:
+    """Shut down the shot sharding process pool, if there is one."""
+
+    global _shard_executor, _shard_executor_workers
+
+    with _shard_executor_lock:
+        if _shard_executor is not None:
+            _shard_executor.shutdown(wait=True)
+            _shard_executor = None
+            _shard_executor_workers = 0
+
 
 def load_qasm(code: str) -> QuantumCircuit:
     return qasm2.loads(code)
 
 
+def transpile_circuits(
+    circuits: list[QuantumCircuit], backend: AerSimulator, key: BackendKey
+) -> list[QuantumCircuit]:
+    """
+    Transpile the circuits to the backend, reusing cached results whenever possible.
+    Circuits missing from the cache are transpiled together in a single call.
+    """
+
+    cache_keys = tuple((circuit_hash(circ), key) for circ in circuits)
+    tcircs: list[QuantumCircuit | None] = [transpile_cache.get(k) for k in cache_keys]
+
+    # identical circuits missing from the cache are transpiled only once
+    missing: dict[tuple[str, BackendKey], int] = dict()
+
+    for n, tcirc in enumerate(tcircs):
+        if tcirc is None:
+            missing.setdefault(cache_keys[n], n)
+
+    if missing:
+        new_tcircs = transpile([circuits[n] for n in missing.values()], backend=backend)
+
+        transpiled = dict(zip(missing, new_tcircs))
+
+        for cache_key, tcirc in transpiled.items():
+            transpile_cache.put(cache_key, tcirc)
+
+        tcircs = [
+            transpiled[k] if tcirc is None else tcirc
+            for k, tcirc in zip(cache_keys, tcircs)
+        ]
+
+    return tcircs
+
+
+def transpile_circuit(
+    circuit: QuantumCircuit, backend: AerSimulator, key: BackendKey
+) -> QuantumCircuit:
+    """Transpile the circuit to the backend, reusing a cached result if there is one."""
+
+    return transpile_circuits([circuit], backend, key)[0]
+
+
+def default_shots(circuit: QuantumCircuit) -> int:
+    """Shots budget when the metadata does not give the number of shots."""
+
+    return len(circuit.qregs) * 888
+
+
+def converged_distribution(counts: Counts, tol: float, z: float) -> bool:
+    """
+    The outcome distribution has converged when the confidence interval half-width
+    of every observed outcome frequency is smaller than `tol`.
+    """
+
+    total = counts.shots
+    freqs = counts.freqs / total
+    return bool(np.all(z * np.sqrt(freqs * (1 - freqs) / total) < tol))
+
+
+def converged_majority(counts: Counts, tol: float, z: float) -> bool:
+    """
+    The majority outcome has converged when its lead over the runner-up is larger
+    than `tol` and than the confidence bound of the difference between both counts.
+    """
+
+    total = counts.shots
+    first, second, *_ = sorted(counts.freqs.tolist(), reverse=True) + [0]
+    margin = (first - second) / total
+    return margin > tol and margin > z * math.sqrt(first + second) / total
+
+
+CONVERGENCE_STATISTICS: dict[str, Callable[[Counts, float, float], bool]] = {
+    "distribution": converged_distribution,
+    "majority": converged_majority,
+}
+"""
+Statistics available for adaptive sampling. Each one receives the accumulated counts,
+the tolerance and the confidence z-score, and tells whether sampling can stop.
+"""
+
+DEFAULT_ADAPTIVE: dict[str, Any] = {
+    "statistic": "distribution",
+    "tol": 0.03,
+    "z": 2.0,
+    "round_shots": 111,
+    "max_shots": None,
+}
+"""
+Default adaptive sampling options. `max_shots` set to `None` means the default shots
+budget (`default_shots`).
+"""
+
+
+def sample_adaptive(
+    tcirc: QuantumCircuit,
+    qdata: str | WorkingData,
+    max_shots: int,
+    metadata: dict[str, Any],
+) -> Any | ErrorHandler:
+    """
+    Sample the transpiled circuit in rounds of `round_shots`, stopping when the chosen
+    statistic has converged within the tolerance or when the shots budget is reached.
+    Easy circuits (e.g. deterministic ones) stop after the first round. Each round gets
+    its own seed derived from the root `seed` in the metadata, if any.
+    """
+
+    options = DEFAULT_ADAPTIVE | (metadata.get("adaptive", None) or dict())
+    converged = CONVERGENCE_STATISTICS[options["statistic"]]
+    max_shots = options["max_shots"] or max_shots
+    round_shots = min(options["round_shots"], max_shots)
+
+    root_seed = metadata.get("seed", None)
+    seeds = np.random.SeedSequence(root_seed) if root_seed is not None else None
+    backend_options = metadata.get("backend_options", None)
+
+    counts: Counts | None = None
+    total = 0
+
+    while total < max_shots:
+        seed = None if seeds is None else int(seeds.spawn(1)[0].generate_state(1)[0])
+        _, _, sample = backend_pool.get(backend_options, seed)
+
+        n_shots = min(round_shots, max_shots - total)
+        job_res = sample.run([tcirc], shots=n_shots).result()
+
+        if not job_res or (res := pub_counts(job_res[0])) is None:
+            return InvalidQuantumComputedResult(qdata)
+
+        counts = res if counts is None else counts.merge(res)
+        total += n_shots
+
+        if converged(counts, options["tol"], options["z"]):
+            break
+
+    return counts
+
+
+def pub_counts(pub_res: PubResult) -> Counts | None:
+    """
+    Retrieve the counts from a sampler pub result, if there is any. The packed bytes
+    of the per-shot bits are turned into `Counts` directly, without going through
+    bitstrings.
+    """
+
+    databin: DataBin = pub_res.data
+    bits = getattr(databin, "c", None) or getattr(databin, "meas", None)
+
+    if bits is None:
+        return None
+
+    # bytes are big-endian: the last byte holds clbits 0 to 7, lowest bit first
+    unpacked = np.unpackbits(bits.array[:, ::-1], axis=1, bitorder="little")
+    return Counts.from_memory(unpacked[:, : bits.num_bits])
+
+
 def sample_circuit(
     circuit: QuantumCircuit,
-    qdata: str | Symbol,
+    qdata: str | WorkingData,
     metadata: dict[str, Any] | None = None,
 ) -> Any | ErrorHandler:
     """
     Generate the counts from a given qdata containing instructions turned into a circuit.
+
+    If the metadata does not give the number of `shots`, the shots are allocated
+    adaptively (see `sample_adaptive`), using the `adaptive` metadata options and
+    the `default_shots` as budget. Set `adaptive` to `False` to always use the whole
+    budget instead.
     """
 
     metadata = metadata or dict()
 
     # this should be replaced by a config backend, not a hardcoded one
-    backend = AerSimulator()
-    tcirc = transpile(circuit, backend=backend)
+    key, backend, sample = backend_pool.get(
+        metadata.get("backend_options", None), metadata.get("seed", None)
+    )
+    tcirc = transpile_circuit(circuit, backend, key)
+
+    if not (n_shots := metadata.get("shots", None)):
+
+        if metadata.get("adaptive", True) is not False:
+            return sample_adaptive(tcirc, qdata, default_shots(circuit), metadata)
+
+        n_shots = default_shots(circuit)
 
-    sample = Sampler()
-    n_shots = metadata.get("shots", None) or (len(circuit.qregs) * 888)
     job = sample.run([tcirc], shots=n_shots)
 
     job_res = job.result()
 
-    if job_res:
-        pub_res: PubResult = job_res[0]
-        databin: DataBin = pub_res.data
-        res = (
-            getattr(databin, "c", None) or getattr(databin, "meas", None)
-        ).get_counts()
+    if job_res and (res := pub_counts(job_res[0])) is not None:
         return res
 
     # job_res is None, then something went wrong
     return InvalidQuantumComputedResult(qdata)
 
 
+def sample_circuits(
+    circuits: list[QuantumCircuit],
+    qdatas: list[str | WorkingData],
+    shots: list[int | None],
+    metadata: dict[str, Any] | None = None,
+) -> list[Any | ErrorHandler]:
+    """
+    Generate the counts for many circuits at once. All the circuits are transpiled
+    together and submitted as a single sampler job with one pub per circuit. The pub
+    results are then split back in the same order as the circuits were given.
+    """
+
+    metadata = metadata or dict()
+
+    key, backend, sample = backend_pool.get(metadata.get("backend_options", None))
+    tcircs = transpile_circuits(circuits, backend, key)
+
+    pubs = [
+        (tcirc, None, n_shots or default_shots(circ))
+        for circ, tcirc, n_shots in zip(circuits, tcircs, shots)
+    ]
+    job_res = sample.run(pubs).result()
+
+    if job_res and len(job_res) == len(pubs):
+        return [
+            InvalidQuantumComputedResult(qdata) if res is None else res
+            for qdata, res in zip(qdatas, map(pub_counts, job_res))
+        ]
+
+    # job_res is None or incomplete, then something went wrong
+    return [InvalidQuantumComputedResult(qdata) for qdata in qdatas]
+
+
+def shard_shots(shots: int, num_shards: int) -> list[int]:
+    """Split the shots as evenly as possible into at most `num_shards` shards."""
+
+    num_shards = max(1, min(num_shards, shots))
+    quotient, remainder = divmod(shots, num_shards)
+    return [quotient + (1 if n < remainder else 0) for n in range(num_shards)]
+
+
+def shard_seeds(root_seed: int | None, num_shards: int) -> list[int]:
+    """
+    Derive independent seeds for each shard from a root seed. The same root seed
+    always produces the same shard seeds, so sharded executions are reproducible.
+    """
+
+    return [
+        int(seq.generate_state(1)[0])
+        for seq in np.random.SeedSequence(root_seed).spawn(num_shards)
+    ]
+
+
+def _sample_shard(
+    code: str,
+    qdata: str | WorkingData,
+    shots: int,
+    seed: int,
+    backend_options: dict[str, Any] | None,
+) -> Any | ErrorHandler:
+    """Worker function for a single shard; it runs inside the process pool."""
+
+    return sample_circuit(
+        load_qasm(code),
+        qdata=qdata,
+        metadata={"shots": shots, "seed": seed, "backend_options": backend_options},
+    )
+
+
+def check_workers(workers: Any) -> int:
+    """Validate the number of workers requested for shot sharding."""
+
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        raise ValueError(f"'workers' must be a positive integer, got {workers!r}.")
+
+    return workers
+
+
+def sample_circuit_sharded(
+    code: str,
+    qdata: str | WorkingData,
+    metadata: dict[str, Any] | None = None,
+) -> Any | ErrorHandler:
+    """
+    Generate the counts by splitting the shots across a process pool. Each worker
+    samples its own shard with an independent seed derived from the root `seed` in
+    the metadata, and the shards counts are merged at the end. If any shard fails,
+    its error is returned.
+
+    Metadata keys: `workers` (number of processes), `shots`, `seed` (root seed) and
+    `backend_options`.
+    """
+
+    metadata = metadata or dict()
+    workers = check_workers(metadata.get("workers", 1))
+    n_shots = metadata.get("shots", None) or default_shots(load_qasm(code))
+
+    shots = shard_shots(n_shots, workers)
+    seeds = shard_seeds(metadata.get("seed", None), len(shots))
+    backend_options = metadata.get("backend_options", None)
+
+    futures = _submit_shards(
+        workers,
+        _sample_shard,
+        [
+            (code, qdata, shard, seed, backend_options)
+            for shard, seed in zip(shots, seeds)
+        ],
+    )
+
+    counts: Counts | None = None
+
+    for future in futures:
+        match res := future.result():
+            case ErrorHandler():
+                return res
+
+            case _:
+                counts = res if counts is None else counts.merge(res)
+
+    if counts is None or counts.shots != n_shots:
+        return InvalidQuantumComputedResult(qdata)
+
+    return counts
+
+
 def execute_program(
-    code: str, qdata: str | WorkingData, debug: bool = False
+    code: str,
+    qdata: str | WorkingData,
+    debug: bool = False,
+    metadata: dict[str, Any] | None = None,
 ) -> Any | ErrorHandler:
     """
     Execute the quantum program from a quantum data `qdata`. First, it is passed as a
     string of code as a plain OpenQASM v2.0 code, then transformed into a qiskit's
     QuantumCircuit to be executed on a sampler instance to retrieve the bitstring
     distribution or an error.
+
+    If `metadata` has `workers` greater than 1, the shots are sharded across that
+    many processes (see `sample_circuit_sharded`).
     """
 
-    circ = load_qasm(code)
-    res = sample_circuit(circ, qdata)
+    metadata = metadata or dict()
+
+    if check_workers(metadata.get("workers", 1)) > 1:
+        res = sample_circuit_sharded(code, qdata, metadata)
+
+    else:
+        res = sample_circuit(load_qasm(code), qdata, metadata)
 
     match res:
 
@@ -80,3 +623,47 @@ def execute_program(
                 print(res)
 
             return res
+
+
+def execute_programs(
+    jobs: Sequence[tuple[str, str | WorkingData, int | None]],
+    debug: bool = False,
+    metadata: dict[str, Any] | None = None,
+) -> list[Any | ErrorHandler]:
+    """
+    Execute many quantum programs at once. Each job is a tuple with the OpenQASM v2.0
+    code, the quantum data `qdata` it came from and the number of shots (`None` to
+    use the default). All the programs are submitted as a single batch to amortize
+    the per-job overhead, and each one gets back its own bitstring distribution or
+    error, in the same order as the jobs. The `metadata` (e.g. `backend_options`)
+    applies to the whole batch.
+    """
+
+    if not jobs:
+        return []
+
+    codes, qdatas, shots = zip(*jobs)
+    circs = [load_qasm(code) for code in codes]
+    res = sample_circuits(circs, list(qdatas), list(shots), metadata)
+
+    if debug:
+        for qdata, counts in zip(qdatas, res):
+            print(f"{qdata}: {counts}")
+
+    return res
+
+
+def submit_program(
+    code: str,
+    qdata: str | WorkingData,
+    debug: bool = False,
+    metadata: dict[str, Any] | None = None,
+) -> Future:
+    """
+    Submit the quantum program from a quantum data `qdata` to be executed in the
+    background. It returns immediately with a `Future` as a handle for the pending
+    bitstring distribution (or error), so the caller only waits for it when calling
+    `result()` on the handle. Many programs can be in flight at the same time.
+    """
+
+    return async_executor().submit(execute_program, code, qdata, debug, metadata)
@@ -0,0 +1,105 @@
+"""When using `hat run` on terminal, should call this file"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+from pathlib import Path
+from typing import Any
+
+from hhat_lang.core.code.hatc import (
+    HATC_SUFFIX,
+    dump_ir,
+    load_ir,
+    source_digest,
+)
+from hhat_lang.core.code.ir import BaseIR
+from hhat_lang.core.error_handlers.errors import ErrorHandler
+from hhat_lang.core.memory.core import MemoryManager
+from hhat_lang.dialects.heather.code.ir_builder import build_main
+from hhat_lang.dialects.heather.interpreter.classical.executor import Evaluator
+from hhat_lang.dialects.heather.parsing.run import parse
+from hhat_lang.toolchain.project.utils import str_to_path
+
+###################
+# COMPILE SOURCES #
+###################
+
+
+def artifact_path(source_file: str | Path, cache_dir: str | Path | None = None) -> Path:
+    """
+    Where the compiled IR artifact of `source_file` lies: next to it (`main.hat` gives
+    `main.hatc`), or in `cache_dir`, named after the source path so sources with the
+    same name do not clash.
+    """
+
+    source_file = str_to_path(source_file)
+
+    if cache_dir is None:
+        return source_file.with_suffix(HATC_SUFFIX)
+
+    path_digest = hashlib.sha256(str(source_file).encode()).hexdigest()[:16]
+    return str_to_path(cache_dir) / f"{source_file.stem}-{path_digest}{HATC_SUFFIX}"
+
+
+def compile_file(
+    source_file: str | Path,
+    cache_dir: str | Path | None = None,
+    use_cache: bool = True,
+) -> BaseIR | ErrorHandler:
+    """
+    Compile the source file into IR. With `use_cache`, the IR is loaded from its
+    artifact (see `artifact_path`) when it comes from the same source and compiler,
+    skipping parsing and IR building; otherwise it is compiled and the artifact is
+    written for the next time.
+    """
+
+    source_file = str_to_path(source_file)
+    code = source_file.read_bytes()
+    digest = source_digest(code)
+    hatc_file = artifact_path(source_file, cache_dir)
+
+    if use_cache and hatc_file.exists():
+        if (cached := load_ir(hatc_file.read_bytes(), digest)) is not None:
+            return cached
+
+    match ir := build_main(parse(code.decode())):
+        case ErrorHandler():
+            return ir
+
+    if use_cache:
+        try:
+            hatc_file.parent.mkdir(parents=True, exist_ok=True)
+            hatc_file.write_bytes(dump_ir(ir, digest))
+
+        except (OSError, RecursionError, pickle.PicklingError):
+            # the artifact is only a cache; the compiled IR is still good
+            pass
+
+    return ir
+
+
+###############
+# RUN PROJECT #
+###############
+
+
+def run_project(
+    project_name: str | Path,
+    max_num_index: int,
+    cache_dir: str | Path | None = None,
+    use_cache: bool = True,
+) -> Any:
+    """
+    Run the project `main.hat`, compiled through the artifacts cache (see
+    `compile_file`), with up to `max_num_index` quantum indexes.
+    """
+
+    project_name = str_to_path(project_name)
+
+    match ir := compile_file(project_name / "src" / "main.hat", cache_dir, use_cache):
+        case ErrorHandler():
+            return ir
+
+    evaluator = Evaluator(MemoryManager(max_num_index), ir.types, ir.fns)
+    return evaluator.run(ir.main)
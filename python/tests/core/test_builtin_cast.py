@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from hhat_lang.core.error_handlers.errors import (
+    CastIntOverflowError,
+    CastNegToUnsignedError,
+)
+from hhat_lang.core.execution.counts import Counts
+from hhat_lang.core.types.builtin_base import BuiltinSingleDS
+from hhat_lang.core.types.builtin_cast import cast_counts, cast_values
+from hhat_lang.core.types.builtin_types import U16, U32, U64, Bool, Int
+
+
+@pytest.mark.parametrize(
+    "ds,dtype", [(U16, np.uint16), (U32, np.uint32), (U64, np.uint64), (Int, np.int64)]
+)
+def test_cast_values(ds: BuiltinSingleDS, dtype: type) -> None:
+    res = cast_values(ds, np.array([0, 3, 65535], dtype=np.uint64))
+
+    assert res.dtype == dtype and res.tolist() == [0, 3, 65535]
+
+
+def test_cast_values_errors() -> None:
+    assert isinstance(
+        cast_values(U16, np.array([1, 1 << 16], dtype=np.uint64)), CastIntOverflowError
+    )
+    assert isinstance(
+        cast_values(U32, np.array([1, -2], dtype=np.int64)), CastNegToUnsignedError
+    )
+    assert isinstance(
+        cast_values(Int, np.array([1 << 63], dtype=np.uint64)), CastIntOverflowError
+    )
+    assert isinstance(cast_values(Bool, np.array([0, 2])), CastIntOverflowError)
+    assert cast_values(Bool, np.array([0, 1])).tolist() == [False, True]
+
+
+def test_cast_counts() -> None:
+    counts = Counts.from_dict({"011": 5, "110": 7})
+    values, freqs = cast_counts(U32, counts)
+
+    assert dict(zip(values.tolist(), freqs.tolist())) == {3: 5, 6: 7}
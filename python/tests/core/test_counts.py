@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import numpy as np
+from hhat_lang.core.execution.counts import Counts, pack_bits, unpack_bits
+
+
+def test_counts_from_memory() -> None:
+    memory = np.array([[1, 0, 0], [1, 0, 0], [0, 1, 1]], dtype=np.uint8)
+    counts = Counts.from_memory(memory)
+
+    assert counts == {"001": 2, "110": 1}
+    assert counts["001"] == 2 and "111" not in counts
+    assert sorted(counts.as_ints().tolist()) == [1, 6]
+    assert counts.shots == 3 and not counts.is_exact
+    assert counts.marginal([1, 2]) == {"00": 2, "11": 1}
+
+
+def test_counts_merge_and_from_dict() -> None:
+    first = Counts.from_dict({"01": 3, "10": 1})
+    second = Counts.from_dict({"10": 2, "11": 4})
+
+    assert first.merge(second) == {"01": 3, "10": 3, "11": 4}
+
+
+def test_counts_wide_outcomes() -> None:
+    rng = np.random.default_rng(0)
+    memory = rng.integers(0, 2, size=(50, 130), dtype=np.uint8)
+
+    assert np.array_equal(unpack_bits(pack_bits(memory), 130), memory)
+
+    counts = Counts.from_memory(memory)
+    key = "".join(str(b) for b in memory[0, ::-1])
+
+    assert counts.outcomes.shape[1] == 3 and counts[key] >= 1
+
+
+def test_counts_many_distinct_outcomes() -> None:
+    n = 20
+    outcomes = np.arange(1 << n, dtype=np.uint64)
+    memory = ((outcomes[:, None] >> np.arange(n, dtype=np.uint64)) & 1).astype(np.uint8)
+    counts = Counts.from_memory(memory)
+
+    assert len(counts) == 1 << n and counts.shots == 1 << n
+    assert np.array_equal(np.sort(counts.as_ints()), outcomes)
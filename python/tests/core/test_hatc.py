@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import hhat_lang.core  # noqa: F401
+from hhat_lang.core.code.hatc import dump_ir, load_ir, source_digest
+from hhat_lang.core.code.ir import InstrIRFlag
+from hhat_lang.core.data.core import CoreLiteral, Symbol
+from hhat_lang.core.types.builtin_types import U32
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import (
+    IR,
+    IRArgs,
+    IRBlock,
+    IRInstr,
+)
+
+
+def test_dump_load_ir() -> None:
+    ir = IR()
+    ir.add_type(U32.name, U32)
+    ir.add_fn(
+        fn_name=Symbol("f"),
+        fn_type=Symbol("u32"),
+        fn_args=((Symbol("a"), Symbol("u32")),),
+        body=IRBlock(IRInstr(Symbol("g"), IRArgs(Symbol("a")), InstrIRFlag.CALL)),
+    )
+    ir.add_body(
+        (
+            IRInstr(
+                Symbol("x"),
+                IRArgs(Symbol("u32"), CoreLiteral("1", "u32")),
+                InstrIRFlag.DECLARE_ASSIGN,
+            ),
+        )
+    )
+
+    digest = source_digest("main { x:u32 = 1 }")
+    data = dump_ir(ir, digest, compiler="1.0")
+    assert data.startswith(b"HATC")
+
+    loaded = load_ir(data, digest, compiler="1.0")
+    assert isinstance(loaded, IR)
+    assert Symbol("u32") in loaded.types
+    assert loaded.fns.resolve(Symbol("f"), (Symbol("u32"),)) == (
+        Symbol("f"),
+        Symbol("u32"),
+        ((Symbol("a"), Symbol("u32")),),
+    )
+    (instr,) = list(loaded.main)
+    assert instr.name == Symbol("x")
+    assert list(instr.args) == [Symbol("u32"), CoreLiteral("1", "u32")]
+
+    # other source, other compiler, corrupted or truncated artifacts are misses
+    assert load_ir(data, source_digest("main {}"), compiler="1.0") is None
+    assert load_ir(data, digest, compiler="1.1") is None
+    assert load_ir(data[:-8], digest, compiler="1.0") is None
+    assert load_ir(data[:10], digest, compiler="1.0") is None
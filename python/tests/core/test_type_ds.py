@@ -2,14 +2,19 @@ from __future__ import annotations
 
 from collections import OrderedDict
 
+from hhat_lang.core.code.ir import TypeIR
 from hhat_lang.core.data.core import CoreLiteral, Symbol
 from hhat_lang.core.error_handlers.errors import (
     TypeAndMemberNoMatchError,
+    TypeCyclicDefinitionError,
     TypeQuantumOnClassicalError,
+    TypeUnknownMemberTypeError,
     VariableWrongMemberError,
 )
-from hhat_lang.core.types.builtin_types import QU3, U32
+from hhat_lang.core.types import POINTER_SIZE
+from hhat_lang.core.types.builtin_types import QU2, QU3, U32, U64
 from hhat_lang.core.types.core import SingleDS, StructDS
+from hhat_lang.core.types.resolve_sizes import ct_qsize, ct_size
 
 # TODO: refactor the types to use `BuiltinSingleDS` or respective data
 #  types so properties can be compared and addressed properly.
@@ -88,3 +93,92 @@ def test_struct_ds_quantum() -> None:
 def test_struct_ds_quantum_wrong() -> None:
     qtype = StructDS(name=Symbol("@type"))
     assert isinstance(qtype.add_member(QU3, Symbol("data")), TypeAndMemberNoMatchError)
+
+
+def test_ct_qsize_and_size_memoized() -> None:
+    types = TypeIR()
+
+    for builtin in (QU2, QU3, U32, U64):
+        types.push(builtin)
+
+    inner = StructDS(Symbol("@inner"))
+    inner.add_member(QU2, Symbol("@a"))
+    inner.add_member(QU3, Symbol("@b"))
+    inner.add_member(U32, Symbol("c"))
+    types.push(inner)
+
+    outer = StructDS(Symbol("@outer"))
+    outer.add_member(inner, Symbol("@x"))
+    outer.add_member(inner, Symbol("@y"))
+    outer.add_member(U64, Symbol("z"))
+    types.push(outer)
+
+    cache: dict = dict()
+    assert ct_qsize(outer, types.table, cache) == 10
+    assert cache[Symbol("@inner")] == 5
+
+    # quantum members are held by pointers
+    assert ct_size(outer, types.table) == 2 * (POINTER_SIZE * 2 + 32) + 64
+
+
+def test_type_ir_finalize_layouts() -> None:
+    types = TypeIR()
+
+    for builtin in (QU2, QU3, U32, U64):
+        types.push(builtin)
+
+    inner = StructDS(Symbol("@inner"))
+    inner.add_member(QU2, Symbol("@a"))
+    inner.add_member(U32, Symbol("c"))
+    inner.add_member(QU3, Symbol("@b"))
+
+    outer = StructDS(Symbol("@outer"))
+    outer.add_member(U64, Symbol("z"))
+    outer.add_member(inner, Symbol("@x"))
+    outer.add_member(inner, Symbol("@y"))
+
+    # pushed before its member type, so resolution does not follow the table order
+    types.push(outer)
+    types.push(inner)
+
+    assert not types.is_finalized
+    assert types.finalize() is None
+    assert types.is_finalized
+
+    inner_layout = types.layout(Symbol("@inner"))
+    assert inner_layout.qsize == 5
+    assert inner_layout.offsets == {
+        Symbol("@a"): 0,
+        Symbol("c"): POINTER_SIZE,
+        Symbol("@b"): POINTER_SIZE + 32,
+    }
+    assert inner_layout.qoffsets == {Symbol("@a"): 0, Symbol("@b"): 2}
+
+    outer_layout = types.layout(Symbol("@outer"))
+    assert outer_layout.size == ct_size(outer, types.table)
+    assert outer_layout.qsize == 10
+    assert outer_layout.offsets[Symbol("@y")] == 64 + inner_layout.size
+    assert outer_layout.qoffsets == {Symbol("@x"): 0, Symbol("@y"): 5}
+
+    types.push(StructDS(Symbol("other")))
+    assert not types.is_finalized
+
+
+def test_type_ir_finalize_errors() -> None:
+    types = TypeIR()
+    types.push(U32)
+
+    first = StructDS(Symbol("first"))
+    second = StructDS(Symbol("second"))
+    first.add_member(U32, Symbol("a"))
+    first.add_member(second, Symbol("b"))
+    second.add_member(first, Symbol("c"))
+    types.push(first)
+
+    assert isinstance(types.finalize(), TypeUnknownMemberTypeError)
+
+    types.push(second)
+    err = types.finalize()
+    assert isinstance(err, TypeCyclicDefinitionError)
+    assert "first -> second -> first" in err()
+    assert not types.is_finalized
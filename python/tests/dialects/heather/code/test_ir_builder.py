@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hhat_lang.core  # noqa: F401
+import pytest
+from hhat_lang.core.code.ir import InstrIRFlag
+from hhat_lang.core.data.core import CompositeSymbol, CoreLiteral, Symbol
+from hhat_lang.core.error_handlers.errors import TypeUnknownMemberTypeError
+from hhat_lang.dialects.heather.code.ast import (
+    ArgTypePair,
+    ArgValuePair,
+    Body,
+    Call,
+    CallArgs,
+    CompositeId,
+    DeclareAssign,
+    Expr,
+    FnArgs,
+    FnDef,
+    Id,
+    Literal,
+    Main,
+    ModifiedId,
+    Modifier,
+    OnlyValue,
+    Program,
+    TypeDef,
+    TypeMember,
+)
+from hhat_lang.dialects.heather.code.ir_builder import build_main
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IR, IRInstr
+
+
+def program(*code: TypeDef | FnDef | Main) -> Program:
+    prog = Program(main=None, imports=None)
+    prog._value = code
+    return prog
+
+
+def test_build_main() -> None:
+    point = TypeDef(
+        TypeMember(Id("x"), Id("u32")),
+        TypeMember(Id("y"), Id("u32")),
+        type_name=Id("point"),
+        type_ds=Id("struct"),
+    )
+    fn = FnDef(
+        Id("sum"),
+        Id("u64"),
+        FnArgs(ArgTypePair(Id("a"), Id("u64")), ArgTypePair(Id("b"), Id("u64"))),
+        Body(Call(Id("add"), CallArgs(OnlyValue(Id("a")), OnlyValue(Id("b"))))),
+    )
+    main = Main(
+        DeclareAssign(
+            Id("p"),
+            Id("point"),
+            Expr(
+                Call(
+                    Id("point"),
+                    CallArgs(
+                        ArgValuePair(Id("x"), Literal("1", "u32")),
+                        ArgValuePair(Id("y"), Literal("2", "u32")),
+                    ),
+                )
+            ),
+        ),
+        Call(Id("print"), CallArgs(OnlyValue(CompositeId(Id("p"), Id("x"))))),
+    )
+
+    ir = build_main(program(point, fn, main))
+    assert isinstance(ir, IR)
+
+    assert Symbol("point") in ir.types
+    assert ir.types.layout(Symbol("point")).offsets == {Symbol("x"): 0, Symbol("y"): 32}
+
+    u64 = Symbol("u64")
+    assert ir.fns.resolve(Symbol("sum"), (u64, u64)) == (
+        Symbol("sum"),
+        u64,
+        ((Symbol("a"), u64), (Symbol("b"), u64)),
+    )
+
+    declare, call = list(ir.main)
+    assert declare.flag == InstrIRFlag.DECLARE_ASSIGN
+    assert declare.name == Symbol("p")
+    point_type, point_call = list(declare.args)
+    assert point_type == Symbol("point")
+    assert isinstance(point_call, IRInstr)
+    assert list(point_call.args) == [
+        (Symbol("x"), CoreLiteral("1", "u32")),
+        (Symbol("y"), CoreLiteral("2", "u32")),
+    ]
+
+    assert call.flag == InstrIRFlag.CALL
+    assert list(call.args) == [CompositeSymbol(("p", "x"))]
+
+
+def test_build_main_deep_and_errors() -> None:
+    # deeper than the recursion limit
+    expr = Call(Id("f"), CallArgs())
+
+    for _ in range(5000):
+        expr = Call(Id("f"), CallArgs(OnlyValue(expr)))
+
+    ir = build_main(program(Main(expr)))
+    assert isinstance(ir, IR)
+
+    unknown = TypeDef(
+        TypeMember(Id("x"), Id("nope")), type_name=Id("bad"), type_ds=Id("struct")
+    )
+    assert isinstance(build_main(program(unknown)), TypeUnknownMemberTypeError)
+
+    with pytest.raises(NotImplementedError):
+        build_main(program(Main(ModifiedId(Id("x"), Modifier()))))
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+from hhat_lang.core.code.ir import BodyIR, InstrIRFlag
+from hhat_lang.core.data.core import Symbol
+from hhat_lang.core.error_handlers.errors import (
+    FnNotFoundError,
+    FnOverloadConflictError,
+)
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import (
+    IR,
+    FnIR,
+    IRArgs,
+    IRBlock,
+    IRBlockBuilder,
+    IRInstr,
+)
+
+
+def test_fnir_overloads() -> None:
+    fns = FnIR()
+    add, u32, u64 = Symbol("add"), Symbol("u32"), Symbol("u64")
+    a, b = Symbol("a"), Symbol("b")
+
+    assert fns.push(add, u32, ((a, u32), (b, u32)), BodyIR()) is None
+    assert fns.push(add, u64, ((a, u64), (b, u64)), BodyIR()) is None
+    assert fns.push(add, u64, (u64,), BodyIR()) is None
+
+    assert add in fns
+    assert (add, u64, (u64,)) in fns
+    assert len(fns[add]) == 3
+    assert len(fns.table) == 3
+
+    assert fns.resolve(add, (u32, u32)) == (add, u32, ((a, u32), (b, u32)))
+    assert fns.resolve(add, (u64,)) == (add, u64, (u64,))
+
+    # name and type pairs in any order
+    assert fns.resolve(add, ((b, u64), (a, u64))) == (add, u64, ((a, u64), (b, u64)))
+
+    assert isinstance(fns.resolve(add, (u32,)), FnNotFoundError)
+    assert isinstance(fns.resolve(Symbol("sub"), (u32,)), FnNotFoundError)
+    assert isinstance(fns.push(add, u32, (u64,), BodyIR()), FnOverloadConflictError)
+
+    with pytest.raises(ValueError):
+        fns[add] = BodyIR()  # type: ignore[assignment]
+
+
+def test_fnir_call_site_cache() -> None:
+    fns = FnIR()
+    add, u32 = Symbol("add"), Symbol("u32")
+    header = (add, u32, (u32, u32))
+    fns[header] = BodyIR()
+    call = IRInstr(add, IRArgs(u32, u32), InstrIRFlag.CALL)
+
+    assert fns.resolve(add, (u32, u32), call_site=call) == header
+    assert fns._call_cache[call] == ((u32, u32), header)
+
+    # the index is not read again for the same call site and arguments
+    fns._index.clear()
+    assert fns.resolve(add, (u32, u32), call_site=call) == header
+    assert isinstance(fns.resolve(add, (u32,), call_site=call), FnNotFoundError)
+
+
+def test_ir_add_fn() -> None:
+    ir = IR()
+    block = IRBlock()
+    assert (
+        ir.add_fn(fn_name=Symbol("f"), fn_type=Symbol("u32"), fn_args=(), body=block)
+        is None
+    )
+    assert ir.fns.resolve(Symbol("f"), ()) == (Symbol("f"), Symbol("u32"), ())
+    assert list(ir.fns.get((Symbol("f"), Symbol("u32"), ()))) == [block]
+
+
+def test_irblock_builder() -> None:
+    instrs = [IRInstr(Symbol(f"f{k}"), IRArgs(), InstrIRFlag.CALL) for k in range(1000)]
+    builder = IRBlockBuilder()
+
+    for instr in instrs:
+        builder.add_instr(instr)
+
+    assert len(builder) == 1000
+    block = builder.freeze()
+    assert isinstance(block, IRBlock)
+    assert list(block) == instrs
+    assert builder.is_frozen
+
+    with pytest.raises(ValueError):
+        builder.add_instr(instrs[0])
+
+    with pytest.raises(ValueError):
+        builder.freeze()
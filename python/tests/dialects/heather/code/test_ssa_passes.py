@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import pytest
+
+import hhat_lang.core  # noqa: F401, import cycle if the IR module goes first
+from hhat_lang.core.code.ir import InstrIRFlag
+from hhat_lang.core.data.core import CoreLiteral, Symbol
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IRArgs, IRInstr
+from hhat_lang.dialects.heather.code.ssa_ir_builder.builder import build_ssa
+from hhat_lang.dialects.heather.code.ssa_ir_builder.ir import (
+    SSA_COPY,
+    SSA_PHI,
+    IRVar,
+    SSAInstr,
+)
+from hhat_lang.dialects.heather.code.ssa_ir_builder.passes import (
+    ConstantPropagation,
+    CopyPropagation,
+    DeadCodeElimination,
+    PassManager,
+    SSAPass,
+    default_pass_manager,
+)
+
+
+def _ssa(name: str, num: int = 1) -> tuple:
+    var = IRVar(Symbol(name))
+
+    for _ in range(num):
+        var.push(Symbol(name))
+
+    return tuple(var.data)
+
+
+def _lit(value: int, lit_type: str = "u32") -> CoreLiteral:
+    prefix = "@" if lit_type.startswith("@") else ""
+    return CoreLiteral(f"{prefix}{value}", lit_type)
+
+
+def test_build_ssa() -> None:
+    x, u32, add, q = Symbol("x"), Symbol("u32"), Symbol("add"), Symbol("@q")
+    code = build_ssa(
+        (
+            IRInstr(x, IRArgs(u32), InstrIRFlag.DECLARE),
+            IRInstr(x, IRArgs(u32, _lit(1)), InstrIRFlag.DECLARE_ASSIGN),
+            IRInstr(
+                x,
+                IRArgs(IRInstr(add, IRArgs(x, _lit(2)), InstrIRFlag.CALL)),
+                InstrIRFlag.ASSIGN,
+            ),
+            IRInstr(Symbol("@redim"), IRArgs(q), InstrIRFlag.CALL),
+        )
+    )
+
+    x0, x1 = _ssa("x", 2)
+    assert [(k.target, k.op, k.args) for k in code] == [
+        (x0, SSA_COPY, (_lit(1),)),
+        (x1, add, (x0, _lit(2))),
+        (None, Symbol("@redim"), (q,)),
+    ]
+
+    # nested calls get temporary values
+    code = build_ssa(
+        (
+            IRInstr(
+                Symbol("print"),
+                IRArgs(IRInstr(add, IRArgs(_lit(1), _lit(2)), InstrIRFlag.CALL)),
+                InstrIRFlag.CALL,
+            ),
+        )
+    )
+    (t1,) = _ssa("%t1")
+    assert [(k.target, k.op, k.args) for k in code] == [
+        (t1, add, (_lit(1), _lit(2))),
+        (None, Symbol("print"), (t1,)),
+    ]
+
+    with pytest.raises(NotImplementedError):
+        build_ssa((IRInstr(x, IRArgs(), InstrIRFlag.CONTROLFLOW),))
+
+
+def test_constant_propagation() -> None:
+    (a,), (b,), (c,) = _ssa("a"), _ssa("b"), _ssa("c")
+    add, mul, sub = Symbol("add"), Symbol("mul"), Symbol("sub")
+    code = [
+        SSAInstr(a, SSA_COPY, _lit(2)),
+        SSAInstr(b, add, a, _lit(3)),
+        SSAInstr(c, mul, b, a),
+        SSAInstr(None, Symbol("print"), c),
+    ]
+
+    new_code, changes = ConstantPropagation().run(code)
+    assert [k.args for k in new_code] == [
+        (_lit(2),),
+        (_lit(5),),
+        (_lit(10),),
+        (_lit(10),),
+    ]
+    assert all(k.op == SSA_COPY for k in new_code[:3])
+    assert changes == 5
+
+    # out of range results and mixed types are not folded
+    (d,), (e,) = _ssa("d"), _ssa("e")
+    code = [
+        SSAInstr(d, sub, _lit(1), _lit(2)),
+        SSAInstr(e, add, _lit(1), _lit(2, "u64")),
+    ]
+    new_code, changes = ConstantPropagation().run(code)
+    assert [k.op for k in new_code] == [sub, add]
+    assert changes == 0
+
+    # phi of a single literal
+    (f,) = _ssa("f")
+    new_code, _ = ConstantPropagation().run([SSAInstr(f, SSA_PHI, _lit(4), _lit(4))])
+    assert (new_code[0].op, new_code[0].args) == (SSA_COPY, (_lit(4),))
+
+
+def test_copy_propagation() -> None:
+    (a,), (b,), (c,) = _ssa("a"), _ssa("b"), _ssa("c")
+    y, q = Symbol("y"), Symbol("@q")
+    code = [
+        SSAInstr(a, SSA_COPY, y),
+        SSAInstr(b, SSA_COPY, a),
+        SSAInstr(c, Symbol("add"), b, a),
+        SSAInstr(None, Symbol("@redim"), q),
+    ]
+
+    new_code, changes = CopyPropagation().run(code)
+    assert [k.args for k in new_code] == [(y,), (y,), (y, y), (q,)]
+    assert changes == 2
+
+
+def test_dead_code_elimination() -> None:
+    (a,), (b,), (c,), (q,) = _ssa("a"), _ssa("b"), _ssa("c"), _ssa("@q")
+    code = [
+        SSAInstr(a, SSA_COPY, _lit(1)),
+        SSAInstr(b, Symbol("add"), a, _lit(1)),
+        SSAInstr(c, Symbol("print"), _lit(1)),
+        SSAInstr(q, SSA_COPY, _lit(0, "@u2")),
+    ]
+
+    # `b` is unused, then so is `a`; calls and quantum data are kept
+    new_code, changes = DeadCodeElimination().run(code)
+    assert [k.target for k in new_code] == [c, q]
+    assert changes == 2
+
+
+def test_pass_manager() -> None:
+    manager = default_pass_manager()
+    assert manager.order == ("constprop", "copyprop", "dce")
+
+    x, u32, add = Symbol("x"), Symbol("u32"), Symbol("add")
+    code = build_ssa(
+        (
+            IRInstr(x, IRArgs(u32, _lit(1)), InstrIRFlag.DECLARE_ASSIGN),
+            IRInstr(
+                x,
+                IRArgs(IRInstr(add, IRArgs(x, x), InstrIRFlag.CALL)),
+                InstrIRFlag.ASSIGN,
+            ),
+            IRInstr(Symbol("print"), IRArgs(x), InstrIRFlag.CALL),
+        )
+    )
+
+    new_code, stats = manager.run(code)
+    assert [(k.target, k.op, k.args) for k in new_code] == [
+        (None, Symbol("print"), (_lit(2),)),
+    ]
+    assert [k.name for k in stats] == ["constprop", "copyprop", "dce"]
+    assert [(k.instrs_before, k.instrs_after) for k in stats] == [
+        (3, 3),
+        (3, 3),
+        (3, 1),
+    ]
+    assert stats[-1].changes == 2
+    assert all(k.seconds >= 0 for k in stats)
+
+
+def test_pass_manager_requires() -> None:
+    class First(SSAPass):
+        name = "first"
+        requires = ("second",)
+
+        def run(self, code):
+            return code, 0
+
+    class Second(SSAPass):
+        name = "second"
+        requires = ("first",)
+
+        def run(self, code):
+            return code, 0
+
+    with pytest.raises(ValueError):
+        PassManager((DeadCodeElimination(),))
+
+    with pytest.raises(ValueError):
+        PassManager((First(), Second()))
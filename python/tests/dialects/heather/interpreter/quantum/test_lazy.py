@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import pytest
+from hhat_lang.core.code.ir import InstrIRFlag, TypeIR
+from hhat_lang.core.data.core import CoreLiteral, Symbol, WorkingData
+from hhat_lang.core.memory.core import MemoryManager
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import (
+    FnIR,
+    IRArgs,
+    IRBlock,
+    IRInstr,
+)
+from hhat_lang.dialects.heather.interpreter.classical.executor import Evaluator
+from hhat_lang.dialects.heather.interpreter.quantum.lazy import LazyQuantum
+from hhat_lang.dialects.heather.interpreter.quantum.program import Program
+from hhat_lang.low_level.quantum_lang.openqasm.v2.qlang import LowLeveQLang
+
+
+def literal_program(qdata: WorkingData, literal: CoreLiteral) -> Program:
+    mem = MemoryManager(5)
+    mem.idx.add(qdata, 2)
+    mem.idx.request(qdata)
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(literal), InstrIRFlag.CALL))
+
+    return Program(
+        qdata=qdata,
+        idx=mem.idx,
+        block=block,
+        qlang=LowLeveQLang,
+        executor=Evaluator(mem, TypeIR(), FnIR()),
+    )
+
+
+def test_lazy_fuses_casts() -> None:
+    lazy = LazyQuantum(metadata={"exact": True})
+    lazy.add(literal_program(Symbol("@a"), CoreLiteral("@0", "@u2")))
+    lazy.add(literal_program(Symbol("@b"), CoreLiteral("@0", "@u2")))
+
+    total = lazy.cast(Symbol("@a"), lambda res: sum(res.values()))
+    outcomes = lazy.cast(Symbol("@a"), lambda res: len(res))
+
+    # nothing runs until a value is demanded
+    assert lazy.executions == 0 and lazy.pending == (Symbol("@a"),)
+
+    assert outcomes.result() == 4
+    assert total.done and total.result() == pytest.approx(1.0)
+
+    # `@a` ran once for both casts, `@b` was never cast and never ran
+    assert lazy.executions == 1 and lazy.pending == ()
+
+    # later casts reuse the results
+    assert len(lazy.cast(Symbol("@a")).result()) == outcomes.result()
+    assert lazy.executions == 1
+
+
+def test_lazy_evaluate_all() -> None:
+    lazy = LazyQuantum(metadata={"exact": True})
+
+    for name in ("@a", "@b", "@c"):
+        lazy.add(literal_program(Symbol(name), CoreLiteral("@0", "@u2")))
+
+    casts = [lazy.cast(Symbol(k)) for k in ("@a", "@b")]
+    lazy.evaluate_all()
+
+    assert all(k.done for k in casts) and lazy.executions == 1
+
+    with pytest.raises(ValueError):
+        lazy.cast(Symbol("@d"))
+
+
+def test_lazy_packs_pending_quantum_data() -> None:
+    lazy = LazyQuantum(metadata={"exact": True})
+    lazy.add(literal_program(Symbol("@a"), CoreLiteral("@0", "@u2")))
+    lazy.add(literal_program(Symbol("@b"), CoreLiteral("@3", "@u2")))
+    lazy.add(literal_program(Symbol("@c"), CoreLiteral("@1", "@u2")))
+
+    a, b = lazy.cast(Symbol("@a")), lazy.cast(Symbol("@b"))
+
+    # `@a` and `@b` run together in a single job; `@c` has no cast and never runs
+    assert len(a.result()) == 4 and b.done and lazy.executions == 1
+
+    alone = literal_program(Symbol("@b"), CoreLiteral("@3", "@u2")).run(
+        metadata={"exact": True}
+    )
+    assert dict(b.result()) == dict(alone)
+
+    unpacked = LazyQuantum(metadata={"exact": True}, pack=False)
+    unpacked.add(literal_program(Symbol("@a"), CoreLiteral("@0", "@u2")))
+    unpacked.add(literal_program(Symbol("@b"), CoreLiteral("@3", "@u2")))
+    casts = [unpacked.cast(Symbol(k)) for k in ("@a", "@b")]
+    unpacked.evaluate_all()
+
+    assert all(k.done for k in casts) and unpacked.executions == 2
+
+
+def test_lazy_measures_only_read_indexes() -> None:
+    lazy = LazyQuantum(metadata={"exact": True})
+    lazy.add(literal_program(Symbol("@a"), CoreLiteral("@1", "@u2")))
+    lazy.add(literal_program(Symbol("@b"), CoreLiteral("@1", "@u2")))
+
+    a0 = lazy.cast(Symbol("@a"), reads=(0,))
+    b = lazy.cast(Symbol("@b"), reads=(1,))
+
+    assert a0.result().num_clbits == 1 and lazy.executions == 1
+    assert b.result().num_clbits == 1
+
+    # a cast reading an index that was not measured runs the program again
+    a1 = lazy.cast(Symbol("@a"), reads=(1, 0))
+    assert a1.result().num_clbits == 2 and lazy.executions == 2
+
+    # one reading a measured index reuses the results
+    assert dict(lazy.cast(Symbol("@a"), reads=(0,)).result()) == dict(a0.result())
+    assert lazy.executions == 2
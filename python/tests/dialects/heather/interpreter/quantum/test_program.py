@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from itertools import product
 
 import pytest
@@ -60,3 +61,128 @@ def test_simple_literal_redim_program(
     assert all(
         abs(1 / 4 - k / sum(res.values())) < MAX_ATOL_STATES_GATE for k in res.values()
     )
+
+
+def test_submit_and_run_async_programs() -> None:
+    programs = []
+
+    for name in ("@a", "@b"):
+        qv = Symbol(name)
+        mem = MemoryManager(5)
+        mem.idx.add(qv, 1)
+        mem.idx.request(qv)
+        block = IRBlock()
+        block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+        programs.append(
+            Program(
+                qdata=qv,
+                idx=mem.idx,
+                block=block,
+                qlang=LowLeveQLang,
+                executor=Evaluator(mem, TypeIR(), FnIR()),
+            )
+        )
+
+    handles = [p.submit() for p in programs]
+    assert all(set(h.result()) <= {"0", "1"} for h in handles)
+
+    async def run_all() -> list:
+        return await asyncio.gather(*(p.run_async() for p in programs))
+
+    assert all(set(res) <= {"0", "1"} for res in asyncio.run(run_all()))
+
+
+def test_program_forwards_metadata() -> None:
+    qv = Symbol("@v")
+    mem = MemoryManager(5)
+    mem.idx.add(qv, 1)
+    mem.idx.request(qv)
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+
+    program = Program(
+        qdata=qv,
+        idx=mem.idx,
+        block=block,
+        qlang=LowLeveQLang,
+        executor=Evaluator(mem, TypeIR(), FnIR()),
+    )
+
+    metadata = {"shots": 100, "seed": 42}
+    res = program.run(metadata=metadata)
+
+    assert sum(res.values()) == 100
+    assert program.submit(metadata=metadata).result() == res
+
+
+def test_program_exact_probabilities() -> None:
+    qv = Symbol("@v")
+    mem = MemoryManager(5)
+    mem.idx.add(qv, 1)
+    mem.idx.request(qv)
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+
+    program = Program(
+        qdata=qv,
+        idx=mem.idx,
+        block=block,
+        qlang=LowLeveQLang,
+        executor=Evaluator(mem, TypeIR(), FnIR()),
+    )
+
+    assert program.run(metadata={"exact": True}) == {"0": 0.5, "1": 0.5}
+
+
+def test_program_report() -> None:
+    qv = Symbol("@v")
+    mem = MemoryManager(5)
+    mem.idx.add(qv, 2)
+    mem.idx.request(qv)
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+
+    program = Program(
+        qdata=qv,
+        idx=mem.idx,
+        block=block,
+        qlang=LowLeveQLang,
+        executor=Evaluator(mem, TypeIR(), FnIR()),
+    )
+
+    report = program.report()
+    assert report is not None
+    assert (report.depth, report.width, report.gate_counts) == (1, 2, {"h": 2})
+
+    report = program.report(metadata={"optimize": False})
+    assert report is not None and report.depth == 3
+
+
+@pytest.mark.parametrize("strategy", ["chain", "tree"])
+def test_program_sync_strategy(strategy: str) -> None:
+    qv = Symbol("@v")
+    mem = MemoryManager(5)
+    mem.idx.add(qv, 5)
+    mem.idx.request(qv)
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@sync"), IRArgs(), InstrIRFlag.CALL))
+
+    program = Program(
+        qdata=qv,
+        idx=mem.idx,
+        block=block,
+        qlang=LowLeveQLang,
+        executor=Evaluator(mem, TypeIR(), FnIR()),
+    )
+
+    report = program.report(metadata={"sync_strategy": strategy, "optimize": False})
+    assert report is not None and report.gate_counts["cx"] >= 4
+
+    with pytest.raises(ValueError):
+        program.run(metadata={"sync_strategy": "star"})
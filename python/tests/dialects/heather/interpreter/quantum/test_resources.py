@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from hhat_lang.core.code.ir import InstrIRFlag, TypeIR
+from hhat_lang.core.data.core import Symbol
+from hhat_lang.core.error_handlers.errors import IndexAllocationError
+from hhat_lang.core.memory.core import MemoryManager
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import (
+    FnIR,
+    IRArgs,
+    IRBlock,
+    IRInstr,
+)
+from hhat_lang.dialects.heather.interpreter.classical.executor import Evaluator
+from hhat_lang.dialects.heather.interpreter.quantum.program import (
+    Program,
+    run_packed,
+)
+from hhat_lang.dialects.heather.interpreter.quantum.resources import (
+    ResourceEstimate,
+    estimate,
+)
+from hhat_lang.low_level.quantum_lang.openqasm.v2.qlang import LowLeveQLang
+
+
+def sync_program(name: str, num_idxs: int, max_idxs: int = 5) -> Program:
+    qv = Symbol(name)
+    mem = MemoryManager(max_idxs)
+    mem.idx.add(qv, num_idxs)
+    mem.idx.request(qv)
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+    block.add_instr(IRInstr(Symbol("@sync"), IRArgs(), InstrIRFlag.CALL))
+
+    return Program(
+        qdata=qv,
+        idx=mem.idx,
+        block=block,
+        qlang=LowLeveQLang,
+        executor=Evaluator(mem, TypeIR(), FnIR()),
+    )
+
+
+def test_estimate_program() -> None:
+    res = estimate(sync_program("@v", 4))
+
+    assert isinstance(res, ResourceEstimate)
+    assert (res.qubits, res.depth, res.shots) == (4, 4, 888)
+    assert res.gate_counts == {"h": 4, "cx": 3}
+
+    res = estimate(sync_program("@v", 4), metadata={"shots": 10})
+    assert isinstance(res, ResourceEstimate) and res.shots == 10
+
+
+def test_estimate_rejects_oversize_packing() -> None:
+    programs = [sync_program("@a", 3), sync_program("@b", 3)]
+
+    assert isinstance(estimate(programs), IndexAllocationError)
+
+    # nothing is generated nor executed for programs that do not fit
+    res = run_packed(programs)
+    assert all(isinstance(k, IndexAllocationError) for k in res.values())
+
+    res = estimate(programs[:1] + [sync_program("@c", 2)])
+    assert isinstance(res, ResourceEstimate) and res.qubits == 5
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import Gate, parse_qasm
+
+CODE = """
+OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[3];
+creg c[3];
+h q[0];
+cx q[0], q[1];
+rz(pi/2) q[2];
+measure q -> c;
+"""
+
+
+def test_parse_qasm() -> None:
+    circ = parse_qasm(CODE)
+
+    assert circ.num_qubits == 3 and circ.num_clbits == 3
+    assert circ.gates == [
+        Gate("h", (0,)),
+        Gate("cx", (0, 1)),
+        Gate("rz", (2,), (math.pi / 2,)),
+    ]
+    assert circ.measures == [(0, 0), (1, 1), (2, 2)]
+    assert not circ.is_clifford
+    assert parse_qasm(circ.to_qasm()).gates == circ.gates
+
+
+def test_parse_qasm_broadcast() -> None:
+    circ = parse_qasm("qreg q[2]; creg c[2]; h q; cx q[0], q[1]; measure q[1] -> c[0];")
+
+    assert circ.gates == [Gate("h", (0,)), Gate("h", (1,)), Gate("cx", (0, 1))]
+    assert circ.measures == [(1, 0)]
+    assert circ.is_clifford
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "qreg q[1]; creg c[1]; ccx q[0], q[0], q[0];",
+        "qreg q[1]; creg c[1]; h q[1];",
+        "qreg q[1]; creg c[1]; measure q -> c; h q[0];",
+        "qreg q[2]; creg c[2]; if(c==1) x q[0];",
+        "qreg q[1]; creg c[1]; rz(__import__) q[0];",
+    ],
+)
+def test_parse_qasm_unsupported(code: str) -> None:
+    with pytest.raises(ValueError):
+        parse_qasm(code)
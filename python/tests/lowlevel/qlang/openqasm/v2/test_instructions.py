@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+from hhat_lang.core.code.ir import TypeIR
+from hhat_lang.core.code.utils import InstrStatus
+from hhat_lang.core.memory.core import MemoryManager
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import FnIR
+from hhat_lang.dialects.heather.interpreter.classical.executor import Evaluator
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import parse_qasm
+from hhat_lang.low_level.quantum_lang.openqasm.v2.instructions import QSync
+from hhat_lang.low_level.quantum_lang.openqasm.v2.passes import circuit_report
+from qiskit import qasm2
+from qiskit.quantum_info import Operator
+
+
+def sync_code(num_idxs: int, strategy: str) -> str:
+    ex = Evaluator(MemoryManager(5), TypeIR(), FnIR())
+    instrs, status = QSync()(
+        idxs=tuple(range(num_idxs)), executor=ex, sync_strategy=strategy
+    )
+
+    assert status == InstrStatus.DONE
+    return (
+        f'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[{num_idxs}];\n'
+        f"creg c[{num_idxs}];\n" + "\n".join(instrs) + "\n"
+    )
+
+
+@pytest.mark.parametrize("num_idxs", [1, 2, 3, 5, 6, 8, 9])
+def test_sync_strategies_match(num_idxs: int) -> None:
+    chain, tree = sync_code(num_idxs, "chain"), sync_code(num_idxs, "tree")
+
+    assert Operator(qasm2.loads(chain)).equiv(Operator(qasm2.loads(tree)))
+
+
+@pytest.mark.parametrize("num_idxs", [2, 16, 100, 1000])
+def test_sync_tree_depth(num_idxs: int) -> None:
+    chain = circuit_report(parse_qasm(sync_code(num_idxs, "chain")))
+    tree = circuit_report(parse_qasm(sync_code(num_idxs, "tree")))
+
+    assert chain.depth == num_idxs - 1
+    assert tree.depth <= 2 * math.ceil(math.log2(num_idxs))
+    assert tree.num_gates < 2 * num_idxs
+
+
+def test_sync_unknown_strategy() -> None:
+    ex = Evaluator(MemoryManager(5), TypeIR(), FnIR())
+    assert QSync()(idxs=(0, 1), executor=ex, sync_strategy="star")[1] == (
+        InstrStatus.ERROR
+    )
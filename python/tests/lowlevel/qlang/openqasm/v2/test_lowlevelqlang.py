@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from hhat_lang.core.code.ir import InstrIRFlag, TypeIR
 from hhat_lang.core.data.core import CoreLiteral, Symbol
 from hhat_lang.core.memory.core import MemoryManager
@@ -68,3 +70,60 @@ measure q -> c;
     res = qlang.gen_program()
     print(res)
     # assert res == code_snippet
+
+
+def test_gen_packed_program() -> None:
+    code_snippet = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[3];
+creg c[3];
+
+h q[0];
+x q[1];
+h q[1];
+h q[2];
+measure q -> c;
+"""
+
+    mem = MemoryManager(5)
+    qlangs = []
+
+    for name, literal in (("@a", None), ("@b", CoreLiteral("@1", "@u2"))):
+        qv = Symbol(name)
+        mem.idx.add(qv, 1 if literal is None else 2)
+        mem.idx.request(qv)
+
+        block = IRBlock()
+        args = IRArgs() if literal is None else IRArgs(literal)
+        block.add_instr(IRInstr(Symbol("@redim"), args, InstrIRFlag.CALL))
+        qlangs.append(
+            LowLeveQLang(qv, block, mem.idx, Evaluator(mem, TypeIR(), FnIR()))
+        )
+
+    code, positions = LowLeveQLang.gen_packed_program(qlangs)
+
+    assert code == code_snippet
+    assert positions == ((0,), (1, 2))
+
+    # indexes are mapped to local register positions when not packed
+    assert "h q[0];\nh q[1];" in qlangs[1].gen_program()
+
+
+def test_gen_program_partial_measure() -> None:
+    qv = Symbol("@v")
+    mem = MemoryManager(5)
+    mem.idx.add(qv, 3)
+    mem.idx.request(qv)
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+
+    qlang = LowLeveQLang(qv, block, mem.idx, Evaluator(mem, TypeIR(), FnIR()))
+    qlang.measure = (2, 0)
+    code = qlang.gen_program()
+
+    assert "qreg q[3];\ncreg c[2];" in code
+    assert code.endswith("measure q[2] -> c[0];\nmeasure q[0] -> c[1];\n")
+
+    with pytest.raises(ValueError):
+        qlang.measure = (3,)
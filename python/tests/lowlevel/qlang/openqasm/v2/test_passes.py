@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import Gate, parse_qasm
+from hhat_lang.low_level.quantum_lang.openqasm.v2.passes import (
+    circuit_report,
+    layers,
+    optimize_qasm,
+    peephole,
+    schedule,
+)
+from qiskit import qasm2
+from qiskit.quantum_info import Operator
+
+
+def circuit_code(body: str, num_qubits: int = 2) -> str:
+    return (
+        f'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[{num_qubits}];\n'
+        f"creg c[{num_qubits}];\n{body}\nmeasure q -> c;\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "body,gates,cancelled,merged",
+    [
+        ("h q[0]; h q[0];", [], 2, 0),
+        ("h q; x q[1]; x q[1]; h q;", [], 6, 0),
+        ("cx q[0], q[1]; cx q[0], q[1];", [], 2, 0),
+        ("cx q[0], q[1]; cx q[1], q[0];", ["cx", "cx"], 0, 0),
+        ("cx q[0], q[1]; h q[1]; cx q[0], q[1];", ["cx", "h", "cx"], 0, 0),
+        ("t q[0]; t q[0];", ["s"], 0, 1),
+        ("s q[0]; sdg q[0]; id q[1];", [], 3, 0),
+        ("rz(pi/4) q[0]; rz(pi/4) q[0];", ["rz"], 0, 1),
+        ("rx(pi) q[0]; rx(pi) q[0];", [], 2, 0),
+        ("t q[0]; s q[0];", ["t", "s"], 0, 0),
+    ],
+)
+def test_peephole(body: str, gates: list[str], cancelled: int, merged: int) -> None:
+    circuit = parse_qasm(circuit_code(body))
+    optimized, report = peephole(circuit)
+
+    assert [g.name for g in optimized.gates] == gates
+    assert (report.cancelled, report.merged) == (cancelled, merged)
+    assert report.removed == cancelled + merged
+    assert optimized.measures == circuit.measures
+
+    original = Operator(qasm2.loads(circuit_code(body).replace("measure q -> c;", "")))
+    result = Operator(qasm2.loads(optimized.to_qasm().split("measure")[0]))
+    assert original.equiv(result)
+
+
+def test_peephole_merged_angle() -> None:
+    optimized, _ = peephole(parse_qasm(circuit_code("u1(0.25) q[1]; u1(0.5) q[1];")))
+    assert optimized.gates == [Gate("u1", (1,), (0.75,))]
+    assert math.isclose(optimized.gates[0].params[0], 0.75)
+
+
+def test_optimize_qasm() -> None:
+    code = circuit_code("h q[0];")
+    res, report, _ = optimize_qasm(code)
+    assert res == code and report is not None and report.removed == 0
+
+    code, report, _ = optimize_qasm(circuit_code("h q[0]; x q[1]; x q[1];"))
+    assert report is not None and report.removed == 2 and "x q" not in code
+
+    # codes outside the gate stream subset are left untouched
+    code = circuit_code("measure q[0] -> c[0];\nif(c==1) x q[1];")
+    assert optimize_qasm(code) == (code, None, None)
+
+
+def test_schedule() -> None:
+    code = circuit_code("h q[0]; cx q[0], q[1]; h q[2]; x q[3]; h q[3];", 4)
+    circuit = parse_qasm(code)
+
+    assert circuit_report(circuit).depth == 2
+    assert [[g.name for g in k] for k in layers(circuit)] == [
+        ["h", "h", "x"],
+        ["cx", "h"],
+    ]
+
+    scheduled, report = schedule(circuit)
+
+    assert [g.name for g in scheduled.gates] == ["h", "h", "x", "cx", "h"]
+    assert (report.depth, report.width, report.num_gates) == (2, 4, 5)
+    assert report.gate_counts == {"h": 3, "x": 1, "cx": 1}
+
+    original = Operator(qasm2.loads(code.replace("measure q -> c;", "")))
+    result = Operator(qasm2.loads(scheduled.to_qasm().split("measure")[0]))
+    assert original.equiv(result)
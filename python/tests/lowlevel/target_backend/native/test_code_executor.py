@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+from hhat_lang.low_level.target_backend.native.openqasm.code_executor import (
+    execute_program,
+    stream_program,
+    stream_program_to_file,
+)
+
+
+def test_exact_stabilizer() -> None:
+    code = (
+        "qreg q[4]; creg c[4]; h q[0]; cx q[0], q[1]; x q[2]; h q[3]; s q[3];"
+        "measure q -> c;"
+    )
+    res = execute_program(code, "@v", metadata={"exact": True})
+
+    assert res == {
+        "0100": 0.25,
+        "0111": 0.25,
+        "1100": 0.25,
+        "1111": 0.25,
+    }
+
+
+def test_exact_statevector() -> None:
+    code = "qreg q[3]; creg c[2]; ry(pi/3) q[0]; cx q[0], q[1]; t q[2];"
+    code += "measure q[1] -> c[0]; measure q[2] -> c[1];"
+    res = execute_program(code, "@v", metadata={"exact": True})
+
+    assert res.keys() == {"00", "01"}
+    assert math.isclose(res["01"], math.sin(math.pi / 6) ** 2)
+    assert math.isclose(sum(res.values()), 1.0)
+
+
+def test_exact_requires_native() -> None:
+    code = "qreg q[2]; creg c[2]; h q[0]; measure q -> c;"
+
+    with pytest.raises(ValueError):
+        execute_program(code, "@v", metadata={"exact": True, "method": "qiskit"})
+
+
+def test_stream_program_chunks() -> None:
+    code = "qreg q[3]; creg c[3]; h q[0]; cx q[0], q[1]; x q[2]; measure q -> c;"
+    metadata = {"shots": 10_000, "chunk_shots": 3000, "seed": 9}
+    chunks = list(stream_program(code, "@v", metadata))
+
+    assert [k.shape for k in chunks] == [(3000, 1)] * 3 + [(1000, 1)]
+    assert all(k.dtype == np.uint64 for k in chunks)
+
+    # bell pair on clbits 0 and 1, clbit 2 always set
+    assert set(np.concatenate(chunks)[:, 0].tolist()) == {0b100, 0b111}
+
+    # same seed, same per-shot sequence
+    again = np.concatenate(list(stream_program(code, "@v", metadata)))
+    assert np.array_equal(np.concatenate(chunks), again)
+
+
+def test_stream_program_to_file(tmp_path: Path) -> None:
+    code = "qreg q[2]; creg c[2]; h q[0]; cx q[0], q[1]; measure q -> c;"
+    metadata = {"shots": 5000, "chunk_shots": 1024, "seed": 4}
+    memmap = stream_program_to_file(code, "@v", tmp_path / "shots.npy", metadata)
+
+    assert memmap.shape == (5000, 1)
+    assert np.array_equal(
+        np.load(tmp_path / "shots.npy", mmap_mode="r"),
+        np.concatenate(list(stream_program(code, "@v", metadata))),
+    )
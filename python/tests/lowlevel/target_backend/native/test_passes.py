@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import Gate, parse_qasm
+from hhat_lang.low_level.target_backend.native.openqasm.code_executor import (
+    execute_program,
+)
+from hhat_lang.low_level.target_backend.native.passes import (
+    fold_deterministic,
+    split_components,
+)
+
+
+def test_split_components() -> None:
+    circ = parse_qasm(
+        "qreg q[5]; creg c[5]; h q[0]; cx q[0], q[3]; t q[1]; x q[4];"
+        "measure q[0] -> c[0]; measure q[1] -> c[1]; measure q[3] -> c[2];"
+    )
+    comps = split_components(circ)
+
+    # qubit 2 has no gates and qubit 4 is never measured
+    assert [(k.qubits, k.clbits) for k in comps] == [((0, 3), (0, 2)), ((1,), (1,))]
+    assert comps[0].circuit.gates == [Gate("h", (0,)), Gate("cx", (0, 1))]
+    assert comps[0].circuit.measures == [(0, 0), (1, 1)]
+    assert comps[1].circuit.gates == [Gate("t", (0,))]
+
+
+def test_execute_program_components() -> None:
+    # 40 qubits in pairs, each pair with a non-Clifford gate: too wide for a single
+    # statevector, but each component has only 2 qubits
+    gates = "".join(
+        f"h q[{k}]; t q[{k}]; cx q[{k}], q[{k + 1}];" for k in range(0, 40, 2)
+    )
+    code = f"qreg q[40]; creg c[40]; {gates} measure q -> c;"
+    res = execute_program(code, "@v", metadata={"shots": 300, "seed": 11})
+
+    assert sum(res.values()) == 300
+    assert all(key[39 - k] == key[38 - k] for key in res for k in range(0, 40, 2))
+
+
+def test_fold_deterministic() -> None:
+    circ = parse_qasm(
+        "qreg q[4]; creg c[4]; x q[0]; x q[1]; x q[1]; x q[2]; t q[2]; h q[3];"
+        "cx q[3], q[1]; measure q -> c;"
+    )
+    folded, fixed = fold_deterministic(circ)
+
+    # qubit 1 is linked to qubit 3 by `cx`, so it is not folded
+    assert fixed == {0: 1, 2: 1}
+    assert folded.gates == [
+        Gate("x", (1,)),
+        Gate("x", (1,)),
+        Gate("h", (3,)),
+        Gate("cx", (3, 1)),
+    ]
+    assert folded.measures == [(1, 1), (3, 3)]
+
+
+def test_execute_program_literal_qubits() -> None:
+    # literal-like qubits are wide but do not need any simulation
+    code = "qreg q[60]; creg c[60]; x q[0]; x q[59]; h q[1]; measure q -> c;"
+    res = execute_program(code, "@v", metadata={"shots": 100, "seed": 2})
+
+    assert {k[0] + k[-2:] for k in res} == {"101", "111"}
+    assert sum(res.values()) == 100
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from hhat_lang.core.execution.counts import Counts
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import (
+    Gate,
+    QasmCircuit,
+    parse_qasm,
+)
+from hhat_lang.low_level.target_backend.native.openqasm.code_executor import (
+    execute_program,
+    select_method,
+)
+from hhat_lang.low_level.target_backend.native.stabilizer import sample_stabilizer
+
+
+def ghz_circuit(n: int) -> QasmCircuit:
+    gates = [Gate("h", (0,))] + [Gate("cx", (k, k + 1)) for k in range(n - 1)]
+    return QasmCircuit([("q", n)], [("c", n)], gates, [(k, k) for k in range(n)])
+
+
+def test_stabilizer_large_ghz() -> None:
+    n = 500
+    memory = sample_stabilizer(ghz_circuit(n), 1000, np.random.default_rng(7))
+    counts = Counts.from_memory(memory)
+
+    assert set(counts) == {"0" * n, "1" * n}
+    assert sum(counts.values()) == 1000
+
+
+@pytest.mark.parametrize(
+    "gates,expected",
+    [
+        ("h q[0]; s q[0]; s q[0]; h q[0];", "1"),
+        ("h q[0]; s q[0]; sdg q[0]; h q[0];", "0"),
+        ("x q[0]; y q[0];", "0"),
+        ("h q[0]; z q[0]; h q[0];", "1"),
+    ],
+)
+def test_stabilizer_deterministic_phases(gates: str, expected: str) -> None:
+    circ = parse_qasm(f"qreg q[1]; creg c[1]; {gates} measure q -> c;")
+    counts = Counts.from_memory(sample_stabilizer(circ, 50, np.random.default_rng()))
+
+    assert counts == {expected: 50}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_stabilizer_matches_statevector_support(seed: int) -> None:
+    from qiskit import qasm2
+    from qiskit.quantum_info import Statevector
+
+    rng = np.random.default_rng(seed)
+    n = 4
+    names = ["h", "s", "sdg", "x", "y", "z", "cx", "cy", "cz"]
+    lines = []
+
+    for _ in range(30):
+        name = names[rng.integers(len(names))]
+        qubits = rng.choice(n, size=2 if name in ("cx", "cy", "cz") else 1)
+
+        if len(set(qubits)) == len(qubits):
+            lines.append(f"{name} " + ", ".join(f"q[{k}]" for k in qubits) + ";")
+
+    gates = "\n".join(lines)
+    header = 'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[4];\ncreg c[4];\n'
+
+    probs = Statevector(qasm2.loads(header + gates)).probabilities_dict()
+    support = {k for k, p in probs.items() if p > 1e-9}
+
+    circ = parse_qasm(header + gates + "\nmeasure q -> c;")
+    counts = Counts.from_memory(sample_stabilizer(circ, 2000, rng))
+
+    assert set(counts) == support
+
+
+def test_execute_program_dispatch() -> None:
+    code = "qreg q[2]; creg c[2]; h q[0]; cx q[0], q[1]; measure q -> c;"
+
+    assert select_method(parse_qasm(code), dict()) == "stabilizer"
+    assert select_method(parse_qasm(code.replace("h q", "t q")), dict()) != "stabilizer"
+
+    with pytest.raises(ValueError):
+        select_method(parse_qasm(code.replace("h q", "t q")), {"method": "stabilizer"})
+
+    metadata = {"shots": 200, "seed": 3}
+    res = execute_program(code, "@v", metadata=metadata)
+
+    assert set(res) == {"00", "11"} and sum(res.values()) == 200
+    assert execute_program(code, "@v", metadata=metadata) == res
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from hhat_lang.low_level.quantum_lang.openqasm.v2.circuit import parse_qasm
+from hhat_lang.low_level.target_backend.native.openqasm.code_executor import (
+    execute_program,
+    select_method,
+)
+from hhat_lang.low_level.target_backend.native.statevector import statevector
+
+HEADER = 'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[4];\ncreg c[4];\n'
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_statevector_matches_qiskit(seed: int) -> None:
+    from qiskit import qasm2
+    from qiskit.quantum_info import Statevector
+
+    rng = np.random.default_rng(seed)
+    names = ["h", "s", "sdg", "t", "tdg", "x", "y", "z", "rx", "ry", "rz", "u1"]
+    lines = []
+
+    for _ in range(40):
+        if rng.random() < 0.3:
+            name = ["cx", "cy", "cz"][rng.integers(3)]
+            a, b = rng.choice(4, size=2, replace=False)
+            lines.append(f"{name} q[{a}], q[{b}];")
+
+        else:
+            name = names[rng.integers(len(names))]
+            param = (
+                f"({rng.uniform(-3, 3)})" if name in ("rx", "ry", "rz", "u1") else ""
+            )
+            lines.append(f"{name}{param} q[{rng.integers(4)}];")
+
+    code = HEADER + "\n".join(lines)
+    expected = Statevector(qasm2.loads(code)).data
+
+    # qiskit's statevector index has qubit 0 as the rightmost bit
+    state = statevector(parse_qasm(code)).transpose().reshape(-1)
+
+    assert np.allclose(state, expected)
+
+
+def test_execute_program_statevector() -> None:
+    code = HEADER + "h q[0]; t q[0]; h q[0]; cx q[0], q[2]; measure q -> c;"
+
+    wide = "qreg q[30]; creg c[30]; t q[0]; measure q -> c;"
+
+    assert select_method(parse_qasm(code), dict()) == "statevector"
+    assert select_method(parse_qasm(wide), dict()) == "qiskit"
+
+    res = execute_program(code, "@v", metadata={"shots": 4000, "seed": 5})
+
+    # P(1) = sin^2(pi/8) for qubits 0 and 2, which are entangled
+    assert set(res) <= {"0000", "0101"} and sum(res.values()) == 4000
+    assert abs(res["0101"] / 4000 - np.sin(np.pi / 8) ** 2) < 0.03
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import pytest
+from hhat_lang.core.data.core import Symbol
+from hhat_lang.core.execution.counts import Counts
+from hhat_lang.low_level.target_backend.qiskit.openqasm.code_executor import (
+    TranspileCache,
+    backend_pool,
+    circuit_hash,
+    converged_majority,
+    execute_program,
+    execute_programs,
+    load_qasm,
+    shard_seeds,
+    shard_shots,
+    transpile_cache,
+)
+
+CODE = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[2];
+creg c[2];
+h q[0];
+cx q[0], q[1];
+measure q -> c;
+"""
+
+
+def test_circuit_hash_same_structure() -> None:
+    assert circuit_hash(load_qasm(CODE)) == circuit_hash(load_qasm(CODE))
+    assert circuit_hash(load_qasm(CODE)) != circuit_hash(
+        load_qasm(CODE.replace("h q[0];", "x q[0];"))
+    )
+
+
+def test_circuit_hash_distinguishes_register_layout() -> None:
+    code_c2 = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[2];
+creg c[2];
+x q[1];
+measure q -> c;
+"""
+    code_c1_d1 = code_c2.replace("creg c[2];", "creg meas[1];\ncreg c[1];").replace(
+        "measure q -> c;", "measure q[0] -> meas[0];\nmeasure q[1] -> c[0];"
+    )
+
+    assert circuit_hash(load_qasm(code_c2)) != circuit_hash(load_qasm(code_c1_d1))
+
+    transpile_cache.clear()
+    cold = execute_program(code_c1_d1, Symbol("@v"))
+    execute_program(code_c2, Symbol("@v"))
+    transpile_cache.clear()
+    execute_program(code_c2, Symbol("@v"))
+    warm = execute_program(code_c1_d1, Symbol("@v"))
+
+    assert cold == warm
+
+
+def test_transpile_cache_lru_eviction() -> None:
+    cache = TranspileCache(maxsize=2)
+    cache.put(("a", ()), load_qasm(CODE))
+    cache.put(("b", ()), load_qasm(CODE))
+    assert cache.get(("a", ())) is not None
+
+    cache.put(("c", ()), load_qasm(CODE))
+    assert ("b", ()) not in cache
+    assert ("a", ()) in cache and ("c", ()) in cache
+    assert cache.hits == 1
+
+
+def test_repeated_execution_reuses_backend_and_transpilation() -> None:
+    backend_pool.clear()
+    transpile_cache.clear()
+
+    res1 = execute_program(CODE, Symbol("@v"))
+    res2 = execute_program(CODE, Symbol("@v"))
+
+    assert set(res1) <= {"00", "11"} and set(res2) <= {"00", "11"}
+    assert len(backend_pool) == 1
+    assert len(transpile_cache) == 1
+    assert transpile_cache.hits == 1
+
+
+def test_execute_programs_batch() -> None:
+    code_x = CODE.replace("h q[0];\ncx q[0], q[1];", "x q[1];")
+
+    transpile_cache.clear()
+
+    res = execute_programs(
+        [
+            (CODE, Symbol("@a"), 100),
+            (code_x, Symbol("@b"), 50),
+            (CODE, Symbol("@c"), None),
+        ],
+        metadata={"backend_options": {"method": "statevector"}},
+    )
+
+    assert len(res) == 3
+    assert sum(res[0].values()) == 100 and set(res[0]) <= {"00", "11"}
+    assert res[1] == {"10": 50}
+    assert sum(res[2].values()) == 888
+    # identical circuits in the same batch are transpiled once
+    assert len(transpile_cache) == 2
+    assert {"method": "statevector"} in backend_pool
+    assert execute_programs([]) == []
+
+
+def test_shard_shots_and_seeds() -> None:
+    assert shard_shots(10, 3) == [4, 3, 3]
+    assert shard_shots(2, 4) == [1, 1]
+    assert shard_seeds(7, 4) == shard_seeds(7, 4)
+    assert len(set(shard_seeds(7, 4))) == 4
+
+
+def test_sharding_rejects_invalid_workers() -> None:
+    for workers in (0, -2, 1.5, "2", True):
+        with pytest.raises(ValueError):
+            execute_program(CODE, Symbol("@v"), metadata={"workers": workers})
+
+
+def test_seeded_samplers_are_pooled() -> None:
+    backend_pool.clear()
+
+    _, backend1, sampler1 = backend_pool.get(seed=3)
+    _, backend2, sampler2 = backend_pool.get(seed=3)
+    _, backend3, sampler3 = backend_pool.get()
+
+    assert backend1 is backend2 is backend3
+    assert sampler1 is sampler2
+    assert sampler1 is not sampler3
+
+
+def test_sharded_execution_is_reproducible() -> None:
+    metadata = {"shots": 1000, "workers": 2, "seed": 1234}
+
+    res1 = execute_program(CODE, Symbol("@v"), metadata=metadata)
+    res2 = execute_program(CODE, Symbol("@v"), metadata=metadata)
+
+    assert sum(res1.values()) == 1000
+    assert set(res1) <= {"00", "11"}
+    assert res1 == res2
+
+
+def test_adaptive_shots_stop_early_on_easy_circuits() -> None:
+    code_x = CODE.replace("h q[0];\ncx q[0], q[1];", "x q[1];")
+
+    res = execute_program(code_x, Symbol("@v"))
+    assert res == {"10": 111}
+
+    res = execute_program(code_x, Symbol("@v"), metadata={"adaptive": False})
+    assert res == {"10": 888}
+
+
+def test_adaptive_shots_use_budget_on_uniform_circuits() -> None:
+    res = execute_program(CODE, Symbol("@v"), metadata={"seed": 5})
+    assert sum(res.values()) == 888
+    assert res == execute_program(CODE, Symbol("@v"), metadata={"seed": 5})
+
+    res = execute_program(
+        CODE,
+        Symbol("@v"),
+        metadata={"adaptive": {"tol": 0.2, "round_shots": 50, "max_shots": 1000}},
+    )
+    assert sum(res.values()) < 1000
+
+
+def test_converged_majority() -> None:
+    assert converged_majority(Counts.from_dict({"0": 100}), tol=0.1, z=2.0)
+    assert converged_majority(Counts.from_dict({"0": 90, "1": 10}), tol=0.1, z=2.0)
+    assert not converged_majority(Counts.from_dict({"0": 52, "1": 48}), tol=0.1, z=2.0)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import hhat_lang.core  # noqa: F401
+import pytest
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IR
+from hhat_lang.toolchain.project import run
+from hhat_lang.toolchain.project.run import artifact_path, compile_file
+
+
+def test_compile_file_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "main.hat"
+    source.write_text("main {}")
+
+    assert isinstance(compile_file(source), IR)
+    assert artifact_path(source) == tmp_path / "main.hatc"
+    assert artifact_path(source).exists()
+
+    cache_dir = tmp_path / "cache"
+    assert isinstance(compile_file(source, cache_dir=cache_dir), IR)
+    assert artifact_path(source, cache_dir).parent == cache_dir
+    assert artifact_path(source, cache_dir).exists()
+
+    # warm start: the front end does not run
+    def no_parse(_code: str) -> None:
+        raise AssertionError("source parsed again")
+
+    monkeypatch.setattr(run, "parse", no_parse)
+    assert isinstance(compile_file(source), IR)
+    assert isinstance(compile_file(source, cache_dir=cache_dir), IR)
+
+    # changed source: compiled again
+    source.write_text("main { }")
+
+    with pytest.raises(AssertionError):
+        compile_file(source)